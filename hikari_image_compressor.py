@@ -1,1209 +1,4977 @@
-#!/usr/bin/env python3
-"""
-Hikari Image Compressor
-Version: 1.1.0 stable
-Date: September 2025
-Author: Gary19gts
-
-Modern image compressor with Apple-style GUI
-
-This program is free software: you can redistribute it and/or modify
-it under the terms of the GNU Affero General Public License as published by
-the Free Software Foundation, either version 3 of the License, or
-(at your option) any later version.
-
-This program is distributed in the hope that it will be useful,
-but WITHOUT ANY WARRANTY; without even the implied warranty of
-MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
-GNU Affero General Public License for more details.
-
-You should have received a copy of the GNU Affero General Public License
-along with this program. If not, see <https://www.gnu.org/licenses/>.
-"""
-
-import tkinter as tk
-from tkinter import ttk, filedialog, messagebox
-import customtkinter as ctk
-from PIL import Image, ImageTk, ImageDraw
-import os
-import sys
-import threading
-from pathlib import Path
-import io
-import webbrowser
-
-# Set appearance mode and color theme
-ctk.set_appearance_mode("light")
-ctk.set_default_color_theme("blue")
-
-# Configure colors for Apple-like appearance
-COLORS = {
-    'bg_primary': '#FFFFFF',
-    'bg_secondary': '#F8F9FA',
-    'bg_card': '#FFFFFF',
-    'text_primary': '#1D1D1F',
-    'text_secondary': '#86868B',
-    'accent': '#007AFF',
-    'border': '#E5E5E7',
-    'success': '#34C759',
-    'warning': '#FF9500',
-    'error': '#FF3B30'
-}
-
-class ImageCompressor:
-    def __init__(self):
-        self.root = ctk.CTk()
-        self.root.title("Hikari Image Compressor")
-        self.root.geometry("1280x750")
-        self.root.minsize(800, 650)
-        
-        # Set application icon
-        self.create_app_icon()
-        
-        # Variables
-        self.loaded_images = []
-        self.output_folder = tk.StringVar()
-        self.quality_var = tk.StringVar(value="High (80%)")
-        self.engine_var = tk.StringVar(value="Pillow")
-        self.format_var = tk.StringVar(value="JPEG")
-        self.resize_enabled = tk.BooleanVar(value=False)
-        self.resize_scale = tk.StringVar(value="50")
-        
-        # Bind quality change to update previews
-        self.quality_var.trace('w', self.on_settings_change)
-        self.format_var.trace('w', self.on_settings_change)
-        self.resize_enabled.trace('w', self.on_settings_change)
-        
-        self.setup_ui()
-    
-    def create_app_icon(self):
-        """Create a minimalist blue icon for the application"""
-        try:
-            # Create a 64x64 icon with PIL
-            icon_size = 64
-            icon = Image.new('RGBA', (icon_size, icon_size), (0, 0, 0, 0))
-            
-            # Create a simple minimalist icon - a blue circle with a white image symbol
-            draw = ImageDraw.Draw(icon)
-            
-            # Blue circle background
-            margin = 4
-            draw.ellipse([margin, margin, icon_size-margin, icon_size-margin], 
-                        fill='#007AFF', outline='#0056CC', width=2)
-            
-            # White image/photo symbol in the center
-            center = icon_size // 2
-            # Mountain shape
-            points = [
-                (center-12, center+8),  # bottom left
-                (center-8, center-2),   # peak 1
-                (center-2, center+2),   # valley
-                (center+6, center-8),   # peak 2
-                (center+12, center+8),  # bottom right
-            ]
-            draw.polygon(points, fill='white')
-            
-            # Sun/circle in top right
-            draw.ellipse([center+4, center-8, center+8, center-4], fill='white')
-            
-            # Convert to PhotoImage and set as icon
-            photo = ImageTk.PhotoImage(icon)
-            self.root.iconphoto(True, photo)
-            
-        except Exception as e:
-            print(f"Could not create icon: {e}")
-        
-    def setup_ui(self):
-        # Configure root window
-        self.root.configure(fg_color=COLORS['bg_primary'])
-        
-        # Main container
-        main_frame = ctk.CTkFrame(self.root, fg_color="transparent")
-        main_frame.pack(fill="both", expand=True, padx=20, pady=20)
-        
-        # Create two columns
-        left_column = ctk.CTkFrame(
-            main_frame, 
-            width=420, 
-            corner_radius=15,
-            fg_color=COLORS['bg_card'],
-            border_width=1,
-            border_color=COLORS['border']
-        )
-        left_column.pack(side="left", fill="both", expand=False, padx=(0, 10))
-        left_column.pack_propagate(False)
-        
-        right_column = ctk.CTkFrame(
-            main_frame, 
-            corner_radius=15,
-            fg_color=COLORS['bg_card'],
-            border_width=1,
-            border_color=COLORS['border']
-        )
-        right_column.pack(side="right", fill="both", expand=True)
-        
-        self.setup_left_column(left_column)
-        self.setup_right_column(right_column)
-        
-    def setup_left_column(self, parent):
-        # Title
-        title_label = ctk.CTkLabel(
-            parent, 
-            text="Hikari Image Compressor",
-            font=ctk.CTkFont(size=24, weight="bold")
-        )
-        title_label.pack(pady=(20, 10))
-        
-        # Load Images Section
-        load_frame = ctk.CTkFrame(
-            parent, 
-            corner_radius=10,
-            fg_color=COLORS['bg_secondary'],
-            border_width=1,
-            border_color=COLORS['border']
-        )
-        load_frame.pack(fill="x", padx=20, pady=(0, 10))
-        
-        load_title = ctk.CTkLabel(
-            load_frame,
-            text="Load Images",
-            font=ctk.CTkFont(size=16, weight="bold"),
-            text_color=COLORS['text_primary']
-        )
-        load_title.pack(pady=(15, 10))
-        
-        load_btn = ctk.CTkButton(
-            load_frame,
-            text="Select Images",
-            command=self.load_images,
-            height=35,
-            corner_radius=8,
-            fg_color=COLORS['accent'],
-            hover_color="#0056CC"
-        )
-        load_btn.pack(pady=(0, 15))
-        
-        # Settings Section
-        settings_frame = ctk.CTkFrame(
-            parent, 
-            corner_radius=10,
-            fg_color=COLORS['bg_secondary'],
-            border_width=1,
-            border_color=COLORS['border']
-        )
-        settings_frame.pack(fill="x", padx=20, pady=(0, 10))
-        
-        settings_title = ctk.CTkLabel(
-            settings_frame,
-            text="Compression Settings",
-            font=ctk.CTkFont(size=16, weight="bold"),
-            text_color=COLORS['text_primary']
-        )
-        settings_title.pack(pady=(15, 10))
-        
-        # Quality selector with info button
-        quality_frame = ctk.CTkFrame(settings_frame, fg_color="transparent")
-        quality_frame.pack(fill="x", padx=15, pady=5)
-        
-        quality_label = ctk.CTkLabel(
-            quality_frame, 
-            text="Quality:",
-            text_color=COLORS['text_primary']
-        )
-        quality_label.pack(side="left")
-        
-        quality_info_btn = ctk.CTkButton(
-            quality_frame,
-            text="i",
-            width=25,
-            height=25,
-            corner_radius=12,
-            command=lambda: self.show_info("quality"),
-            fg_color=COLORS['text_secondary'],
-            hover_color=COLORS['accent']
-        )
-        quality_info_btn.pack(side="right")
-        
-        quality_menu = ctk.CTkOptionMenu(
-            quality_frame,
-            values=["Low (30%)", "Medium (60%)", "High (80%)", "Maximum (95%)"],
-            variable=self.quality_var,
-            width=200,
-            fg_color=COLORS['bg_card'],
-            button_color=COLORS['accent'],
-            button_hover_color="#0056CC",
-            text_color=COLORS['text_primary'],
-            font=ctk.CTkFont(size=12, weight="bold")
-        )
-        quality_menu.pack(side="right", padx=(0, 10))
-        
-        # Format selector with info button
-        format_frame = ctk.CTkFrame(settings_frame, fg_color="transparent")
-        format_frame.pack(fill="x", padx=15, pady=5)
-        
-        format_label = ctk.CTkLabel(
-            format_frame, 
-            text="Format:",
-            text_color=COLORS['text_primary']
-        )
-        format_label.pack(side="left")
-        
-        format_info_btn = ctk.CTkButton(
-            format_frame,
-            text="i",
-            width=25,
-            height=25,
-            corner_radius=12,
-            command=lambda: self.show_info("format"),
-            fg_color=COLORS['text_secondary'],
-            hover_color=COLORS['accent']
-        )
-        format_info_btn.pack(side="right")
-        
-        format_menu = ctk.CTkOptionMenu(
-            format_frame,
-            values=["JPEG", "WebP", "PNG"],
-            variable=self.format_var,
-            width=200,
-            fg_color=COLORS['bg_card'],
-            button_color=COLORS['accent'],
-            button_hover_color="#0056CC",
-            text_color=COLORS['text_primary'],
-            font=ctk.CTkFont(size=12, weight="bold")
-        )
-        format_menu.pack(side="right", padx=(0, 10))
-        
-        # Engine selector with info button
-        engine_frame = ctk.CTkFrame(settings_frame, fg_color="transparent")
-        engine_frame.pack(fill="x", padx=15, pady=(5, 15))
-        
-        engine_label = ctk.CTkLabel(
-            engine_frame, 
-            text="Engine:",
-            text_color=COLORS['text_primary']
-        )
-        engine_label.pack(side="left")
-        
-        engine_info_btn = ctk.CTkButton(
-            engine_frame,
-            text="i",
-            width=25,
-            height=25,
-            corner_radius=12,
-            command=lambda: self.show_info("engine"),
-            fg_color=COLORS['text_secondary'],
-            hover_color=COLORS['accent']
-        )
-        engine_info_btn.pack(side="right")
-        
-        engine_menu = ctk.CTkOptionMenu(
-            engine_frame,
-            values=["Pillow", "Imageio"],
-            variable=self.engine_var,
-            width=200,
-            fg_color=COLORS['bg_card'],
-            button_color=COLORS['accent'],
-            button_hover_color="#0056CC",
-            text_color=COLORS['text_primary'],
-            font=ctk.CTkFont(size=12, weight="bold")
-        )
-        engine_menu.pack(side="right", padx=(0, 10))
-        
-        # Resize Section
-        resize_frame = ctk.CTkFrame(
-            parent, 
-            corner_radius=10,
-            fg_color=COLORS['bg_secondary'],
-            border_width=1,
-            border_color=COLORS['border']
-        )
-        resize_frame.pack(fill="x", padx=20, pady=(0, 10))
-        
-        # Resize header with checkbox
-        resize_header_frame = ctk.CTkFrame(resize_frame, fg_color="transparent")
-        resize_header_frame.pack(fill="x", padx=15, pady=(15, 10))
-        
-        self.resize_checkbox = ctk.CTkCheckBox(
-            resize_header_frame,
-            text="Resize Images",
-            variable=self.resize_enabled,
-            font=ctk.CTkFont(size=16, weight="bold"),
-            text_color=COLORS['text_primary'],
-            command=self.toggle_resize_options
-        )
-        self.resize_checkbox.pack(side="left")
-        
-        resize_info_btn = ctk.CTkButton(
-            resize_header_frame,
-            text="i",
-            width=25,
-            height=25,
-            corner_radius=12,
-            command=lambda: self.show_info("resize"),
-            fg_color=COLORS['text_secondary'],
-            hover_color=COLORS['accent']
-        )
-        resize_info_btn.pack(side="right")
-        
-        # Resize options frame (initially hidden)
-        self.resize_options_frame = ctk.CTkFrame(resize_frame, fg_color="transparent")
-        
-        # Scale/Percentage frame
-        scale_frame = ctk.CTkFrame(self.resize_options_frame, fg_color="transparent")
-        scale_frame.pack(fill="x", padx=15, pady=(5, 10))
-        
-        scale_label = ctk.CTkLabel(
-            scale_frame, 
-            text="Scale:",
-            text_color=COLORS['text_primary']
-        )
-        scale_label.pack(side="left")
-        
-        self.scale_entry = ctk.CTkEntry(
-            scale_frame,
-            textvariable=self.resize_scale,
-            width=80,
-            height=30
-        )
-        self.scale_entry.pack(side="left", padx=(10, 5))
-        
-        scale_unit_label = ctk.CTkLabel(
-            scale_frame, 
-            text="%",
-            text_color=COLORS['text_primary']
-        )
-        scale_unit_label.pack(side="left", padx=(5, 0))
-        
-        # Initially hide resize options
-        self.toggle_resize_options()
-        
-        # Output folder section
-        output_frame = ctk.CTkFrame(
-            parent, 
-            corner_radius=10,
-            fg_color=COLORS['bg_secondary'],
-            border_width=1,
-            border_color=COLORS['border']
-        )
-        output_frame.pack(fill="x", padx=20, pady=(0, 10))
-        
-        output_title = ctk.CTkLabel(
-            output_frame,
-            text="Output Folder",
-            font=ctk.CTkFont(size=16, weight="bold"),
-            text_color=COLORS['text_primary']
-        )
-        output_title.pack(pady=(15, 10))
-        
-        # Buttons frame for output folder actions
-        output_buttons_frame = ctk.CTkFrame(output_frame, fg_color="transparent")
-        output_buttons_frame.pack(pady=(0, 10))
-        
-        output_btn = ctk.CTkButton(
-            output_buttons_frame,
-            text="Select Output Folder",
-            command=self.select_output_folder,
-            height=35,
-            width=140,
-            corner_radius=8,
-            fg_color=COLORS['accent'],
-            hover_color="#0056CC"
-        )
-        output_btn.pack(side="left", padx=(0, 8))
-        
-        self.open_folder_btn = ctk.CTkButton(
-            output_buttons_frame,
-            text="📁 Open Folder",
-            command=self.open_output_folder,
-            height=35,
-            width=110,
-            corner_radius=8,
-            fg_color=COLORS['text_secondary'],
-            hover_color=COLORS['accent']
-        )
-        self.open_folder_btn.pack(side="left")
-        
-        self.output_label = ctk.CTkLabel(
-            output_frame,
-            text="Same as source folder",
-            font=ctk.CTkFont(size=12),
-            text_color=COLORS['text_secondary']
-        )
-        self.output_label.pack(pady=(5, 15))
-        
-        # Compress button
-        compress_btn = ctk.CTkButton(
-            parent,
-            text="Start Compression",
-            command=self.start_compression,
-            height=45,
-            font=ctk.CTkFont(size=16, weight="bold"),
-            corner_radius=10,
-            fg_color=COLORS['success'],
-            hover_color="#28A745"
-        )
-        compress_btn.pack(fill="x", padx=20, pady=(0, 10))
-        
-        # Progress bar
-        self.progress = ctk.CTkProgressBar(parent)
-        self.progress.pack(fill="x", padx=20, pady=(0, 10))
-        self.progress.set(0)
-        
-
-        
-    def setup_right_column(self, parent):
-        # Preview header with title and clear button
-        header_frame = ctk.CTkFrame(parent, fg_color="transparent")
-        header_frame.pack(fill="x", padx=20, pady=(20, 10))
-        
-        preview_title = ctk.CTkLabel(
-            header_frame,
-            text="Image Preview",
-            font=ctk.CTkFont(size=18, weight="bold"),
-            text_color=COLORS['text_primary']
-        )
-        preview_title.pack(side="left")
-        
-        self.clear_btn = ctk.CTkButton(
-            header_frame,
-            text="Clear All",
-            command=self.clear_images,
-            height=30,
-            width=80,
-            corner_radius=8,
-            fg_color=COLORS['error'],
-            hover_color="#CC2E24"
-        )
-        self.clear_btn.pack(side="right")
-        self.clear_btn.pack_forget()  # Hide initially
-        
-        # Scrollable frame for images (reduced height)
-        self.preview_frame = ctk.CTkScrollableFrame(
-            parent, 
-            corner_radius=10,
-            fg_color=COLORS['bg_secondary'],
-            border_width=1,
-            border_color=COLORS['border'],
-            height=350
-        )
-        self.preview_frame.pack(fill="both", expand=True, padx=20, pady=(0, 10))
-        
-        # Initial message (centered)
-        self.no_images_label = ctk.CTkLabel(
-            self.preview_frame,
-            text="No images loaded\nClick 'Select Images' to get started",
-            font=ctk.CTkFont(size=14),
-            text_color=COLORS['text_secondary']
-        )
-        self.no_images_label.pack(expand=True, pady=(120, 0))
-        
-        # Support Development section
-        support_frame = ctk.CTkFrame(
-            parent, 
-            corner_radius=10,
-            fg_color=COLORS['bg_card'],
-            border_width=1,
-            border_color=COLORS['border']
-        )
-        support_frame.pack(fill="x", padx=20, pady=(0, 10))
-        
-        # Support header with emoji
-        support_header_frame = ctk.CTkFrame(support_frame, fg_color="transparent")
-        support_header_frame.pack(fill="x", padx=20, pady=(12, 5))
-        
-        support_title = ctk.CTkLabel(
-            support_header_frame,
-            text="🤝 Support Development",
-            font=ctk.CTkFont(size=16, weight="bold"),
-            text_color=COLORS['text_primary']
-        )
-        support_title.pack()
-        
-        # Support description
-        support_desc = ctk.CTkLabel(
-            support_frame,
-            text="If you find Hikari useful, consider supporting its development!",
-            font=ctk.CTkFont(size=12),
-            text_color=COLORS['text_secondary']
-        )
-        support_desc.pack(pady=(0, 8))
-        
-        # Ko-fi button (large and prominent)
-        kofi_btn = ctk.CTkButton(
-            support_frame,
-            text="☕ Buy me a coffee on Ko-fi",
-            command=lambda: webbrowser.open("https://ko-fi.com/gary19gts"),
-            height=45,
-            corner_radius=10,
-            fg_color="#FF5E5B",
-            hover_color="#E04E4B",
-            text_color="white",
-            font=ctk.CTkFont(size=14, weight="bold")
-        )
-        kofi_btn.pack(fill="x", padx=20, pady=(0, 6))
-        
-        # Thank you message
-        thank_you_label = ctk.CTkLabel(
-            support_frame,
-            text="Thank you for your support! 🖤",
-            font=ctk.CTkFont(size=11),
-            text_color=COLORS['text_secondary']
-        )
-        thank_you_label.pack(pady=(0, 12))
-        
-        # Credits section (single line)
-        credits_frame = ctk.CTkFrame(
-            parent, 
-            corner_radius=10,
-            fg_color=COLORS['bg_secondary'],
-            border_width=1,
-            border_color=COLORS['border']
-        )
-        credits_frame.pack(fill="x", padx=20, pady=(5, 20))
-        
-        # Credits content in horizontal layout
-        credits_content_frame = ctk.CTkFrame(credits_frame, fg_color="transparent")
-        credits_content_frame.pack(fill="x", padx=15, pady=12)
-        
-        credits_text = ctk.CTkLabel(
-            credits_content_frame,
-            text="Hikari Image Compressor v1.1.0 • Created by Gary19gts",
-            font=ctk.CTkFont(size=12),
-            text_color=COLORS['text_primary']
-        )
-        credits_text.pack(side="left")
-        
-        # Buttons on the right
-        buttons_frame = ctk.CTkFrame(credits_content_frame, fg_color="transparent")
-        buttons_frame.pack(side="right")
-        
-        about_btn = ctk.CTkButton(
-            buttons_frame,
-            text="About",
-            command=self.show_about,
-            height=40,
-            width=75,
-            corner_radius=8,
-            fg_color=COLORS['accent'],
-            hover_color="#0056CC",
-            font=ctk.CTkFont(size=12)
-        )
-        about_btn.pack(side="left", padx=(0, 8))
-        
-        credits_btn = ctk.CTkButton(
-            buttons_frame,
-            text="Credits",
-            command=self.show_credits,
-            height=40,
-            width=75,
-            corner_radius=8,
-            fg_color=COLORS['text_secondary'],
-            hover_color=COLORS['accent'],
-            font=ctk.CTkFont(size=12)
-        )
-        credits_btn.pack(side="left") 
-       
-    def load_images(self):
-        """Load images from file dialog"""
-        filetypes = [
-            ("Image files", "*.png *.jpg *.jpeg *.bmp *.tiff *.webp"),
-            ("PNG files", "*.png"),
-            ("JPEG files", "*.jpg *.jpeg"),
-            ("All files", "*.*")
-        ]
-        
-        files = filedialog.askopenfilenames(
-            title="Select Images to Compress",
-            filetypes=filetypes
-        )
-        
-        if files:
-            self.loaded_images = list(files)
-            # Set default output folder to same as first image
-            if not self.output_folder.get():
-                self.output_folder.set(os.path.dirname(files[0]))
-                self.output_label.configure(text=f"Output: {os.path.basename(self.output_folder.get())}")
-            
-            self.update_preview()
-            self.clear_btn.pack(side="right")  # Show clear button
-    
-    def select_output_folder(self):
-        """Select output folder"""
-        folder = filedialog.askdirectory(title="Select Output Folder")
-        if folder:
-            self.output_folder.set(folder)
-            self.output_label.configure(text=f"Output: {os.path.basename(folder)}")
-    
-    def open_output_folder(self):
-        """Open the output folder in file explorer"""
-        output_dir = self.output_folder.get()
-        
-        # If no output folder is set, use the source folder of the first image
-        if not output_dir and self.loaded_images:
-            output_dir = os.path.dirname(self.loaded_images[0])
-        
-        if output_dir and os.path.exists(output_dir):
-            try:
-                # Open folder in file explorer (cross-platform)
-                if os.name == 'nt':  # Windows
-                    os.startfile(output_dir)
-                elif os.name == 'posix':  # macOS and Linux
-                    if sys.platform == 'darwin':  # macOS
-                        os.system(f'open "{output_dir}"')
-                    else:  # Linux
-                        os.system(f'xdg-open "{output_dir}"')
-            except Exception as e:
-                messagebox.showerror("Error", f"Could not open folder: {e}")
-        else:
-            messagebox.showwarning("No Folder", "No output folder selected or folder doesn't exist.")
-    
-    def update_preview(self):
-        """Update the preview panel with loaded images"""
-        # Clear existing previews
-        for widget in self.preview_frame.winfo_children():
-            widget.destroy()
-        
-        if not self.loaded_images:
-            self.no_images_label = ctk.CTkLabel(
-                self.preview_frame,
-                text="No images loaded\nClick 'Select Images' to get started",
-                font=ctk.CTkFont(size=14),
-                text_color=COLORS['text_secondary']
-            )
-            self.no_images_label.pack(expand=True, pady=(120, 0))
-            self.clear_btn.pack_forget()  # Hide clear button
-            return
-        
-        # Show loaded images
-        for i, image_path in enumerate(self.loaded_images):
-            self.create_image_preview(image_path, i)
-    
-    def create_image_preview(self, image_path, index):
-        """Create a preview card for an image"""
-        # Image card frame
-        card_frame = ctk.CTkFrame(
-            self.preview_frame, 
-            corner_radius=10,
-            fg_color=COLORS['bg_card'],
-            border_width=1,
-            border_color=COLORS['border']
-        )
-        card_frame.pack(fill="x", padx=10, pady=5)
-        
-        # Image info frame
-        info_frame = ctk.CTkFrame(card_frame, fg_color="transparent")
-        info_frame.pack(fill="x", padx=15, pady=10)
-        
-        try:
-            # Load and resize image for thumbnail
-            with Image.open(image_path) as img:
-                # Calculate thumbnail size
-                img.thumbnail((150, 150), Image.Resampling.LANCZOS)
-                
-                # Convert to PhotoImage
-                photo = ImageTk.PhotoImage(img)
-                
-                # Image thumbnail
-                img_label = tk.Label(info_frame, image=photo, bg=COLORS['bg_card'], bd=0)
-                img_label.image = photo  # Keep a reference
-                img_label.pack(side="left", padx=(0, 15))
-                
-                # Image details
-                details_frame = ctk.CTkFrame(info_frame, fg_color="transparent")
-                details_frame.pack(side="left", fill="both", expand=True)
-                
-                # File name
-                filename = os.path.basename(image_path)
-                name_label = ctk.CTkLabel(
-                    details_frame,
-                    text=filename,
-                    font=ctk.CTkFont(size=14, weight="bold"),
-                    anchor="w",
-                    text_color=COLORS['text_primary']
-                )
-                name_label.pack(fill="x", pady=(0, 5))
-                
-                # File size
-                file_size = os.path.getsize(image_path)
-                size_text = self.format_file_size(file_size)
-                
-                # Get image dimensions
-                original_img = Image.open(image_path)
-                dimensions = f"{original_img.width}x{original_img.height}"
-                
-                size_label = ctk.CTkLabel(
-                    details_frame,
-                    text=f"Size: {size_text} • {dimensions}",
-                    font=ctk.CTkFont(size=12),
-                    text_color=COLORS['text_secondary'],
-                    anchor="w"
-                )
-                size_label.pack(fill="x", pady=(0, 5))
-                
-                # Estimated compression (store reference for updates)
-                estimated_size = self.estimate_compressed_size(file_size, original_img.width, original_img.height)
-                compression_ratio = ((file_size - estimated_size) / file_size) * 100
-                
-                estimate_label = ctk.CTkLabel(
-                    details_frame,
-                    text=f"Estimated: {self.format_file_size(estimated_size)} ({compression_ratio:.1f}% reduction)",
-                    font=ctk.CTkFont(size=12),
-                    text_color=COLORS['success'],
-                    anchor="w"
-                )
-                estimate_label.pack(fill="x")
-                
-                # Store reference for updating estimates
-                estimate_label.original_size = file_size
-                estimate_label.original_width = original_img.width
-                estimate_label.original_height = original_img.height
-                estimate_label.update_estimate = lambda: self.update_estimate_label(estimate_label)
-                
-                # Delete button (X) on the right side
-                delete_btn = ctk.CTkButton(
-                    info_frame,
-                    text="✕",
-                    width=30,
-                    height=30,
-                    corner_radius=15,
-                    fg_color=COLORS['error'],
-                    hover_color="#CC2E24",
-                    font=ctk.CTkFont(size=16, weight="bold"),
-                    command=lambda idx=index: self.remove_image(idx)
-                )
-                delete_btn.pack(side="right", padx=(10, 0))
-                
-        except Exception as e:
-            # Error loading image
-            error_label = ctk.CTkLabel(
-                info_frame,
-                text=f"Error loading: {os.path.basename(image_path)}",
-                font=ctk.CTkFont(size=12),
-                text_color=COLORS['error']
-            )
-            error_label.pack(pady=10)
-    
-    def format_file_size(self, size_bytes):
-        """Format file size in human readable format"""
-        if size_bytes < 1024:
-            return f"{size_bytes} B"
-        elif size_bytes < 1024 * 1024:
-            return f"{size_bytes / 1024:.1f} KB"
-        else:
-            return f"{size_bytes / (1024 * 1024):.1f} MB"
-    
-    def estimate_compressed_size(self, original_size, original_width=None, original_height=None):
-        """Estimate compressed file size based on quality setting and resize options"""
-        quality_map = {
-            "Low (30%)": 0.3,
-            "Medium (60%)": 0.5,
-            "High (80%)": 0.7,
-            "Maximum (95%)": 0.9
-        }
-        
-        format_map = {
-            "JPEG": 0.6,
-            "WebP": 0.4,
-            "PNG": 0.8
-        }
-        
-        quality_factor = quality_map.get(self.quality_var.get(), 0.7)
-        format_factor = format_map.get(self.format_var.get(), 0.6)
-        
-        # Calculate resize factor if dimensions are provided
-        resize_factor = 1.0
-        if self.resize_enabled.get() and original_width and original_height:
-            new_width, new_height = self.calculate_resize_dimensions(original_width, original_height)
-            original_pixels = original_width * original_height
-            new_pixels = new_width * new_height
-            resize_factor = new_pixels / original_pixels if original_pixels > 0 else 1.0
-        
-        return int(original_size * quality_factor * format_factor * resize_factor)
-    
-    def update_estimate_label(self, label):
-        """Update estimate label with current settings"""
-        width = getattr(label, 'original_width', None)
-        height = getattr(label, 'original_height', None)
-        estimated_size = self.estimate_compressed_size(label.original_size, width, height)
-        compression_ratio = ((label.original_size - estimated_size) / label.original_size) * 100
-        label.configure(text=f"Estimated: {self.format_file_size(estimated_size)} ({compression_ratio:.1f}% reduction)")
-    
-    def on_settings_change(self, *args):
-        """Called when quality or format settings change"""
-        # Update all estimate labels
-        for widget in self.preview_frame.winfo_children():
-            if hasattr(widget, 'winfo_children'):
-                for child in widget.winfo_children():
-                    if hasattr(child, 'winfo_children'):
-                        for grandchild in child.winfo_children():
-                            if hasattr(grandchild, 'winfo_children'):
-                                for ggchild in grandchild.winfo_children():
-                                    if hasattr(ggchild, 'update_estimate'):
-                                        ggchild.update_estimate()
-    
-    def clear_images(self):
-        """Clear all loaded images"""
-        if not self.loaded_images:
-            return
-            
-        # Show confirmation dialog
-        result = messagebox.askyesno(
-            "Clear All Images", 
-            f"Are you sure you want to remove all {len(self.loaded_images)} images?",
-            icon="warning"
-        )
-        
-        if result:
-            self.loaded_images = []
-            self.update_preview()
-    
-    def remove_image(self, index):
-        """Remove a specific image from the list"""
-        if 0 <= index < len(self.loaded_images):
-            self.loaded_images.pop(index)
-            self.update_preview()
-    
-    def toggle_resize_options(self):
-        """Toggle visibility of resize options"""
-        if self.resize_enabled.get():
-            self.resize_options_frame.pack(fill="x", pady=(0, 10))
-        else:
-            self.resize_options_frame.pack_forget()
-    
-    def calculate_resize_dimensions(self, original_width, original_height):
-        """Calculate new dimensions based on resize settings"""
-        if not self.resize_enabled.get():
-            return original_width, original_height
-        
-        try:
-            scale = float(self.resize_scale.get()) / 100.0
-            new_width = int(original_width * scale)
-            new_height = int(original_height * scale)
-            return new_width, new_height
-        except (ValueError, ZeroDivisionError):
-            # Return original dimensions if there's an error
-            return original_width, original_height
-    
-    def show_info(self, info_type):
-        """Show information tooltips"""
-        info_texts = {
-            "quality": """Quality Settings:
-
-• Low (30%): Smallest file size, noticeable quality loss
-• Medium (60%): Good balance of size and quality
-• High (80%): Excellent quality with good compression
-• Maximum (95%): Best quality, minimal compression
-
-💡 Tip: High (80%) is recommended for the best balance 
-between excellent compression and good quality.""",
-            
-            "format": """Output Formats:
-
-• JPEG: Best for photos, good compression, no transparency
-• WebP: Modern format, excellent compression, supports transparency
-• PNG: Lossless compression, supports transparency, larger files
-
-💡 Tip: WebP offers the best compression while maintaining 
-excellent quality for most use cases.""",
-            
-            "engine": """Compression Engines:
-
-• Pillow: Fast, reliable, good for general use
-• Imageio: Advanced options, better for specific formats
-
-💡 Tip: Pillow is recommended for most users as it provides 
-excellent compression with good performance.""",
-            
-            "resize": """Resize Options:
-
-Scale images by percentage while maintaining aspect ratio:
-• 50% = Half the original size
-• 25% = Quarter the original size  
-• 75% = Three-quarters the original size
-• 100% = Original size (no change)
-
-💡 Tip: Use 50% for web images, 25% for thumbnails, or 75% for 
-moderate size reduction while keeping good quality."""
-        }
-        
-        messagebox.showinfo("Information", info_texts.get(info_type, "No information available"))
-    
-    def show_about(self):
-        """Show about dialog"""
-        about_text = """Hikari Image Compressor v1.1.0 stable
-
-A modern, user-friendly image compression tool with an Apple-style interface.
-
-Created by: Gary19gts
-License: GNU Affero General Public License v3.0
-GitHub: https://github.com/Gary19gts/hikari-image-compressor
-
-Features:
-• Multiple format support (JPEG, WebP, PNG)
-• Quality presets for easy compression
-• Batch processing capabilities
-• Real-time compression estimates
-• Modern, intuitive interface
-
-This software is free and open source. You can redistribute it and/or modify it under the terms of the AGPL v3 license."""
-        
-        messagebox.showinfo("About Hikari Image Compressor", about_text)
-    
-    def show_credits(self):
-        """Show credits and acknowledgments dialog"""
-        credits_window = ctk.CTkToplevel(self.root)
-        credits_window.title("Credits & Acknowledgments")
-        credits_window.geometry("600x500")
-        credits_window.resizable(False, False)
-        credits_window.transient(self.root)
-        credits_window.grab_set()
-        
-        # Center the window
-        credits_window.update_idletasks()
-        x = (credits_window.winfo_screenwidth() // 2) - (600 // 2)
-        y = (credits_window.winfo_screenheight() // 2) - (500 // 2)
-        credits_window.geometry(f"600x500+{x}+{y}")
-        
-        # Main frame
-        main_frame = ctk.CTkFrame(credits_window, fg_color="transparent")
-        main_frame.pack(fill="both", expand=True, padx=20, pady=20)
-        
-        # Title
-        title_label = ctk.CTkLabel(
-            main_frame,
-            text="Credits & Acknowledgments",
-            font=ctk.CTkFont(size=20, weight="bold")
-        )
-        title_label.pack(pady=(0, 20))
-        
-        # Scrollable frame for credits
-        credits_frame = ctk.CTkScrollableFrame(main_frame)
-        credits_frame.pack(fill="both", expand=True, pady=(0, 20))
-        
-        # Credits content
-        credits_content = """
-HIKARI IMAGE COMPRESSOR
-Created by Gary19gts
-
-OPEN SOURCE LIBRARIES & ACKNOWLEDGMENTS
-
-This software is built upon the excellent work of many open source developers. We gratefully acknowledge the following libraries and their contributors:
-
-🐍 PYTHON
-• License: Python Software Foundation License
-• The foundation that makes this application possible
-• Website: https://python.org
-
-🖼️ PILLOW (PIL Fork)
-• License: HPND License
-• Powerful image processing library
-• Maintainers: Alex Clark and contributors
-• Website: https://pillow.readthedocs.io
-• Used for: Core image processing and compression
-
-🎨 CUSTOMTKINTER
-• License: MIT License
-• Modern and customizable tkinter widgets
-• Author: Tom Schimansky
-• Website: https://github.com/TomSchimansky/CustomTkinter
-• Used for: Modern UI components and styling
-
-📸 IMAGEIO
-• License: BSD 2-Clause License
-• Versatile image I/O library
-• Maintainers: Almar Klein and contributors
-• Website: https://imageio.readthedocs.io
-• Used for: Advanced image format support
-
-🖥️ TKINTER
-• License: Python Software Foundation License
-• Standard GUI toolkit for Python
-• Part of Python standard library
-• Used for: Base GUI framework
-
-SPECIAL THANKS
-
-• The Python Software Foundation for maintaining Python
-• All open source contributors who make projects like this possible
-• The image processing community for continuous innovation
-• Users who provide feedback and help improve the software
-
-LICENSE INFORMATION
-
-Hikari Image Compressor is licensed under the GNU Affero General Public License v3.0 (AGPL-3.0). This ensures that the software remains free and open source, and that any modifications or network use must also be made available under the same license.
-
-For more information about the AGPL-3.0 license, visit:
-https://www.gnu.org/licenses/agpl-3.0.html
-
-CONTRIBUTING
-
-This project is open source and welcomes contributions! Visit our GitHub repository to:
-• Report bugs or request features
-• Submit pull requests
-• View the source code
-• Read the full documentation
-
-GitHub: https://github.com/Gary19gts/hikari-image-compressor
-        """
-        
-        credits_text = ctk.CTkLabel(
-            credits_frame,
-            text=credits_content.strip(),
-            font=ctk.CTkFont(size=12),
-            justify="left",
-            anchor="nw"
-        )
-        credits_text.pack(fill="both", expand=True, padx=10, pady=10)
-        
-        # Buttons frame
-        buttons_frame = ctk.CTkFrame(main_frame, fg_color="transparent")
-        buttons_frame.pack(fill="x")
-        
-        # GitHub button
-        github_btn = ctk.CTkButton(
-            buttons_frame,
-            text="View on GitHub",
-            command=lambda: webbrowser.open("https://github.com/Gary19gts/hikari-image-compressor"),
-            height=35,
-            corner_radius=8,
-            fg_color=COLORS['accent'],
-            hover_color="#0056CC"
-        )
-        github_btn.pack(side="left", padx=(0, 10))
-        
-        # License button
-        license_btn = ctk.CTkButton(
-            buttons_frame,
-            text="View License",
-            command=lambda: webbrowser.open("https://www.gnu.org/licenses/agpl-3.0.html"),
-            height=35,
-            corner_radius=8,
-            fg_color=COLORS['text_secondary'],
-            hover_color=COLORS['accent']
-        )
-        license_btn.pack(side="left", padx=(0, 10))
-        
-        # Close button
-        close_btn = ctk.CTkButton(
-            buttons_frame,
-            text="Close",
-            command=credits_window.destroy,
-            height=35,
-            corner_radius=8,
-            fg_color=COLORS['error'],
-            hover_color="#CC2E24"
-        )
-        close_btn.pack(side="right")
-    
-    def get_quality_value(self):
-        """Convert quality string to numeric value"""
-        quality_map = {
-            "Low (30%)": 30,
-            "Medium (60%)": 60,
-            "High (80%)": 80,
-            "Maximum (95%)": 95
-        }
-        return quality_map.get(self.quality_var.get(), 80)
-    
-    def get_quality_suffix(self):
-        """Get quality suffix for filename"""
-        quality_suffix_map = {
-            "Low (30%)": "-Low",
-            "Medium (60%)": "-Medium",
-            "High (80%)": "-High",
-            "Maximum (95%)": "-Maximum"
-        }
-        return quality_suffix_map.get(self.quality_var.get(), "-High")
-    
-    def get_resize_suffix(self):
-        """Get resize suffix for filename"""
-        if not self.resize_enabled.get():
-            return ""
-        
-        try:
-            scale = self.resize_scale.get()
-            return f"-{scale}pct"
-        except:
-            return "-resized"
-    
-    def start_compression(self):
-        """Start the compression process"""
-        if not self.loaded_images:
-            messagebox.showwarning("No Images", "Please load images first.")
-            return
-        
-        output_dir = self.output_folder.get()
-        if not output_dir:
-            output_dir = os.path.dirname(self.loaded_images[0])
-        
-        # Create output directory if it doesn't exist
-        os.makedirs(output_dir, exist_ok=True)
-        
-        # Start compression in a separate thread
-        thread = threading.Thread(target=self.compress_images, args=(output_dir,))
-        thread.daemon = True
-        thread.start()
-    
-    def compress_images(self, output_dir):
-        """Compress images in background thread"""
-        total_images = len(self.loaded_images)
-        quality = self.get_quality_value()
-        output_format = self.format_var.get().lower()
-        
-        for i, image_path in enumerate(self.loaded_images):
-            try:
-                # Update progress
-                progress = (i + 1) / total_images
-                self.root.after(0, lambda p=progress: self.progress.set(p))
-                
-                # Open and process image
-                with Image.open(image_path) as img:
-                    # Resize image if enabled
-                    if self.resize_enabled.get():
-                        original_width, original_height = img.size
-                        new_width, new_height = self.calculate_resize_dimensions(original_width, original_height)
-                        
-                        if (new_width, new_height) != (original_width, original_height):
-                            img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-                    
-                    # Convert RGBA to RGB for JPEG
-                    if output_format == 'jpeg' and img.mode in ('RGBA', 'LA', 'P'):
-                        background = Image.new('RGB', img.size, (255, 255, 255))
-                        if img.mode == 'P':
-                            img = img.convert('RGBA')
-                        background.paste(img, mask=img.split()[-1] if img.mode == 'RGBA' else None)
-                        img = background
-                    
-                    # Generate output filename with quality and resize suffix
-                    base_name = os.path.splitext(os.path.basename(image_path))[0]
-                    extension = 'jpg' if output_format == 'jpeg' else output_format
-                    quality_suffix = self.get_quality_suffix()
-                    resize_suffix = self.get_resize_suffix() if self.resize_enabled.get() else ""
-                    output_path = os.path.join(output_dir, f"{base_name}_compressed{quality_suffix}{resize_suffix}.{extension}")
-                    
-                    # Save compressed image
-                    save_kwargs = {'optimize': True}
-                    if output_format in ['jpeg', 'webp']:
-                        save_kwargs['quality'] = quality
-                    
-                    img.save(output_path, format=output_format.upper(), **save_kwargs)
-                    
-            except Exception as e:
-                print(f"Error compressing {image_path}: {e}")
-        
-        # Show completion message
-        self.root.after(0, self.compression_complete)
-    
-    def compression_complete(self):
-        """Handle compression completion"""
-        self.progress.set(1.0)
-        messagebox.showinfo("Complete", "Image compression completed successfully!")
-        self.progress.set(0)
-    
-    def run(self):
-        """Start the application"""
-        self.root.mainloop()
-
-if __name__ == "__main__":
-    app = ImageCompressor()
-    app.run()
\ No newline at end of file
+#!/usr/bin/env python3
+"""
+Hikari Image Compressor
+Version: 1.1.0 stable
+Date: September 2025
+Author: Gary19gts
+
+Modern image compressor with Apple-style GUI
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+GNU Affero General Public License for more details.
+
+You should have received a copy of the GNU Affero General Public License
+along with this program. If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import os
+import sys
+import threading
+from pathlib import Path
+import io
+import importlib.util
+import subprocess
+import select
+import struct
+import zlib
+import zipfile
+import tarfile
+import time
+import argparse
+import multiprocessing
+import mmap
+import cProfile
+import pstats
+import tracemalloc
+import json
+import csv
+import math
+import hashlib
+from contextlib import contextmanager, nullcontext
+from collections import namedtuple, deque
+from array import array
+from multiprocessing import shared_memory
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait, FIRST_COMPLETED
+from PIL import Image, ImageSequence
+
+class LazyModule:
+    """Module proxy that imports the module on first attribute access.
+
+    Keeps the GUI toolkit and NumPy out of worker processes and the command
+    line tools, and off the critical path of the window appearing.
+    """
+    
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+    
+    def __getattr__(self, attribute):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attribute)
+
+tk = LazyModule("tkinter")
+filedialog = LazyModule("tkinter.filedialog")
+messagebox = LazyModule("tkinter.messagebox")
+ttk = LazyModule("tkinter.ttk")
+ctk = LazyModule("customtkinter")
+ImageTk = LazyModule("PIL.ImageTk")
+ImageDraw = LazyModule("PIL.ImageDraw")
+ImageCms = LazyModule("PIL.ImageCms")
+webbrowser = LazyModule("webbrowser")
+np = LazyModule("numpy")
+cv2 = LazyModule("cv2")
+
+# Configure colors for Apple-like appearance
+COLORS = {
+    'bg_primary': '#FFFFFF',
+    'bg_secondary': '#F8F9FA',
+    'bg_card': '#FFFFFF',
+    'text_primary': '#1D1D1F',
+    'text_secondary': '#86868B',
+    'accent': '#007AFF',
+    'border': '#E5E5E7',
+    'success': '#34C759',
+    'warning': '#FF9500',
+    'error': '#FF3B30'
+}
+
+# Quality presets shown in the Quality menu
+QUALITY_PRESETS = {
+    "Low (30%)": 30,
+    "Medium (60%)": 60,
+    "High (80%)": 80,
+    "Maximum (95%)": 95
+}
+
+# Quality menu entry that picks the lowest quality meeting an SSIM target
+AUTO_QUALITY_LABEL = "Auto (SSIM)"
+
+# SSIM targets offered for auto quality
+AUTO_QUALITY_TARGETS = {
+    "Very High (0.99)": 0.99,
+    "High (0.97)": 0.97,
+    "Balanced (0.95)": 0.95,
+    "Small (0.90)": 0.90
+}
+
+# Auto quality measures a copy downscaled to this long edge
+AUTO_QUALITY_PREVIEW_EDGE = 512
+
+# Qualities auto mode searches (PNG uses its palette steps instead)
+AUTO_QUALITY_RANGE = list(range(30, 96, 5))
+
+# Cache folder (inside the user cache) for auto quality results
+AUTO_QUALITY_CACHE_FOLDER = "auto-quality-v1"
+
+# Rough output/input size factors behind the preview estimates
+ESTIMATE_QUALITY_FACTORS = {
+    "Low (30%)": 0.3,
+    "Medium (60%)": 0.5,
+    "High (80%)": 0.7,
+    "Maximum (95%)": 0.9,
+    AUTO_QUALITY_LABEL: 0.6
+}
+ESTIMATE_FORMAT_FACTORS = {
+    "JPEG": 0.6,
+    "WebP": 0.4,
+    "PNG": 0.8,
+    "AVIF": 0.35
+}
+
+# Quiet time after the last settings change before estimates are refreshed
+ESTIMATE_DEBOUNCE_MS = 150
+
+# Output formats in the order they are tried when falling back
+OUTPUT_FORMATS = ["JPEG", "WebP", "PNG"]
+
+# Encoder effort presets for WebP and AVIF, from fastest to smallest
+EFFORT_PRESETS = {
+    "Fast": {'webp_method': 0, 'webp_lossless_quality': 25, 'avif_speed': 8},
+    "Balanced": {'webp_method': 4, 'webp_lossless_quality': 75, 'avif_speed': 6},
+    "Smallest": {'webp_method': 6, 'webp_lossless_quality': 100, 'avif_speed': 4}
+}
+
+WEBP_MODES = ["Lossy", "Near-Lossless", "Lossless"]
+
+ALPHA_QUALITY_MODES = ["Lossless", "Match Quality"]
+
+# Resampling filters offered for resizing; "Fast" reduces by an integer
+# factor first and finishes with a cheap bilinear pass
+RESAMPLING_FILTERS = {
+    "Fast": Image.Resampling.BILINEAR,
+    "Nearest": Image.Resampling.NEAREST,
+    "Box": Image.Resampling.BOX,
+    "Bilinear": Image.Resampling.BILINEAR,
+    "Lanczos": Image.Resampling.LANCZOS
+}
+
+# Engines in the Engine menu and the module each needs (None = built in).
+# Engines without a resize backend of their own resize with Pillow, which
+# uses SIMD kernels when the Pillow-SIMD build is installed
+ENGINES = {"Pillow": None, "Imageio": "imageio", "OpenCV": "cv2"}
+
+# OpenCV interpolation for each filter when enlarging; shrinking uses
+# INTER_AREA, the antialiased equivalent of Pillow's downscaling filters
+OPENCV_INTERPOLATION = {
+    "Fast": "INTER_LINEAR",
+    "Box": "INTER_AREA",
+    "Bilinear": "INTER_LINEAR",
+    "Lanczos": "INTER_LANCZOS4"
+}
+
+# The resize engine benchmark fails when an engine's SSIM is lower than
+# Pillow's by more than this
+ENGINE_SSIM_TOLERANCE = 0.01
+
+# Per-file statuses in a batch report; all but "failed" are encode outcomes
+REPORT_STATUSES = ["compressed", "format_fallback", "quality_reduced", "kept_original", "failed"]
+
+# Report files (.json and .csv) written to the output folder after a batch
+REPORT_NAME = "hikari-report"
+REPORT_COLUMNS = [
+    "path", "status", "output_path", "format", "quality", "ssim",
+    "input_bytes", "output_bytes", "ratio", "seconds", "error_type", "error", "note"
+]
+
+# Batch history (inside the user cache): one file per run plus an index,
+# keeping the most recent HISTORY_LIMIT runs
+HISTORY_FOLDER = "history"
+HISTORY_LIMIT = 50
+
+# Images up to this size are compressed in chunks of up to
+# SMALL_IMAGE_CHUNK per job, so icon batches don't pay a round trip to a
+# worker process for every file
+SMALL_IMAGE_PIXELS = 256 * 256
+SMALL_IMAGE_CHUNK = 64
+
+# Resize modes: entry label, unit and filename suffix pattern
+RESIZE_MODES = {
+    "Percentage": ("Scale:", "%", "-{}pct"),
+    "Long Edge": ("Long edge:", "px", "-{}px"),
+    "Fit Box": ("Box:", "px", "-fit{}"),
+    "Max Megapixels": ("Limit:", "MP", "-{}MP")
+}
+
+# Relative decode cost per megapixel by source format (JPEG = 1)
+DECODE_COST = {'JPEG': 1.0, 'PNG': 2.5, 'WEBP': 1.5, 'TIFF': 1.2, 'BMP': 0.3, 'GIF': 1.5, 'AVIF': 4.0}
+
+# Relative encode cost per output megapixel by output format (JPEG = 1)
+ENCODE_COST = {'jpeg': 1.0, 'webp': 3.0, 'png': 4.0, 'avif': 12.0}
+
+# Worker process counts offered in the advanced settings
+WORKER_CHOICES = ["Auto", "1", "2", "4", "8"]
+
+# How source files are read: one big read with read-ahead, a memory map,
+# or Pillow's own small reads
+INPUT_IO_MODES = ["Read Ahead", "Memory-Mapped", "Direct"]
+
+# How images move through the workers: decoded and encoded by the same
+# worker, or decoded and encoded on separate worker pools
+PIPELINE_MODES = ["Combined", "Split Decode/Encode"]
+
+# Decoded pixels go from decode to encode workers in shared memory blocks,
+# pooled in power-of-two sizes starting at this size
+SHARED_BLOCK_MIN_BYTES = 1024 * 1024
+
+# Bytes per pixel of the modes Pillow maps straight onto a shared buffer
+SHARED_MODE_BYTES = {'L': 1, 'RGBX': 4, 'RGBA': 4}
+
+# Decoded pixels are copied into a shared block this many bytes at a time
+SHARED_COPY_BAND_BYTES = 4 * 1024 * 1024
+
+# Number of upcoming files read in the background in Read Ahead mode
+READ_AHEAD_CHOICES = ["2", "4", "8", "16"]
+
+# Threads used to read file headers before a batch is scheduled
+PROBE_THREADS = 8
+
+# File types picked up from folders and archives (same as the Select Images dialog)
+IMAGE_EXTENSIONS = {".png", ".jpg", ".jpeg", ".bmp", ".tiff", ".tif", ".webp", ".gif"}
+
+# Archives whose images are read in place, without extracting them
+ARCHIVE_EXTENSIONS = (".zip", ".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tbz2", ".tar.xz", ".txz")
+
+# Images inside an archive are addressed as "<archive>::<member name>"
+ARCHIVE_SEPARATOR = "::"
+
+# Folder (inside the output folder) that receives profiling dumps
+PROFILE_FOLDER = "hikari-profile"
+
+# Pipeline stages timed and profiled separately
+PROFILE_STAGES = ["probe", "decode", "resize", "color", "handoff", "auto_quality", "flatten", "encode", "write"]
+
+# Conversion each source mode needs before encoding, picked from the probe
+COLOR_PATHS = {'I;16': "16-bit", 'I;16L': "16-bit", 'I;16B': "16-bit", 'I;16N': "16-bit", 'I': "16-bit", 'CMYK': "CMYK"}
+
+# Generated application icon, cached on disk after the first start
+ICON_CACHE_NAME = "app-icon-v1.png"
+
+# Time budget for the window to appear, checked by the startup benchmark
+STARTUP_BUDGET_SECONDS = 1.0
+
+# What metadata is copied from the source into the output
+METADATA_POLICIES = ["Strip All", "Keep ICC Only", "Keep All"]
+
+# Metadata each output format can carry (TIFF and GIF hold multi-frame
+# outputs; EXIF is left out of TIFF, whose writer merges it into the
+# page's own tags)
+METADATA_FIELDS = {
+    'jpeg': ('icc_profile', 'exif', 'comment'),
+    'png': ('icc_profile', 'exif'),
+    'webp': ('icc_profile', 'exif', 'xmp'),
+    'avif': ('icc_profile', 'exif', 'xmp'),
+    'tiff': ('icc_profile',),
+    'gif': ('comment',)
+}
+
+# Fields these writers take from the image's own info when not passed, so
+# they are passed empty when the policy drops them
+METADATA_INFO_FALLBACK = {
+    'jpeg': ('comment',),
+    'png': ('icc_profile',),
+    'avif': ('icc_profile',),
+    'tiff': ('icc_profile',),
+    'gif': ('comment',)
+}
+
+ORIENTATION_TAG = 0x0112
+
+# Same orientation mapping as ImageOps.exif_transpose
+ORIENTATION_TRANSPOSE = {
+    2: Image.Transpose.FLIP_LEFT_RIGHT,
+    3: Image.Transpose.ROTATE_180,
+    4: Image.Transpose.FLIP_TOP_BOTTOM,
+    5: Image.Transpose.TRANSPOSE,
+    6: Image.Transpose.ROTATE_270,
+    7: Image.Transpose.TRANSVERSE,
+    8: Image.Transpose.ROTATE_90
+}
+
+# Whether animations and multi-page files keep every frame
+FRAME_MODES = ["All Frames", "First Frame"]
+
+# Formats whose extra frames are kept: animations and multi-page TIFFs.
+# MPO (a JPEG with an embedded preview) is deliberately not one of them
+MULTI_FRAME_FORMATS = {'GIF', 'PNG', 'WEBP', 'TIFF', 'AVIF'}
+
+# Decoded frames held at once (source frames per group, and all output
+# frames, which the encoders take together), and threads resizing them.
+# Animations whose output frames would not fit keep only their first frame
+FRAME_MEMORY_LIMIT = 256 * 1024 * 1024
+FRAME_THREADS = 4
+
+# Quality steps tried (highest first) when an output must get smaller
+QUALITY_STEPS = [95, 80, 60, 30]
+
+# Output file name, without extension. Tokens: {name} source name, {dir}
+# folder holding the source, {q} quality suffix, {scale} resize suffix,
+# {hash} 8 hex digits of the source path. "/" makes subfolders
+DEFAULT_NAME_TEMPLATE = "{name}_compressed{q}{scale}"
+
+# What to do when two inputs would get the same output name
+COLLISION_POLICIES = ["Number Duplicates", "Stop"]
+
+# What to do when the compressed output is not smaller than the source
+LARGER_POLICIES = ["Keep Original", "Try Other Formats", "Lower Quality", "Save Anyway"]
+
+# PNG palette size per quality level (None keeps full color, lossless)
+PNG_PALETTE_COLORS = {30: 64, 60: 128, 80: 256, 95: None}
+
+# PNG encoder passes per mode; exhaustive keeps the smallest result
+PNG_MODES = {
+    "Fast": [{'compress_level': 3}],
+    "Standard": [{'optimize': True}],
+    "Exhaustive": [
+        {'optimize': True, 'compress_type': zlib.Z_DEFAULT_STRATEGY},
+        {'optimize': True, 'compress_type': zlib.Z_FILTERED},
+        {'compress_level': 9, 'compress_type': zlib.Z_RLE}
+    ]
+}
+
+def get_cache_dir():
+    """Per-user cache folder for the application"""
+    if os.name == 'nt':
+        base = os.environ.get('LOCALAPPDATA', os.path.expanduser('~'))
+    elif sys.platform == 'darwin':
+        base = os.path.expanduser('~/Library/Caches')
+    else:
+        base = os.environ.get('XDG_CACHE_HOME', os.path.expanduser('~/.cache'))
+    return os.path.join(base, 'hikari-image-compressor')
+
+def avif_available():
+    """Check for AVIF support in Pillow or the pillow-avif-plugin"""
+    # Checked without Image.init(), which would import every Pillow plugin
+    from PIL import features
+    try:
+        if features.check_module('avif'):
+            return True
+    except ValueError:
+        # Pillow too old to know about AVIF
+        pass
+    return importlib.util.find_spec('pillow_avif') is not None
+
+def get_output_formats():
+    """List the output formats supported by the installed Pillow"""
+    if avif_available():
+        return OUTPUT_FORMATS + ["AVIF"]
+    return list(OUTPUT_FORMATS)
+
+def get_engines():
+    """List the engines whose modules are installed"""
+    return [engine for engine, module in ENGINES.items() if module is None or importlib.util.find_spec(module)]
+
+class BatchProfiler:
+    """Per-stage cProfile and tracemalloc capture for one process.
+
+    Stages nest (flatten runs inside encode); only the innermost stage is
+    profiled at any time so each function call is attributed once, and a
+    stage's seconds leave out the time spent in its nested stages.
+    tracemalloc is only stopped again if this profiler started it.
+    """
+    
+    def __init__(self):
+        self.pid = os.getpid()
+        self.profiles = {}
+        self.seconds = {}
+        self.peak_bytes = {}
+        self.top_allocations = {}
+        self.stack = []
+        self.nested_seconds = []  # per open stage, time spent in its nested stages
+        self.started_tracemalloc = not tracemalloc.is_tracing()
+        if self.started_tracemalloc:
+            tracemalloc.start()
+    
+    @contextmanager
+    def stage(self, name):
+        if self.stack:
+            self._pause(self.stack[-1])
+        self.stack.append(name)
+        self.nested_seconds.append(0.0)
+        profile = self.profiles.setdefault(name, cProfile.Profile())
+        tracemalloc.reset_peak()
+        start = time.perf_counter()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            elapsed = time.perf_counter() - start
+            self.seconds[name] = self.seconds.get(name, 0.0) + elapsed - self.nested_seconds.pop()
+            self._record_peak(name)
+            self.stack.pop()
+            if self.stack:
+                self.nested_seconds[-1] += elapsed
+                tracemalloc.reset_peak()
+                self.profiles[self.stack[-1]].enable()
+    
+    def _pause(self, name):
+        self.profiles[name].disable()
+        self._record_peak(name)
+    
+    def _record_peak(self, name):
+        peak = tracemalloc.get_traced_memory()[1]
+        if peak > self.peak_bytes.get(name, 0):
+            self.peak_bytes[name] = peak
+            # Snapshot only on a new peak; snapshots are expensive
+            statistics = tracemalloc.take_snapshot().statistics('lineno')[:10]
+            self.top_allocations[name] = [[str(stat.traceback), stat.size] for stat in statistics]
+    
+    def dump(self, profile_dir, label):
+        """Write one .prof file per stage plus a JSON memory report"""
+        os.makedirs(profile_dir, exist_ok=True)
+        for name, profile in self.profiles.items():
+            profile.dump_stats(os.path.join(profile_dir, f"{label}-{name}.prof"))
+        
+        memory_report = {
+            name: {
+                'seconds': self.seconds.get(name, 0.0),
+                'peak_bytes': self.peak_bytes.get(name, 0),
+                'top_allocations': self.top_allocations.get(name, [])
+            }
+            for name in self.profiles
+        }
+        with open(os.path.join(profile_dir, f"{label}-memory.json"), 'w') as f:
+            json.dump(memory_report, f, indent=2)
+
+# Profiler of the current process, set while a profiled batch runs
+_profiler = None
+
+def start_profiling():
+    """Start a fresh profiler for this process"""
+    global _profiler
+    _profiler = BatchProfiler()
+    return _profiler
+
+def stop_profiling():
+    """Stop profiling this process"""
+    global _profiler
+    if _profiler is not None and _profiler.started_tracemalloc:
+        tracemalloc.stop()
+    _profiler = None
+
+def profile_stage(name):
+    """Context manager timing a pipeline stage when profiling is on"""
+    if _profiler is None:
+        return nullcontext()
+    return _profiler.stage(name)
+
+def clear_profiles(profile_dir):
+    """Remove dumps of a previous run so summaries only cover this batch"""
+    if not os.path.isdir(profile_dir):
+        return
+    for file_name in os.listdir(profile_dir):
+        if file_name.endswith(('.prof', '-memory.json')):
+            os.remove(os.path.join(profile_dir, file_name))
+
+def summarize_profiles(profile_dir, top=15):
+    """Merge the dumps of all processes into a hotspot and memory summary"""
+    lines = []
+    memory_reports = []
+    for file_name in sorted(os.listdir(profile_dir)):
+        if file_name.endswith("-memory.json"):
+            with open(os.path.join(profile_dir, file_name)) as f:
+                memory_reports.append(json.load(f))
+    
+    lines.append("Stage totals (all processes; nested stages are not counted in their parent)")
+    for name in PROFILE_STAGES:
+        seconds = sum(report.get(name, {}).get('seconds', 0.0) for report in memory_reports)
+        peak = max((report.get(name, {}).get('peak_bytes', 0) for report in memory_reports), default=0)
+        if seconds:
+            lines.append(f"  {name:<8} {seconds:9.3f} s   peak traced memory {peak / (1024 * 1024):8.1f} MB")
+    
+    for name in PROFILE_STAGES:
+        stage_files = [
+            os.path.join(profile_dir, file_name) for file_name in sorted(os.listdir(profile_dir))
+            if file_name.endswith(f"-{name}.prof")
+        ]
+        if not stage_files:
+            continue
+        
+        lines.append("")
+        lines.append(f"Top hotspots in {name} (by own time)")
+        stats = pstats.Stats(*stage_files)
+        entries = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)[:top]
+        for (file_name, line_number, function_name), (_, calls, own_time, cumulative, _) in entries:
+            location = f"{os.path.basename(file_name)}:{line_number}({function_name})"
+            lines.append(f"  {own_time:9.3f} s own {cumulative:9.3f} s cum {calls:8d} calls  {location}")
+        
+        allocations = [
+            allocation for report in memory_reports
+            for allocation in report.get(name, {}).get('top_allocations', [])
+        ]
+        if allocations:
+            lines.append(f"Largest allocations in {name}")
+            for location, size in sorted(allocations, key=lambda item: item[1], reverse=True)[:5]:
+                lines.append(f"  {size / 1024:10.1f} KB  {location}")
+    
+    summary = "\n".join(lines)
+    with open(os.path.join(profile_dir, "summary.txt"), 'w') as f:
+        f.write(summary + "\n")
+    return summary
+
+class ImageProbe(namedtuple('ImageProbe', 'path format mode width height orientation has_alpha file_size')):
+    """Header facts about an image file, read without decoding pixels"""
+    __slots__ = ()
+    
+    @property
+    def pixels(self):
+        return self.width * self.height
+    
+    @property
+    def upright_size(self):
+        """Dimensions once the EXIF orientation is applied"""
+        return oriented_size((self.width, self.height), self.orientation)
+    
+    @property
+    def decode_cost(self):
+        """Estimated decode work, in JPEG-megapixel units"""
+        return self.pixels / 1_000_000 * DECODE_COST.get(self.format, 2.0)
+    
+    @property
+    def color_path(self):
+        """Conversion the pixels need: "16-bit", "CMYK" or None"""
+        return COLOR_PATHS.get(self.mode)
+
+# Probe results keyed by path, valid while mtime and size are unchanged
+_probe_cache = {}
+_probe_lock = threading.Lock()
+
+def probe_image(image_path, source=None):
+    """Read dimensions, mode, alpha and orientation from the file header.
+
+    Archive members are probed from their bytes (`source`, or read from
+    the archive) and are not cached.
+    """
+    if source is not None or is_archive_member(image_path):
+        data = source if source is not None else read_archive_member(image_path)
+        return read_probe(image_path, io.BytesIO(data), len(data))
+    
+    stat = os.stat(image_path)
+    key = absolute_image_path(image_path)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    with _probe_lock:
+        cached = _probe_cache.get(key)
+    if cached and cached[0] == stamp:
+        return cached[1]
+    
+    probe = read_probe(image_path, image_path, stat.st_size)
+    with _probe_lock:
+        _probe_cache[key] = (stamp, probe)
+    return probe
+
+def read_probe(image_path, fp, file_size):
+    # Image.open only parses the header; pixels are never loaded here
+    with Image.open(fp) as img:
+        return ImageProbe(
+            path=image_path,
+            format=img.format,
+            mode=img.mode,
+            width=img.width,
+            height=img.height,
+            orientation=get_exif_orientation(img),
+            has_alpha=has_alpha(img),
+            file_size=file_size
+        )
+
+def probe_images(image_paths):
+    """Probe many files in parallel; None marks files that cannot be read.
+
+    Archive members are left unprobed (None) rather than read out of order
+    here; their worker probes them from the bytes it receives.
+    """
+    def safe_probe(image_path):
+        if is_archive_member(image_path):
+            return None
+        try:
+            return probe_image(image_path)
+        except Exception:
+            return None
+    
+    with ThreadPoolExecutor(max_workers=PROBE_THREADS) as executor:
+        return list(executor.map(safe_probe, image_paths))
+
+def read_file_buffer(image_path):
+    """Read a whole file with one large sequential read"""
+    with open(image_path, 'rb', buffering=0) as f:
+        return f.read()
+
+def prefetch_files(image_paths, depth, read=read_file_buffer):
+    """Yield one future per file, in order, reading the next `depth` files ahead.
+
+    A None path yields None, for files that are not read ahead.
+    """
+    with ThreadPoolExecutor(max_workers=depth) as executor:
+        pending = deque()
+        for image_path in image_paths:
+            pending.append(executor.submit(read, image_path) if image_path is not None else None)
+            if len(pending) > depth:
+                yield pending.popleft()
+        while pending:
+            yield pending.popleft()
+
+def open_image_source(image_path, input_io="Direct", source=None):
+    """Open an image from prefetched bytes, a memory map or the file itself"""
+    if source is not None:
+        return Image.open(io.BytesIO(source))
+    if is_archive_member(image_path):
+        return Image.open(io.BytesIO(read_archive_member(image_path)))
+    if input_io == "Memory-Mapped":
+        with open(image_path, 'rb') as f:
+            # The map stays valid after the file is closed
+            return Image.open(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+    if input_io == "Read Ahead":
+        return Image.open(io.BytesIO(read_file_buffer(image_path)))
+    return Image.open(image_path)
+
+def is_archive(path):
+    return path.lower().endswith(ARCHIVE_EXTENSIONS) and os.path.isfile(path)
+
+def is_archive_member(path):
+    # A plain file may have "::" in its name; only an archive has members
+    archive_path, separator, _ = path.partition(ARCHIVE_SEPARATOR)
+    return bool(separator) and is_archive(archive_path)
+
+def split_archive_path(path):
+    """(archive path, member name) of an archive member, else (path, None)"""
+    if not is_archive_member(path):
+        return path, None
+    archive_path, _, member = path.partition(ARCHIVE_SEPARATOR)
+    return archive_path, member
+
+def absolute_image_path(path):
+    """Absolute path of an image; member names inside archives stay as they are"""
+    archive_path, member = split_archive_path(path)
+    archive_path = os.path.abspath(archive_path)
+    return archive_path if member is None else f"{archive_path}{ARCHIVE_SEPARATOR}{member}"
+
+def list_archive_images(archive_path):
+    """Member paths of the images in an archive, in archive order.
+
+    ZIP files are listed from their central directory and plain tar files
+    by seeking from header to header. Compressed tar files have no index,
+    so listing them decompresses the whole stream: names have to be known
+    before any output is planned, and ArchiveReader then decompresses it a
+    second time to read the images.
+    """
+    if zipfile.is_zipfile(archive_path):
+        with zipfile.ZipFile(archive_path) as archive:
+            names = [info.filename for info in archive.infolist() if not info.is_dir()]
+    else:
+        with tarfile.open(archive_path, 'r:*') as archive:
+            names = [member.name for member in archive.getmembers() if member.isfile()]
+    return [
+        f"{archive_path}{ARCHIVE_SEPARATOR}{name}" for name in names
+        if os.path.splitext(name)[1].lower() in IMAGE_EXTENSIONS
+        and not os.path.basename(name).startswith(".")
+    ]
+
+def expand_archives(paths):
+    """Replace archives in a list of paths by the images they contain"""
+    expanded = []
+    for path in paths:
+        if is_archive(path):
+            expanded.extend(list_archive_images(path))
+        else:
+            expanded.append(path)
+    return expanded
+
+# The archive last read by read_archive_member, kept open for the next call
+_open_archive = None
+_open_archive_lock = threading.Lock()
+
+def read_archive_member(path):
+    """Bytes of one archive member, outside of a batch.
+
+    The archive stays open for the next call, so previewing the images of
+    an archive one after another lists and decompresses it only once.
+    """
+    global _open_archive
+    archive_path, member = split_archive_path(path)
+    key = (archive_path, os.stat(archive_path).st_mtime_ns)
+    with _open_archive_lock:
+        if _open_archive is None or _open_archive[0] != key:
+            if _open_archive is not None:
+                _open_archive[1].close()
+                _open_archive = None
+            if zipfile.is_zipfile(archive_path):
+                archive = zipfile.ZipFile(archive_path)
+            else:
+                archive = tarfile.open(archive_path, 'r:*')
+            _open_archive = (key, archive)
+        archive = _open_archive[1]
+        if isinstance(archive, zipfile.ZipFile):
+            return archive.read(member)
+        return archive.extractfile(member).read()
+
+class ArchiveReader:
+    """Reads the members a batch needs from one archive in a single pass.
+
+    ZIP members are read directly. Tar archives (compressed ones above all)
+    can only be read efficiently front to back, so the archive is streamed
+    once and wanted members that come up before they are asked for are
+    held until then.
+    """
+    
+    def __init__(self, archive_path, wanted):
+        self.lock = threading.Lock()
+        self.wanted = set(wanted)
+        self.held = {}
+        if zipfile.is_zipfile(archive_path):
+            self.zip = zipfile.ZipFile(archive_path)
+            self.tar = None
+        else:
+            self.zip = None
+            self.tar = tarfile.open(archive_path, 'r|*')
+            self.members = iter(self.tar)
+    
+    def read(self, member):
+        with self.lock:
+            if self.zip is not None:
+                return self.zip.read(member)
+            if member in self.held:
+                return self.held.pop(member)
+            for info in self.members:
+                if not info.isfile() or info.name not in self.wanted:
+                    continue
+                data = self.tar.extractfile(info).read()
+                if info.name == member:
+                    return data
+                self.held[info.name] = data
+            raise KeyError(f"There is no item named {member!r} in the archive")
+    
+    def close(self):
+        (self.zip or self.tar).close()
+
+class ArchiveSources:
+    """Reads the files of a batch: archive members through one ArchiveReader
+    per archive, opened on first use, and plain files with read_file_buffer"""
+    
+    def __init__(self, image_paths):
+        self.lock = threading.Lock()
+        self.members = {}
+        self.readers = {}
+        for image_path in image_paths:
+            archive_path, member = split_archive_path(image_path)
+            if member is not None:
+                self.members.setdefault(archive_path, []).append(member)
+    
+    def read(self, image_path):
+        archive_path, member = split_archive_path(image_path)
+        if member is None:
+            return read_file_buffer(image_path)
+        with self.lock:
+            if archive_path not in self.readers:
+                self.readers[archive_path] = ArchiveReader(archive_path, self.members[archive_path])
+            reader = self.readers[archive_path]
+        return reader.read(member)
+    
+    def close(self):
+        for reader in self.readers.values():
+            reader.close()
+
+def has_alpha(img):
+    """Check whether an image carries transparency"""
+    if img.mode in ('RGBA', 'LA', 'PA'):
+        return True
+    return img.mode == 'P' and 'transparency' in img.info
+
+def get_exif_orientation(img):
+    """Read the EXIF orientation tag (1 means upright)"""
+    try:
+        return img.getexif().get(ORIENTATION_TAG, 1)
+    except Exception:
+        return 1
+
+def oriented_size(size, orientation):
+    """Size of an image after its orientation is applied"""
+    width, height = size
+    if orientation in (5, 6, 7, 8):
+        return height, width
+    return width, height
+
+def apply_orientation(img, orientation):
+    """Rotate or flip pixels upright; a transpose, never a resample"""
+    method = ORIENTATION_TRANSPOSE.get(orientation)
+    return img.transpose(method) if method is not None else img
+
+def estimate_output_size(original_size, width, height, quality_label, format_label, resize=None):
+    """Rough compressed size for the preview, from the settings alone"""
+    quality_factor = ESTIMATE_QUALITY_FACTORS.get(quality_label, 0.7)
+    format_factor = ESTIMATE_FORMAT_FACTORS.get(format_label, 0.6)
+    
+    # Fewer pixels after resizing means a proportionally smaller file
+    resize_factor = 1.0
+    if resize and width and height:
+        try:
+            new_width, new_height = compute_resize_dimensions(width, height, *resize)
+            resize_factor = new_width * new_height / (width * height)
+        except ZeroDivisionError:
+            resize_factor = 1.0
+    
+    return int(original_size * quality_factor * format_factor * resize_factor)
+
+def parse_resize_value(mode, text):
+    """Parse the resize entry for a mode ("1920x1080" for Fit Box).
+
+    Raises ValueError, with a message for the user, when the entry is
+    malformed or not positive.
+    """
+    entry = text.lower().replace(" ", "")
+    try:
+        if mode == "Fit Box":
+            box_width, box_height = entry.split("x")
+            value = float(box_width), float(box_height)
+        else:
+            value = float(entry)
+    except ValueError:
+        example = "1920x1080" if mode == "Fit Box" else "50"
+        raise ValueError(f'{mode} needs a value like {example}, not "{text.strip()}"') from None
+    check_resize_value(mode, value)
+    return value
+
+def check_resize_value(mode, value):
+    """Raise ValueError unless a resize value (or both box sides) is positive"""
+    parts = value if isinstance(value, tuple) else (value,)
+    if not all(math.isfinite(part) and part > 0 for part in parts):
+        raise ValueError(f"{mode} needs a value above 0")
+
+def compute_resize_dimensions(width, height, mode, value):
+    """Target size for a resize mode; only Percentage may upscale"""
+    if mode == "Percentage":
+        return max(1, int(width * value / 100.0)), max(1, int(height * value / 100.0))
+    
+    if mode == "Long Edge":
+        ratio = value / max(width, height)
+    elif mode == "Fit Box":
+        ratio = min(value[0] / width, value[1] / height)
+    elif mode == "Max Megapixels":
+        ratio = (value * 1_000_000 / (width * height)) ** 0.5
+    else:
+        return width, height
+    
+    if ratio >= 1:
+        return width, height
+    return max(1, round(width * ratio)), max(1, round(height * ratio))
+
+def prepare_draft(img, size, filter_name):
+    """Let the JPEG decoder downscale by 1/2, 1/4 or 1/8 for the Fast filter"""
+    if filter_name == "Fast" and img.format == 'JPEG':
+        img.draft(img.mode, size)
+    return img
+
+def resize_opencv(img, size, filter_name):
+    """Resize with OpenCV's SIMD kernels; None leaves the resize to Pillow"""
+    # RGBA would need premultiplying to match Pillow at transparent edges,
+    # and Pillow's nearest neighbour is already faster and samples differently
+    if img.mode not in ('L', 'RGB') or filter_name not in OPENCV_INTERPOLATION:
+        return None
+    if size[0] <= img.width and size[1] <= img.height:
+        interpolation = cv2.INTER_AREA
+    else:
+        interpolation = getattr(cv2, OPENCV_INTERPOLATION.get(filter_name, "INTER_LANCZOS4"))
+    return Image.fromarray(cv2.resize(np.asarray(img), tuple(size), interpolation=interpolation))
+
+# Engines that bring their own resize; the rest resize with Pillow
+RESIZE_BACKENDS = {"OpenCV": resize_opencv}
+
+def resize_image(img, size, filter_name="Lanczos", engine="Pillow"):
+    """Resize with the selected filter and engine; "Fast" reduces by integer
+    factors first. Falls back to Pillow when the engine is not installed."""
+    if img.size == tuple(size):
+        return img
+    
+    backend = RESIZE_BACKENDS.get(engine)
+    if backend is not None:
+        try:
+            resized = backend(img, size, filter_name)
+        except ImportError:
+            resized = None
+        if resized is not None:
+            return resized
+    
+    if filter_name == "Fast" and img.mode not in ('P', '1'):
+        factor = min(img.width // size[0], img.height // size[1])
+        if factor >= 2:
+            img = img.reduce(factor)
+            if img.size == tuple(size):
+                return img
+    return img.resize(size, RESAMPLING_FILTERS.get(filter_name, Image.Resampling.LANCZOS))
+
+def _box_mean(values, window):
+    """Mean over every window x window block, using an integral image"""
+    integral = np.pad(values, ((1, 0), (1, 0))).cumsum(axis=0).cumsum(axis=1)
+    return (
+        integral[window:, window:] - integral[:-window, window:]
+        - integral[window:, :-window] + integral[:-window, :-window]
+    ) / (window * window)
+
+def compute_ssim(img_a, img_b, window=7):
+    """Structural similarity of two same-size images on their luminance"""
+    # Palette images with transparency have to go through RGBA first
+    img_a, img_b = (img.convert('RGBA') if img.mode == 'P' else img for img in (img_a, img_b))
+    a = np.asarray(img_a.convert('L'), dtype=np.float64)
+    b = np.asarray(img_b.convert('L'), dtype=np.float64)
+    window = min(window, *a.shape)
+    c1 = (0.01 * 255) ** 2
+    c2 = (0.03 * 255) ** 2
+    
+    mean_a = _box_mean(a, window)
+    mean_b = _box_mean(b, window)
+    var_a = _box_mean(a * a, window) - mean_a ** 2
+    var_b = _box_mean(b * b, window) - mean_b ** 2
+    covariance = _box_mean(a * b, window) - mean_a * mean_b
+    
+    ssim_map = ((2 * mean_a * mean_b + c1) * (2 * covariance + c2)) / (
+        (mean_a ** 2 + mean_b ** 2 + c1) * (var_a + var_b + c2)
+    )
+    return float(ssim_map.mean())
+
+def extract_metadata(img, policy, reset_orientation=True):
+    """Collect the metadata the policy keeps, read before pixels change"""
+    if policy == "Strip All":
+        return {}
+    
+    metadata = {'icc_profile': img.info.get('icc_profile')}
+    if policy == "Keep All":
+        exif = img.getexif()
+        if reset_orientation and exif.get(ORIENTATION_TAG, 1) != 1:
+            # Pixels are stored upright, viewers must not rotate again
+            exif[ORIENTATION_TAG] = 1
+        metadata['exif'] = exif.tobytes() if exif else None
+        metadata['xmp'] = img.info.get('xmp')
+        metadata['comment'] = img.info.get('comment')
+    return metadata
+
+def metadata_save_kwargs(output_format, metadata):
+    """Turn collected metadata into save arguments for a format"""
+    metadata = metadata or {}
+    save_kwargs = {key: metadata[key] for key in METADATA_FIELDS.get(output_format, ()) if metadata.get(key)}
+    for key in METADATA_INFO_FALLBACK.get(output_format, ()):
+        save_kwargs.setdefault(key, None)
+    return save_kwargs
+
+def reduce_bit_depth(img):
+    """Scale 16-bit or 32-bit grayscale down to 8-bit 'L' in one vectorized pass.
+
+    Pillow's own convert('L') clips 16-bit values instead of scaling them,
+    which turns most images white. 'I' images don't say how many bits they
+    use, so the value range decides: up to 255 is already 8-bit, up to
+    65535 is 16-bit, anything larger is scaled by its highest bit.
+    """
+    values = np.asarray(img)
+    shift = 8
+    if img.mode == 'I':
+        values = values.clip(0, None)
+        peak = int(values.max()) if values.size else 0
+        shift = 0 if peak <= 255 else 8 if peak <= 65535 else peak.bit_length() - 8
+    return Image.fromarray((values >> shift).astype(np.uint8))
+
+# Built CMYK -> sRGB transforms, keyed by the source profile's digest
+_cms_transforms = {}
+
+def cmyk_to_rgb(img, icc_profile=None):
+    """Convert CMYK to RGB through the embedded ICC profile when there is one"""
+    if not icc_profile:
+        return img.convert('RGB')
+    key = hashlib.sha1(icc_profile).digest()
+    transform = _cms_transforms.get(key)
+    try:
+        if transform is None:
+            transform = ImageCms.buildTransform(
+                ImageCms.ImageCmsProfile(io.BytesIO(icc_profile)), ImageCms.createProfile('sRGB'), 'CMYK', 'RGB'
+            )
+            _cms_transforms[key] = transform
+        return ImageCms.applyTransform(img, transform)
+    except (ImageCms.PyCMSError, OSError, ValueError):
+        # Broken or non-CMYK profile: the naive conversion beats failing
+        return img.convert('RGB')
+
+def convert_color(img, color_path, icc_profile=None):
+    """Run the conversion stage chosen for the source mode"""
+    if color_path == "16-bit":
+        return reduce_bit_depth(img)
+    if color_path == "CMYK":
+        return cmyk_to_rgb(img, icc_profile)
+    return img
+
+def prepare_image_for_format(img, output_format):
+    """Flatten transparency onto white for formats without alpha support.
+
+    Grayscale with alpha stays grayscale rather than expanding to RGB.
+    """
+    if output_format == 'jpeg' and img.mode == 'LA':
+        background = Image.new('L', img.size, 255)
+        background.paste(img.getchannel('L'), mask=img.getchannel('A'))
+        return background
+    if output_format == 'jpeg' and img.mode in ('RGBA', 'P'):
+        background = Image.new('RGB', img.size, (255, 255, 255))
+        if img.mode != 'RGBA':
+            img = img.convert('RGBA')
+        background.paste(img, mask=img.split()[-1])
+        return background
+    return img
+
+def get_png_palette_colors(quality):
+    """Map a quality value to a PNG palette size (None for full color)"""
+    for level in sorted(PNG_PALETTE_COLORS):
+        if quality <= level:
+            return PNG_PALETTE_COLORS[level]
+    return None
+
+def quantize_for_png(img, colors, dither=True, fast=False):
+    """Reduce an image to a palette of at most `colors` entries"""
+    if colors is None or img.mode not in ('RGB', 'RGBA'):
+        return img
+    
+    # Median cut only handles RGB; fast octree also covers RGBA
+    if fast or img.mode == 'RGBA':
+        method = Image.Quantize.FASTOCTREE
+    else:
+        method = Image.Quantize.MEDIANCUT
+    paletted = img.quantize(colors=colors, method=method, dither=Image.Dither.NONE)
+    
+    # Pillow only dithers when mapping onto an existing palette
+    if dither and img.mode == 'RGB':
+        paletted = img.quantize(palette=paletted, dither=Image.Dither.FLOYDSTEINBERG)
+    return paletted
+
+def encode_png(img, quality, options):
+    """Encode a PNG with palette quantization and the configured zlib passes"""
+    png_mode = options.get('png_mode', "Standard")
+    colors = options.get('png_colors', get_png_palette_colors(quality))
+    if img.mode == 'RGBX':
+        # Handed over by the split pipeline; the PNG writer has no RGBX
+        img = img.convert('RGB')
+    img = quantize_for_png(img, colors, options.get('png_dither', True), fast=png_mode == "Fast")
+    
+    best = None
+    metadata_kwargs = metadata_save_kwargs('png', options.get('metadata'))
+    for save_kwargs in PNG_MODES.get(png_mode, PNG_MODES["Standard"]):
+        buffer = io.BytesIO()
+        img.save(buffer, format='PNG', **save_kwargs, **metadata_kwargs)
+        if best is None or buffer.tell() < len(best):
+            best = buffer.getvalue()
+    return best
+
+def reduce_precision(img, quality):
+    """Drop low color bits so lossless WebP compresses better (near-lossless)"""
+    dropped_bits = 1 if quality >= 80 else 2 if quality >= 60 else 3
+    mask = 0xFF << dropped_bits & 0xFF
+    color_lut = [value & mask for value in range(256)]
+    
+    if img.mode in ('RGBA', 'LA'):
+        # Keep alpha exact, only the color bands lose precision
+        return img.point(color_lut * (len(img.getbands()) - 1) + list(range(256)))
+    if img.mode in ('RGB', 'L'):
+        return img.point(color_lut * len(img.getbands()))
+    return img
+
+def encode_webp(img, quality, options):
+    """Encode a WebP using the effort preset, mode and alpha quality"""
+    preset = EFFORT_PRESETS.get(options.get('effort', "Balanced"), EFFORT_PRESETS["Balanced"])
+    webp_mode = options.get('webp_mode', "Lossy")
+    save_kwargs = {'quality': quality, 'method': preset['webp_method']}
+    if options.get('alpha_quality', "Lossless") == "Match Quality":
+        save_kwargs['alpha_quality'] = quality
+    
+    if webp_mode in ("Lossless", "Near-Lossless"):
+        # In lossless mode quality only controls encoder effort
+        if webp_mode == "Near-Lossless":
+            img = reduce_precision(img, quality)
+        save_kwargs.update(lossless=True, quality=preset['webp_lossless_quality'])
+    
+    save_kwargs.update(metadata_save_kwargs('webp', options.get('metadata')))
+    buffer = io.BytesIO()
+    img.save(buffer, format='WEBP', **save_kwargs)
+    return buffer.getvalue()
+
+def encode_avif(img, quality, options):
+    """Encode an AVIF with the speed from the effort preset"""
+    if importlib.util.find_spec('pillow_avif') is not None:
+        import pillow_avif  # noqa: F401 - registers the AVIF plugin
+    preset = EFFORT_PRESETS.get(options.get('effort', "Balanced"), EFFORT_PRESETS["Balanced"])
+    buffer = io.BytesIO()
+    img.save(
+        buffer, format='AVIF', quality=quality, speed=preset['avif_speed'],
+        **metadata_save_kwargs('avif', options.get('metadata'))
+    )
+    return buffer.getvalue()
+
+def encode_image(img, output_format, quality, options=None):
+    """Encode an image in memory and return the encoded bytes"""
+    options = options or {}
+    if output_format == 'png':
+        return encode_png(img, quality, options)
+    if output_format == 'webp':
+        return encode_webp(img, quality, options)
+    if output_format == 'avif':
+        return encode_avif(img, quality, options)
+    
+    buffer = io.BytesIO()
+    save_kwargs = {'optimize': True}
+    if output_format in ['jpeg', 'webp']:
+        save_kwargs['quality'] = quality
+    save_kwargs.update(metadata_save_kwargs(output_format, options.get('metadata')))
+
+    with profile_stage('flatten'):
+        img = prepare_image_for_format(img, output_format)
+    img.save(buffer, format=output_format.upper(), **save_kwargs)
+    return buffer.getvalue()
+
+def measure_quality(reference, output_format, quality, options):
+    """SSIM of an in-memory encode against the reference image"""
+    data = encode_image(reference, output_format, quality, options)
+    with Image.open(io.BytesIO(data)) as decoded:
+        return compute_ssim(reference, decoded)
+
+def find_auto_quality(img, output_format, target, options=None):
+    """Lowest quality whose encode reaches the SSIM target.
+
+    Measured on a downscaled copy. SSIM rises with quality, so a binary
+    search settles in about four encodes. Returns (quality, ssim).
+    """
+    options = dict(options or {}, metadata=None)
+    reference = img.copy()
+    reference.thumbnail((AUTO_QUALITY_PREVIEW_EDGE, AUTO_QUALITY_PREVIEW_EDGE), Image.Resampling.BILINEAR)
+    # Compare what the format can store, e.g. JPEG sees alpha flattened
+    reference = prepare_image_for_format(reference, output_format)
+    
+    candidates = sorted(PNG_PALETTE_COLORS) if output_format == 'png' else AUTO_QUALITY_RANGE
+    scores = {}
+    best = None
+    low, high = 0, len(candidates) - 1
+    while low <= high:
+        middle = (low + high) // 2
+        scores[middle] = measure_quality(reference, output_format, candidates[middle], options)
+        if scores[middle] >= target:
+            best = middle
+            high = middle - 1
+        else:
+            low = middle + 1
+    
+    if best is None:
+        # Even the top quality misses the target
+        best = len(candidates) - 1
+    if best not in scores:
+        scores[best] = measure_quality(reference, output_format, candidates[best], options)
+    return candidates[best], scores[best]
+
+def cached_auto_quality(image_path, settings, search):
+    """Auto quality from the on-disk cache, running `search` on a miss.
+
+    Returns (quality, ssim, note); note says why the result was not cached.
+    """
+    # Archive members are keyed on the archive file itself
+    stat = os.stat(split_archive_path(image_path)[0])
+    key = json.dumps([
+        absolute_image_path(image_path), stat.st_mtime_ns, stat.st_size,
+        settings['output_format'], settings['ssim_target'], settings['encoder_options'],
+        settings['resize'], settings['resize_filter'], settings['engine'], settings['auto_rotate']
+    ], sort_keys=True)
+    cache_folder = os.path.join(get_cache_dir(), AUTO_QUALITY_CACHE_FOLDER)
+    cache_path = os.path.join(cache_folder, hashlib.sha1(key.encode()).hexdigest() + ".json")
+    try:
+        with open(cache_path) as f:
+            entry = json.load(f)
+        return entry['quality'], entry['ssim'], None
+    except (OSError, ValueError, KeyError):
+        pass
+    
+    quality, ssim = search()
+    try:
+        # One file per entry, replaced atomically, so workers never clash
+        os.makedirs(cache_folder, exist_ok=True)
+        temp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump({'quality': quality, 'ssim': ssim}, f)
+        os.replace(temp_path, cache_path)
+    except OSError as e:
+        return quality, ssim, f"Could not cache auto quality: {e}"
+    return quality, ssim, None
+
+def encode_within_size(img, source_size, output_format, quality, policy, options=None):
+    """Encode an image and apply the skip-if-larger policy.
+
+    Returns (data, output_format, quality, outcome). data is None when the
+    original file is smaller than every candidate and should be kept.
+    """
+    data = encode_image(img, output_format, quality, options)
+    if policy == "Save Anyway" or len(data) < source_size:
+        return data, output_format, quality, "compressed"
+
+    if policy == "Try Other Formats":
+        # Keep the smallest alternate format that beats the source
+        best = None
+        for fmt in (f.lower() for f in get_output_formats()):
+            if fmt == output_format or (fmt == 'jpeg' and has_alpha(img)):
+                continue
+            candidate = encode_image(img, fmt, quality, options)
+            if len(candidate) < source_size and (best is None or len(candidate) < len(best[0])):
+                best = (candidate, fmt)
+        if best:
+            return best[0], best[1], quality, "format_fallback"
+
+    elif policy == "Lower Quality":
+        # Keep the highest lower quality that beats the source
+        for lower_quality in (q for q in QUALITY_STEPS if q < quality):
+            candidate = encode_image(img, output_format, lower_quality, options)
+            if len(candidate) < source_size:
+                return candidate, output_format, lower_quality, "quality_reduced"
+
+    return None, output_format, quality, "kept_original"
+
+def start_worker_profiling(settings):
+    """Profile this job when it runs in a worker of a profiled batch"""
+    # A forked worker inherits the parent's profiler; it needs its own
+    in_worker = settings['profile'] and os.getpid() != settings['profile_owner']
+    if in_worker and (_profiler is None or _profiler.pid != os.getpid()):
+        start_profiling()
+    return in_worker
+
+def dump_worker_profile(settings):
+    # Workers have no shutdown hook, so stats are rewritten after each job
+    _profiler.dump(settings['profile_dir'], f"worker-{os.getpid()}")
+
+def compress_image_file(image_path, output_stem, settings, probe=None, source=None):
+    """Compress one image; runs in a worker process.
+
+    `output_stem` is the output path without extension, which is only known
+    once the skip-if-larger policy has picked the format. `source` holds the
+    file bytes when they were already read ahead.
+    """
+    start = time.perf_counter()
+    in_worker = start_worker_profiling(settings)
+    probe = probe or probe_image(image_path, source)
+    with open_image_source(image_path, settings['input_io'], source) as img:
+        frames_note = frame_limit_note(img, settings, probe)
+        if settings['frames'] == "All Frames" and is_multi_frame(img) and not frames_note:
+            result = compress_frames(img, image_path, output_stem, settings, probe)
+        else:
+            result = compress_frame(img, image_path, output_stem, settings, probe)
+            add_note(result, frames_note)
+    result['seconds'] = time.perf_counter() - start
+    
+    if in_worker:
+        dump_worker_profile(settings)
+    return result
+
+def compress_frame(img, image_path, output_stem, settings, probe):
+    """Decode, resize and encode a single-frame image (or the first frame)"""
+    img, metadata = decode_frame(img, settings, probe)
+    return encode_and_write(img, image_path, output_stem, settings, probe.file_size, metadata)
+
+def decode_frame(img, settings, probe):
+    """Decode, resize and orient an opened image; returns (image, metadata)"""
+    with profile_stage('decode'):
+        # Read orientation and metadata before the pixels change
+        auto_rotate = settings['auto_rotate']
+        orientation = probe.orientation if auto_rotate else 1
+        metadata = extract_metadata(img, settings['metadata_policy'], reset_orientation=auto_rotate)
+        
+        # Resize target in upright orientation, known before decoding
+        target_size = None
+        resize_filter = settings['resize_filter']
+        if settings['resize']:
+            original_width, original_height = oriented_size(img.size, orientation)
+            new_width, new_height = compute_resize_dimensions(original_width, original_height, *settings['resize'])
+            if (new_width, new_height) != (original_width, original_height):
+                target_size = oriented_size((new_width, new_height), orientation)
+                prepare_draft(img, target_size, resize_filter)
+        img.load()
+    
+    # 16-bit drops to 8-bit before resampling; CMYK waits until there are
+    # fewer pixels to run through the color transform
+    color_path = probe.color_path
+    icc_profile = img.info.get('icc_profile')
+    if color_path == "16-bit":
+        with profile_stage('color'):
+            img = reduce_bit_depth(img)
+    
+    with profile_stage('resize'):
+        if target_size:
+            img = resize_image(img, target_size, resize_filter, settings['engine'])
+        
+        # Rotate after resizing so the transpose touches fewer pixels
+        img = apply_orientation(img, orientation)
+    
+    if color_path == "CMYK":
+        with profile_stage('color'):
+            img = cmyk_to_rgb(img, icc_profile)
+        if icc_profile:
+            # The pixels are sRGB now; the CMYK profile no longer applies
+            metadata = dict(metadata, icc_profile=None)
+    return img, metadata
+
+def encode_and_write(img, image_path, output_stem, settings, source_size, metadata):
+    """Encode a decoded image, apply the size policy and write the output"""
+    # Auto quality searches once per file and settings, then hits the cache
+    quality = settings['quality']
+    ssim = note = None
+    if quality is None:
+        with profile_stage('auto_quality'):
+            quality, ssim, note = cached_auto_quality(image_path, settings, lambda: find_auto_quality(
+                img, settings['output_format'], settings['ssim_target'], settings['encoder_options']
+            ))
+    
+    # Encode in memory and compare against the source before writing
+    with profile_stage('encode'):
+        data, chosen_format, chosen_quality, outcome = encode_within_size(
+            img, source_size, settings['output_format'], quality, settings['larger_policy'],
+            dict(settings['encoder_options'], metadata=metadata)
+        )
+    return write_output(data, output_stem, settings, {
+        'path': image_path,
+        'outcome': outcome,
+        'format': chosen_format,
+        'quality': chosen_quality,
+        'input_bytes': source_size,
+        'ssim': ssim,
+        'note': note
+    })
+
+def write_output(data, output_stem, settings, result):
+    """Write encoded bytes (None keeps the original) and complete the result dict"""
+    result['output_path'] = None
+    result['output_bytes'] = len(data) if data is not None else result['input_bytes']
+    if data is None:
+        return result
+    
+    extension = 'jpg' if result['format'] == 'jpeg' else result['format']
+    result['output_path'] = f"{output_stem}.{extension}"
+    if settings['archive_output']:
+        # The main process appends it to the output archive
+        result['data'] = data
+    else:
+        with profile_stage('write'):
+            with open(result['output_path'], 'wb') as f:
+                f.write(data)
+    return result
+
+def is_multi_frame(img):
+    """Whether an opened image is an animation or a multi-page file"""
+    return img.format in MULTI_FRAME_FORMATS and getattr(img, 'n_frames', 1) > 1
+
+def multi_frame_format(output_format, source_format):
+    """Output format that keeps every frame.
+
+    Multi-page files stay TIFF: pages are not animation frames. Animations
+    become WebP, PNG (APNG) or AVIF, or stay GIF when the output is JPEG,
+    which holds a single frame.
+    """
+    if source_format == 'TIFF':
+        return 'tiff'
+    return output_format if output_format in ('webp', 'png', 'avif') else 'gif'
+
+def frame_limit_note(img, settings, probe):
+    """Why an animation is compressed as its first frame only, or None.
+
+    Pillow's writers hold every output frame until the file is written, so
+    animations whose output frames exceed FRAME_MEMORY_LIMIT keep only
+    their first frame. GIF frames without alpha are held as palette images
+    (one byte a pixel, plus the writer's own copy); others take four.
+    """
+    if settings['frames'] != "All Frames" or not is_multi_frame(img):
+        return None
+    output_format = multi_frame_format(settings['output_format'], img.format)
+    pixels = predict_decoded_bytes(probe, settings) // 4
+    frame_bytes = pixels * (2 if output_format == 'gif' and not probe.has_alpha else 4)
+    if frame_bytes * img.n_frames <= FRAME_MEMORY_LIMIT:
+        return None
+    return (
+        f"{img.n_frames} frames need {frame_bytes * img.n_frames // 2**20} MB after resizing, over the "
+        f"{FRAME_MEMORY_LIMIT // 2**20} MB frame limit; saved the first frame only"
+    )
+
+def add_note(result, note):
+    """Attach a note for the report to a result dict"""
+    if note:
+        result['note'] = f"{result['note']}; {note}" if result.get('note') else note
+    return result
+
+def iter_frame_windows(img, limit=FRAME_MEMORY_LIMIT):
+    """Decode frames lazily, yielding (frames, durations) in groups that
+    hold at most `limit` bytes of decoded pixels"""
+    frames, durations, held = [], [], 0
+    for frame in ImageSequence.Iterator(img):
+        frame_bytes = frame.width * frame.height * 4
+        if frames and held + frame_bytes > limit:
+            yield frames, durations
+            frames, durations, held = [], [], 0
+        frames.append(frame.copy())
+        durations.append(frame.info.get('duration', 100))
+        held += frame_bytes
+    if frames:
+        yield frames, durations
+
+def prepare_frame(frame, settings, orientation, output_format, quality):
+    """Convert, resize and orient one frame; GIF frames also get their palette"""
+    color_path = COLOR_PATHS.get(frame.mode)
+    if color_path:
+        frame = convert_color(frame, color_path, frame.info.get('icc_profile'))
+    elif frame.mode not in ('RGB', 'RGBA', 'L'):
+        frame = frame.convert('RGBA' if has_alpha(frame) else 'RGB')
+    if settings['resize']:
+        width, height = oriented_size(frame.size, orientation)
+        target_size = oriented_size(compute_resize_dimensions(width, height, *settings['resize']), orientation)
+        frame = resize_image(frame, target_size, settings['resize_filter'], settings['engine'])
+    frame = apply_orientation(frame, orientation)
+    if output_format == 'gif' and frame.mode == 'RGB':
+        # The GIF writer would quantize anyway, but one frame at a time
+        colors = get_png_palette_colors(quality) or 256
+        frame = quantize_for_png(frame, colors, settings['encoder_options']['png_dither'])
+    return frame
+
+def encode_frames(frames, durations, output_format, quality, options, loop=0):
+    """Encode frames as one animated or multi-page file"""
+    preset = EFFORT_PRESETS.get(options.get('effort', "Balanced"), EFFORT_PRESETS["Balanced"])
+    save_kwargs = {'save_all': True, 'append_images': frames[1:]}
+    if output_format != 'tiff':
+        save_kwargs.update(duration=durations, loop=loop)
+    
+    if output_format == 'webp':
+        save_kwargs.update(quality=quality, method=preset['webp_method'])
+        if options.get('webp_mode', "Lossy") == "Lossless":
+            save_kwargs.update(lossless=True, quality=preset['webp_lossless_quality'])
+    elif output_format == 'avif':
+        save_kwargs.update(quality=quality, speed=preset['avif_speed'])
+    elif output_format == 'png':
+        save_kwargs.update(PNG_MODES.get(options.get('png_mode', "Standard"), PNG_MODES["Standard"])[0])
+    elif output_format == 'gif':
+        save_kwargs.update(optimize=True, disposal=2)
+    elif output_format == 'tiff':
+        # JPEG pages when lossy is acceptable and every page can take it
+        lossy = not options.get('lossless') and quality < 95
+        if lossy and all(frame.mode in ('RGB', 'L') for frame in frames):
+            save_kwargs.update(compression='jpeg', quality=quality)
+        else:
+            save_kwargs.update(compression='tiff_adobe_deflate')
+    save_kwargs.update(metadata_save_kwargs(output_format, options.get('metadata')))
+    
+    buffer = io.BytesIO()
+    frames[0].save(buffer, format=output_format.upper(), **save_kwargs)
+    return buffer.getvalue()
+
+def encode_frames_within_size(frames, durations, source_size, output_format, quality, policy, options, loop=0):
+    """encode_frames with the skip-if-larger policy, like encode_within_size.
+
+    Other formats are limited to those that keep every frame: animations
+    try the other animated formats, multi-page TIFFs have none. Lowering
+    the quality only helps the formats that use it (WebP, AVIF, TIFF).
+    """
+    data = encode_frames(frames, durations, output_format, quality, options, loop)
+    if policy == "Save Anyway" or len(data) < source_size:
+        return data, output_format, quality, "compressed"
+    
+    if policy == "Try Other Formats" and output_format != 'tiff':
+        best = None
+        for fmt in ('webp', 'png', 'gif', 'avif'):
+            if fmt == output_format or (fmt == 'avif' and not avif_available()):
+                continue
+            candidate = encode_frames(frames, durations, fmt, quality, options, loop)
+            if len(candidate) < source_size and (best is None or len(candidate) < len(best[0])):
+                best = (candidate, fmt)
+        if best:
+            return best[0], best[1], quality, "format_fallback"
+    
+    elif policy == "Lower Quality" and output_format in ('webp', 'avif', 'tiff'):
+        for lower_quality in (q for q in QUALITY_STEPS if q < quality):
+            candidate = encode_frames(frames, durations, output_format, lower_quality, options, loop)
+            if len(candidate) < source_size:
+                return candidate, output_format, lower_quality, "quality_reduced"
+    
+    return None, output_format, quality, "kept_original"
+
+def compress_frames(img, image_path, output_stem, settings, probe):
+    """Compress every frame of an animation or multi-page file.
+
+    Frames are decoded lazily, at most FRAME_MEMORY_LIMIT bytes at a time,
+    and each group is resized on FRAME_THREADS threads (Pillow releases the
+    GIL while resampling). The frames are then encoded together, in one
+    thread: callers check frame_limit_note first, since Pillow's writers
+    hold every output frame until the file is written.
+    """
+    output_format = multi_frame_format(settings['output_format'], img.format)
+    auto_rotate = settings['auto_rotate']
+    orientation = probe.orientation if auto_rotate else 1
+    metadata = extract_metadata(img, settings['metadata_policy'], reset_orientation=auto_rotate)
+    loop = img.info.get('loop', 0)
+    if probe.color_path == "CMYK" and img.info.get('icc_profile'):
+        # Pages are converted to sRGB with their profile
+        metadata = dict(metadata, icc_profile=None)
+    
+    quality = settings['quality']
+    ssim = note = None
+    if quality is None:
+        # Searched on the first frame, in the closest single-frame format
+        search_format = output_format if output_format in ('webp', 'png', 'avif') else 'jpeg'
+        with profile_stage('auto_quality'):
+            if probe.color_path:
+                first_frame = convert_color(img, probe.color_path, img.info.get('icc_profile'))
+            else:
+                first_frame = img.convert('RGBA' if has_alpha(img) else 'RGB')
+            quality, ssim, note = cached_auto_quality(image_path, settings, lambda: find_auto_quality(
+                first_frame, search_format, settings['ssim_target'], settings['encoder_options']
+            ))
+    
+    frames, durations = [], []
+    with ThreadPoolExecutor(max_workers=FRAME_THREADS) as executor:
+        for window, window_durations in iter_frame_windows(img):
+            with profile_stage('resize'):
+                frames.extend(executor.map(
+                    lambda frame: prepare_frame(frame, settings, orientation, output_format, quality), window
+                ))
+            durations.extend(window_durations)
+            # Release the decoded frames before the next group is read
+            window.clear()
+    
+    # PNG output asks for lossless pages when they end up in a TIFF
+    options = dict(settings['encoder_options'], metadata=metadata, lossless=settings['output_format'] == 'png')
+    with profile_stage('encode'):
+        data, output_format, quality, outcome = encode_frames_within_size(
+            frames, durations, probe.file_size, output_format, quality, settings['larger_policy'], options, loop
+        )
+    return write_output(data, output_stem, settings, {
+        'path': image_path,
+        'outcome': outcome,
+        'format': output_format,
+        'quality': quality,
+        'input_bytes': probe.file_size,
+        'ssim': ssim,
+        'note': note
+    })
+
+def plan_chunks(probes, settings, workers=1):
+    """Group small images into chunked jobs.
+
+    Returns (chunks, singles): index lists for compress_image_chunk, and
+    the indices left for one job per image.
+    """
+    small = [
+        index for index, probe in enumerate(probes)
+        if settings['chunk_small_images'] and probe is not None and probe.pixels <= SMALL_IMAGE_PIXELS
+    ]
+    # Still give every worker a share of a short batch
+    size = max(1, min(SMALL_IMAGE_CHUNK, -(-len(small) // workers)))
+    if workers == 1 or len(small) <= workers:
+        # Inline batches have no per-job round trip to save
+        return [], list(range(len(probes)))
+    chunks = [small[start:start + size] for start in range(0, len(small), size)]
+    
+    chunked = {index for chunk in chunks for index in chunk}
+    return chunks, [index for index in range(len(probes)) if index not in chunked]
+
+def compress_image_chunk(image_paths, output_stems, settings, probes):
+    """Compress several small images in one worker job.
+
+    Returns a result or the exception for each image.
+    """
+    outcomes = []
+    for job in zip(image_paths, output_stems, [settings] * len(image_paths), probes):
+        try:
+            outcomes.append(compress_image_file(*job))
+        except Exception as e:
+            outcomes.append(e)
+    return outcomes
+
+def default_settings(**overrides):
+    """Compression settings matching the GUI defaults, for headless runs"""
+    settings = {
+        'output_format': "jpeg",
+        'quality': QUALITY_PRESETS["High (80%)"],
+        'ssim_target': AUTO_QUALITY_TARGETS["Balanced (0.95)"],
+        'larger_policy': "Keep Original",
+        'encoder_options': {
+            'png_mode': "Standard",
+            'png_dither': True,
+            'effort': "Balanced",
+            'webp_mode': "Lossy",
+            'alpha_quality': "Lossless"
+        },
+        'metadata_policy': "Keep ICC Only",
+        'auto_rotate': True,
+        'resize': None,
+        'resize_filter': "Lanczos",
+        'engine': "Pillow",
+        'quality_suffix': "-High",
+        'resize_suffix': "",
+        'workers': "Auto",
+        'input_io': "Read Ahead",
+        'read_ahead': "4",
+        'chunk_small_images': True,
+        'pipeline': "Combined",
+        'frames': "All Frames",
+        'name_template': DEFAULT_NAME_TEMPLATE,
+        'mirror_tree': False,
+        'on_collision': "Number Duplicates",
+        'archive_output': None,
+        'archive_append': False,
+        'profile': False
+    }
+    settings.update(overrides)
+    return settings
+
+def safe_path_parts(path):
+    """Folder and file names of a relative path, dropping "..", "." and
+    empty parts so names from archives or templates can't escape the
+    output folder"""
+    return [part for part in path.replace("\\", "/").split("/") if part not in ("", ".", "..")]
+
+def build_output_stem(image_path, output_dir, settings, mirror_root=None):
+    """Output path without extension, from the name template.
+
+    Images from an archive keep their folder inside the archive. With a
+    mirror root, every image also keeps its folder below that root.
+    """
+    archive_path, member = split_archive_path(image_path)
+    folders = []
+    if mirror_root is not None:
+        folders = safe_path_parts(os.path.relpath(os.path.dirname(os.path.abspath(archive_path)), mirror_root))
+    if member is not None:
+        member_parts = safe_path_parts(member)
+        source_name = member_parts.pop() if member_parts else os.path.basename(archive_path)
+        folders += member_parts
+    else:
+        source_name = os.path.basename(image_path)
+    
+    tokens = {
+        'name': os.path.splitext(source_name)[0],
+        'dir': (member_parts if member is not None and member_parts else [
+            os.path.basename(os.path.dirname(os.path.abspath(archive_path)))
+        ])[-1],
+        'q': settings['quality_suffix'],
+        'scale': settings['resize_suffix'],
+        'hash': hashlib.sha1(absolute_image_path(image_path).encode()).hexdigest()[:8]
+    }
+    try:
+        name_parts = safe_path_parts(settings['name_template'].format(**tokens))
+    except KeyError as e:
+        raise ValueError(f"Invalid name template {settings['name_template']!r}: unknown token {{{e.args[0]}}}") from None
+    except (IndexError, ValueError) as e:
+        raise ValueError(f"Invalid name template {settings['name_template']!r}: {e}") from None
+    if not name_parts:
+        raise ValueError(f"Name template {settings['name_template']!r} gives an empty file name")
+    return os.path.join(output_dir, *folders, *name_parts)
+
+def plan_output_stems(image_paths, output_dir, settings):
+    """Output stems for a batch in input order, fixed before any work.
+
+    Returns (stems, collisions). collisions lists (stem, inputs) for every
+    name wanted by more than one input or whose output would overwrite an
+    input. With the "Number Duplicates" policy all but the first of those
+    inputs get "-2", "-3"... appended; with "Stop" nothing is renamed.
+    """
+    mirror_root = None
+    if settings['mirror_tree'] and image_paths:
+        mirror_root = os.path.commonpath([
+            os.path.dirname(os.path.abspath(split_archive_path(image_path)[0])) for image_path in image_paths
+        ])
+    stems = [build_output_stem(image_path, output_dir, settings, mirror_root) for image_path in image_paths]
+    
+    def key(path):
+        return os.path.normcase(os.path.abspath(path))
+    # Stems, not file names: the size policy and animations can change the
+    # output format, so any extension may end up next to the stem
+    sources = {key(os.path.splitext(image_path)[0]) for image_path in image_paths if not is_archive_member(image_path)}
+    groups = {}
+    for index, stem in enumerate(stems):
+        groups.setdefault(key(stem), []).append(index)
+    
+    collisions = []
+    taken = set(groups) | sources
+    for indices in groups.values():
+        overwrites_source = key(stems[indices[0]]) in sources
+        if len(indices) == 1 and not overwrites_source:
+            continue
+        collisions.append((stems[indices[0]], [image_paths[index] for index in indices]))
+        if settings['on_collision'] != "Number Duplicates":
+            continue
+        # Numbered in input order, skipping names another input already has
+        number = 2
+        for index in indices if overwrites_source else indices[1:]:
+            while key(f"{stems[index]}-{number}") in taken:
+                number += 1
+            stems[index] = f"{stems[index]}-{number}"
+            taken.add(key(stems[index]))
+    return stems, collisions
+
+def describe_collisions(collisions, limit=10):
+    """Readable list of output name collisions"""
+    lines = [f"Output names wanted by more than one input, or that would overwrite an input ({len(collisions)}):"]
+    for stem, image_paths in collisions[:limit]:
+        lines.append(f"  {stem}: {', '.join(image_paths)}")
+    if len(collisions) > limit:
+        lines.append(f"  ... and {len(collisions) - limit} more")
+    return "\n".join(lines)
+
+def plan_batch(image_paths, output_dir, settings):
+    """Dry run of a batch: output names, target sizes and predicted cost.
+
+    Reads only file headers and writes nothing. Returns (rows, collisions)
+    with one row per input, in input order.
+    """
+    stems, collisions = plan_output_stems(image_paths, output_dir, settings)
+    probes = probe_images(image_paths)
+    extension = 'jpg' if settings['output_format'] == 'jpeg' else settings['output_format']
+    rows = []
+    for image_path, stem, probe in zip(image_paths, stems, probes):
+        size = None
+        if probe is not None:
+            size = probe.upright_size
+            if settings['resize']:
+                size = compute_resize_dimensions(*size, *settings['resize'])
+        rows.append({
+            'path': image_path,
+            'output_path': f"{stem}.{extension}",
+            'size': size,
+            'cost': estimate_compression_cost(probe, settings)
+        })
+    return rows, collisions
+
+def estimate_compression_cost(probe, settings):
+    """Predict the work for one image from its header: decode plus encode"""
+    if probe is None:
+        # Unreadable files fail fast in the worker
+        return 0.0
+    
+    width, height = probe.upright_size
+    if settings['resize']:
+        width, height = compute_resize_dimensions(width, height, *settings['resize'])
+    encode_cost = width * height / 1_000_000 * ENCODE_COST.get(settings['output_format'], 1.0)
+    return probe.decode_cost + encode_cost
+
+def schedule_largest_first(probes, settings):
+    """Order jobs by predicted cost, largest first (LPT scheduling).
+
+    Handing the most expensive images out first keeps a huge panorama from
+    starting last while the other workers sit idle. Ties keep the input
+    order so runs are reproducible.
+    """
+    costs = [estimate_compression_cost(probe, settings) for probe in probes]
+    return sorted(range(len(probes)), key=lambda index: (-costs[index], index))
+
+def resolve_worker_count(workers, job_count):
+    """Number of worker processes to use for a batch"""
+    if workers == "Auto":
+        workers = os.cpu_count() or 1
+    return max(1, min(int(workers), job_count))
+
+class BatchReport:
+    """Per-file results of a batch, in input order.
+
+    Numbers live in typed arrays (a few bytes per file) instead of a dict
+    per file, so reports for batches of many thousands of images stay
+    small. Rows are built on demand for display and export.
+    """
+    
+    def __init__(self, image_paths):
+        count = len(image_paths)
+        self.paths = list(image_paths)
+        self.status = array('b', [-1]) * count  # index into REPORT_STATUSES, -1 = pending
+        self.input_bytes = array('q', [0]) * count
+        self.output_bytes = array('q', [0]) * count
+        self.quality = array('h', [0]) * count
+        self.seconds = array('d', [0.0]) * count
+        self.ssim = array('d', [math.nan]) * count
+        self.output_paths = [None] * count
+        self.formats = [None] * count
+        self.errors = {}  # index -> (exception type, message)
+        self.notes = {}  # index -> what happened besides the outcome, e.g. a fallback
+        # Elapsed time of the batch; the per-file seconds add up every worker
+        self.wall_seconds = None
+        self.profile_summary = None  # hotspot summary of a profiled batch
+    
+    def __len__(self):
+        return len(self.paths)
+    
+    def record(self, index, result):
+        """Store the result dict returned by compress_image_file"""
+        self.status[index] = REPORT_STATUSES.index(result['outcome'])
+        self.input_bytes[index] = result['input_bytes']
+        self.output_bytes[index] = result['output_bytes']
+        self.quality[index] = result['quality']
+        self.seconds[index] = result['seconds']
+        if result['ssim'] is not None:
+            self.ssim[index] = result['ssim']
+        self.output_paths[index] = result['output_path']
+        self.formats[index] = result['format']
+        if result.get('note'):
+            self.notes[index] = result['note']
+    
+    def record_failure(self, index, error):
+        self.status[index] = REPORT_STATUSES.index("failed")
+        self.errors[index] = (type(error).__name__, str(error))
+    
+    @classmethod
+    def from_rows(cls, rows):
+        """Rebuild a report from saved rows (see row())"""
+        report = cls([row['path'] for row in rows])
+        for index, row in enumerate(rows):
+            if row['status'] == "failed":
+                report.status[index] = REPORT_STATUSES.index("failed")
+                report.errors[index] = (row['error_type'], row['error'])
+            elif row['status'] in REPORT_STATUSES:
+                report.record(index, dict(row, outcome=row['status'], quality=row['quality'] or 0))
+        return report
+    
+    def update(self, other):
+        """Take over the rows of a report on a subset of these files"""
+        if other.wall_seconds is not None:
+            self.wall_seconds = (self.wall_seconds or 0) + other.wall_seconds
+        positions = {path: index for index, path in enumerate(self.paths)}
+        for index, path in enumerate(other.paths):
+            target = positions[path]
+            for column in ('status', 'input_bytes', 'output_bytes', 'quality', 'seconds', 'ssim'):
+                getattr(self, column)[target] = getattr(other, column)[index]
+            self.output_paths[target] = other.output_paths[index]
+            self.formats[target] = other.formats[index]
+            self.errors.pop(target, None)
+            if index in other.errors:
+                self.errors[target] = other.errors[index]
+            self.notes.pop(target, None)
+            if index in other.notes:
+                self.notes[target] = other.notes[index]
+    
+    def row(self, index):
+        """One file as a dict with REPORT_COLUMNS keys"""
+        status = self.status[index]
+        input_bytes = self.input_bytes[index]
+        error_type, error = self.errors.get(index, (None, None))
+        return {
+            'path': self.paths[index],
+            'status': REPORT_STATUSES[status] if status >= 0 else "pending",
+            'output_path': self.output_paths[index],
+            'format': self.formats[index],
+            'quality': self.quality[index] or None,
+            'ssim': None if math.isnan(self.ssim[index]) else round(self.ssim[index], 4),
+            'input_bytes': input_bytes,
+            'output_bytes': self.output_bytes[index],
+            'ratio': round(self.output_bytes[index] / input_bytes, 4) if input_bytes else None,
+            'seconds': round(self.seconds[index], 4),
+            'error_type': error_type,
+            'error': error,
+            'note': self.notes.get(index)
+        }
+    
+    def rows(self, sort_by=None, reverse=False):
+        """All rows, optionally sorted by a column (empty values last)"""
+        rows = [self.row(index) for index in range(len(self))]
+        if sort_by:
+            # Sorted apart so reversing the order keeps empty values last
+            empty = [row for row in rows if row[sort_by] is None]
+            rows = sorted((row for row in rows if row[sort_by] is not None), key=lambda row: row[sort_by], reverse=reverse)
+            rows += empty
+        return rows
+    
+    def counts(self):
+        """Number of files per status"""
+        counts = {}
+        for status in self.status:
+            label = REPORT_STATUSES[status] if status >= 0 else "pending"
+            counts[label] = counts.get(label, 0) + 1
+        return counts
+    
+    def failed_paths(self):
+        failed = REPORT_STATUSES.index("failed")
+        return [path for path, status in zip(self.paths, self.status) if status == failed]
+    
+    def totals(self):
+        done = [index for index in range(len(self)) if self.status[index] >= 0 and index not in self.errors]
+        input_bytes = sum(self.input_bytes[index] for index in done)
+        output_bytes = sum(self.output_bytes[index] for index in done)
+        return {
+            'files': len(self),
+            'input_bytes': input_bytes,
+            'output_bytes': output_bytes,
+            'ratio': round(output_bytes / input_bytes, 4) if input_bytes else None,
+            'seconds': round(sum(self.seconds), 4),
+            'wall_seconds': round(self.wall_seconds, 4) if self.wall_seconds is not None else None
+        }
+    
+    def write(self, output_dir):
+        """Save the report as JSON and CSV; returns the JSON path"""
+        json_path = os.path.join(output_dir, f"{REPORT_NAME}.json")
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'created': time.strftime("%Y-%m-%dT%H:%M:%S"),
+                'totals': self.totals(),
+                'counts': self.counts(),
+                'files': self.rows()
+            }, f, indent=2)
+        with open(os.path.join(output_dir, f"{REPORT_NAME}.csv"), 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=REPORT_COLUMNS)
+            writer.writeheader()
+            writer.writerows(self.rows())
+        return json_path
+
+def get_history_dir():
+    return os.path.join(get_cache_dir(), HISTORY_FOLDER)
+
+def read_history_index():
+    """Summaries of recorded batches, oldest first"""
+    try:
+        with open(os.path.join(get_history_dir(), "index.json"), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return []
+
+def write_json_atomic(path, data):
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+    os.replace(temp_path, path)
+
+def save_history(report, settings, output_dir, retry_of=None):
+    """Record a finished batch with its settings; returns the run id"""
+    history_dir = get_history_dir()
+    os.makedirs(history_dir, exist_ok=True)
+    run_id = time.strftime("%Y%m%d-%H%M%S-") + f"{time.time_ns() // 1000 % 1_000_000:06d}"
+    summary = {
+        'id': run_id,
+        'created': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        'output_dir': os.path.abspath(output_dir),
+        'files': len(report),
+        'failed': len(report.failed_paths()),
+        'wall_seconds': report.wall_seconds,
+        'retry_of': retry_of
+    }
+    # Absolute paths, so a retry works from any working directory
+    rows = [dict(row, path=absolute_image_path(row['path'])) for row in report.rows()]
+    write_json_atomic(os.path.join(history_dir, f"{run_id}.json"), dict(summary, settings=settings, rows=rows))
+    
+    # The index keeps listing cheap; per-file rows are only read on retry
+    index = read_history_index() + [summary]
+    for old in index[:-HISTORY_LIMIT]:
+        try:
+            os.remove(os.path.join(history_dir, f"{old['id']}.json"))
+        except OSError:
+            pass
+    write_json_atomic(os.path.join(history_dir, "index.json"), index[-HISTORY_LIMIT:])
+    return run_id
+
+def load_history(run_id=None):
+    """A recorded batch (the latest when run_id is None), or None"""
+    index = read_history_index()
+    if run_id is None and index:
+        run_id = index[-1]['id']
+    try:
+        with open(os.path.join(get_history_dir(), f"{run_id}.json"), encoding='utf-8') as f:
+            entry = json.load(f)
+    except (OSError, ValueError, TypeError):
+        return None
+    
+    # JSON turns tuples into lists
+    if entry['settings']['resize']:
+        mode, value = entry['settings']['resize']
+        entry['settings']['resize'] = (mode, tuple(value) if isinstance(value, list) else value)
+    entry['settings'] = default_settings(**entry['settings'])
+    return entry
+
+def retry_failed(run_id=None, progress_callback=None):
+    """Compress only the failed files of a recorded batch, with its settings.
+
+    The retried rows replace the failed ones, the merged report is saved to
+    the output folder and recorded as a new run. Returns (report, run id),
+    or (None, None) when the run is unknown or nothing failed.
+    """
+    entry = load_history(run_id)
+    if entry is None:
+        return None, None
+    report = BatchReport.from_rows(entry['rows'])
+    report.wall_seconds = entry.get('wall_seconds')
+    failed = report.failed_paths()
+    if not failed:
+        return None, None
+    
+    output_dir = entry['output_dir']
+    os.makedirs(output_dir, exist_ok=True)
+    # Retried outputs join the run's output archive rather than replacing it
+    settings = dict(entry['settings'], archive_append=True)
+    # Names are planned over the whole run, so numbered duplicates keep theirs
+    stems = dict(zip(report.paths, plan_output_stems(report.paths, output_dir, settings)[0]))
+    report.update(run_batch(failed, output_dir, settings, progress_callback, [stems[path] for path in failed]))
+    report.write(output_dir)
+    return report, save_history(report, entry['settings'], output_dir, retry_of=entry['id'])
+
+def run_batch(image_paths, output_dir, settings, progress_callback=None, output_stems=None):
+    """Compress a batch across worker processes, largest jobs first.
+
+    Small images go to workers in chunks, everything else one image per
+    job. Archive members are streamed out of their archive in archive
+    order, after the plain files. With settings['archive_output'] the
+    outputs are appended to that ZIP file instead of the output folder.
+    Output names come from plan_output_stems unless `output_stems` is
+    given; name collisions raise ValueError under the "Stop" policy.
+    Returns a BatchReport with every file in input order.
+    """
+    start = time.perf_counter()
+    # Output names are fixed up front in input order, not completion order
+    if output_stems is None:
+        output_stems, collisions = plan_output_stems(image_paths, output_dir, settings)
+        if collisions and settings['on_collision'] == "Stop":
+            raise ValueError(describe_collisions(collisions))
+    if settings['resize']:
+        check_resize_value(*settings['resize'])
+    if not settings['archive_output']:
+        # Subfolders from archives, templates or a mirrored tree, made once
+        for folder in {os.path.dirname(stem) for stem in output_stems}:
+            os.makedirs(folder, exist_ok=True)
+    
+    if settings['profile']:
+        settings = dict(settings, profile_dir=os.path.join(output_dir, PROFILE_FOLDER), profile_owner=os.getpid())
+        clear_profiles(settings['profile_dir'])
+        start_profiling()
+    
+    with profile_stage('probe'):
+        probes = probe_images(image_paths)
+        chunks, singles = plan_chunks(probes, settings, resolve_worker_count(settings['workers'], len(image_paths)))
+        single_set = set(singles)
+        order = [index for index in schedule_largest_first(probes, settings) if index in single_set]
+    workers = resolve_worker_count(settings['workers'], len(chunks) + len(order))
+    report = BatchReport(image_paths)
+    completed = 0
+    
+    # Read files ahead on a thread pool so workers never wait on slow disks.
+    # Archive members are always read here: workers can't share a tar stream
+    archive_sources = ArchiveSources(image_paths)
+    read_all = settings['input_io'] == "Read Ahead"
+    if read_all or archive_sources.members:
+        read_ahead = int(settings['read_ahead'])
+        sources = prefetch_files([
+            image_paths[index] if read_all or is_archive_member(image_paths[index]) else None
+            for index in order
+        ], read_ahead, archive_sources.read)
+    else:
+        read_ahead = 0
+        sources = (None for _ in order)
+    
+    output_archive = None
+    if settings['archive_output']:
+        # Images are already compressed, so members are stored as they are
+        output_archive = zipfile.ZipFile(
+            settings['archive_output'], 'a' if settings['archive_append'] else 'w', zipfile.ZIP_STORED
+        )
+    
+    def jobs():
+        """(indices, function, arguments, source) for each worker job"""
+        for index, source in zip(order, sources):
+            yield [index], compress_image_file, (image_paths[index], output_stems[index], settings, probes[index]), source
+        # Chunks of small images fill in behind the large jobs
+        for chunk in chunks:
+            yield chunk, compress_image_chunk, (
+                [image_paths[index] for index in chunk], [output_stems[index] for index in chunk],
+                settings, [probes[index] for index in chunk]
+            ), None
+    
+    def finish(indices, compress):
+        nonlocal completed
+        completed += len(indices)
+        try:
+            outcomes = compress()
+        except Exception as e:
+            outcomes = [e] * len(indices)
+        if isinstance(outcomes, dict):
+            outcomes = [outcomes]
+        for index, outcome in zip(indices, outcomes):
+            if isinstance(outcome, Exception):
+                report.record_failure(index, outcome)
+                continue
+            if 'data' in outcome:
+                try:
+                    outcome['output_path'] = add_to_archive(output_archive, outcome.pop('data'), outcome['output_path'], output_dir)
+                except Exception as e:
+                    report.record_failure(index, e)
+                    continue
+            report.record(index, outcome)
+        if progress_callback:
+            progress_callback(completed, len(image_paths))
+    
+    try:
+        if workers == 1:
+            for indices, function, arguments, source in jobs():
+                finish(indices, lambda: function(*arguments, *([source.result()] if source else [])))
+        elif settings['pipeline'] == "Split Decode/Encode":
+            run_split_pipeline(jobs(), workers, workers + read_ahead, finish, settings['engine'])
+        else:
+            run_in_pool(jobs(), workers, workers + read_ahead, finish, settings['engine'])
+    finally:
+        archive_sources.close()
+        if output_archive is not None:
+            output_archive.close()
+    
+    if settings['profile']:
+        _profiler.dump(settings['profile_dir'], "main")
+        stop_profiling()
+        report.profile_summary = summarize_profiles(settings['profile_dir'])
+    report.wall_seconds = time.perf_counter() - start
+    return report
+
+def add_to_archive(archive, data, output_path, output_dir):
+    """Store an output in the output archive under its path relative to
+    the output folder; returns the member path of the stored file"""
+    name = os.path.relpath(output_path, output_dir).replace(os.sep, "/")
+    archive.writestr(name, data)
+    return f"{archive.filename}{ARCHIVE_SEPARATOR}{name}"
+
+def init_worker(engine):
+    """Setup for each worker process"""
+    if engine == "OpenCV" and importlib.util.find_spec('cv2'):
+        # One worker runs per core already; OpenCV's own thread pool on
+        # top of that would start cores x cores threads
+        cv2.setNumThreads(1)
+
+def run_in_pool(jobs, workers, window, finish, engine="Pillow"):
+    """Feed jobs to a process pool, keeping at most `window` in flight"""
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(engine,)) as executor:
+        in_flight = {}
+        while True:
+            # Keep every worker busy without buffering the whole batch in memory
+            while len(in_flight) < window:
+                job = next(jobs, None)
+                if job is None:
+                    break
+                indices, function, arguments, source = job
+                if source is not None and source.exception() is not None:
+                    finish(indices, source.result)
+                    continue
+                future = executor.submit(function, *arguments, *([source.result()] if source else []))
+                in_flight[future] = indices
+            
+            if not in_flight:
+                break
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                finish(in_flight.pop(future), future.result)
+
+def shared_block_size(nbytes):
+    """Pool size class for a buffer: the next power of two from 1 MB"""
+    size = SHARED_BLOCK_MIN_BYTES
+    while size < nbytes:
+        size *= 2
+    return size
+
+class SharedBlockPool:
+    """Shared memory blocks for decoded pixels, reused from image to image.
+
+    Lives in the main process, which owns every block and unlinks them all
+    on close. Blocks come in power-of-two size classes, so a finished
+    image's block is leased again for the next image of similar size
+    instead of creating and unlinking a segment per image.
+    """
+    
+    def __init__(self):
+        self.blocks = {}  # name -> SharedMemory
+        self.free = {}  # size class -> free block names
+    
+    def lease(self, nbytes):
+        """Name of a free block of at least `nbytes`"""
+        size = shared_block_size(nbytes)
+        if self.free.get(size):
+            return self.free[size].pop()
+        block = shared_memory.SharedMemory(create=True, size=size)
+        self.blocks[block.name] = block
+        return block.name
+    
+    def release(self, name):
+        block = self.blocks[name]
+        self.free.setdefault(shared_block_size(block.size), []).append(name)
+    
+    def close(self):
+        for block in self.blocks.values():
+            block.close()
+            try:
+                block.unlink()
+            except FileNotFoundError:
+                pass
+        self.blocks.clear()
+        self.free.clear()
+
+# Blocks attached in this worker process, kept open for reuse
+_attached_blocks = {}
+
+def attach_shared_block(name):
+    """Open a block the main process created, without taking ownership.
+
+    Before Python 3.13 attaching also registers the block with the
+    worker's resource tracker, which unlinks it when the worker exits, so
+    registration is switched off while attaching.
+    """
+    block = _attached_blocks.get(name)
+    if block is None:
+        if sys.version_info >= (3, 13):
+            block = shared_memory.SharedMemory(name=name, track=False)
+        else:
+            from multiprocessing import resource_tracker
+            register = resource_tracker.register
+            resource_tracker.register = lambda name, rtype: None
+            try:
+                block = shared_memory.SharedMemory(name=name)
+            finally:
+                resource_tracker.register = register
+        _attached_blocks[name] = block
+    return block
+
+class SharedBlockRequest(namedtuple('SharedBlockRequest', 'nbytes')):
+    """Sent back by a decode worker whose leased block was missing or too small"""
+    __slots__ = ()
+
+class SharedImage(namedtuple('SharedImage', 'block mode size metadata file_size seconds decoded_mode note')):
+    """A decoded image waiting in a shared memory block for its encoder.
+
+    mode is the layout in the block; decoded_mode the mode to restore when
+    it differs (grayscale with alpha travels as RGBA). note goes into the
+    result for the report.
+    """
+    __slots__ = ()
+
+def predict_decoded_bytes(probe, settings):
+    """Shared buffer size for an image after resizing, from its header"""
+    width, height = probe.upright_size
+    if settings['resize']:
+        width, height = compute_resize_dimensions(width, height, *settings['resize'])
+    return width * height * 4
+
+def decode_to_shared(image_path, output_stem, settings, probe=None, block_name=None, source=None):
+    """Decode stage of the split pipeline; runs in a decode worker.
+
+    Writes the decoded, resized pixels into the leased block and returns
+    a SharedImage, or a SharedBlockRequest when no block was leased or it
+    is too small: blocks are only ever created by the main process.
+    Multi-frame files are compressed here in full and return their result
+    dict.
+    """
+    start = time.perf_counter()
+    in_worker = start_worker_profiling(settings)
+    probe = probe or probe_image(image_path, source)
+    with open_image_source(image_path, settings['input_io'], source) as img:
+        frames_note = frame_limit_note(img, settings, probe)
+        if settings['frames'] == "All Frames" and is_multi_frame(img) and not frames_note:
+            decoded = compress_frames(img, image_path, output_stem, settings, probe)
+            decoded['seconds'] = time.perf_counter() - start
+        else:
+            img, metadata = decode_frame(img, settings, probe)
+            with profile_stage('handoff'):
+                # Pillow maps these modes onto a buffer without copying.
+                # RGB pixels already take four bytes in memory, laid out
+                # like RGBX
+                decoded_mode = img.mode
+                if img.mode not in SHARED_MODE_BYTES and img.mode != 'RGB':
+                    img = img.convert('RGBA' if has_alpha(img) else 'RGB')
+                mode = 'RGBX' if img.mode == 'RGB' else img.mode
+                row_bytes = img.width * SHARED_MODE_BYTES[mode]
+                needed = row_bytes * img.height
+                if block_name is None or attach_shared_block(block_name).size < needed:
+                    decoded = SharedBlockRequest(needed)
+                else:
+                    # A band of rows at a time, so no full-size bytes
+                    # object is made on the way into the block
+                    buffer = attach_shared_block(block_name).buf
+                    rows = max(1, SHARED_COPY_BAND_BYTES // row_bytes)
+                    for top in range(0, img.height, rows):
+                        band = img.crop((0, top, img.width, min(img.height, top + rows)))
+                        buffer[top * row_bytes:top * row_bytes + band.height * row_bytes] = band.tobytes('raw', mode)
+                    decoded = SharedImage(
+                        block_name, mode, img.size, metadata, probe.file_size, time.perf_counter() - start,
+                        decoded_mode, frames_note
+                    )
+    
+    if in_worker:
+        dump_worker_profile(settings)
+    return decoded
+
+def encode_from_shared(decoded, image_path, output_stem, settings):
+    """Encode stage of the split pipeline; runs in an encode worker"""
+    start = time.perf_counter()
+    in_worker = start_worker_profiling(settings)
+    block = attach_shared_block(decoded.block)
+    # A view onto the shared pixels: rebuilding the image copies nothing
+    # RGBX goes to the encoders as is; only PNG needs it converted
+    img = Image.frombuffer(decoded.mode, decoded.size, block.buf, 'raw', decoded.mode, 0, 1)
+    if decoded.decoded_mode == 'LA':
+        img = img.convert('LA')
+    result = add_note(
+        encode_and_write(img, image_path, output_stem, settings, decoded.file_size, decoded.metadata), decoded.note
+    )
+    del img
+    result['seconds'] = decoded.seconds + time.perf_counter() - start
+    
+    if in_worker:
+        dump_worker_profile(settings)
+    return result
+
+def run_split_pipeline(jobs, workers, window, finish, engine="Pillow"):
+    """Like run_in_pool, with decoding and encoding on separate pools.
+
+    Single-image jobs are decoded on one pool and handed to the other in
+    pooled shared memory blocks, so the pixels are never pickled. Other
+    jobs (chunks of small images) run whole on the encode pool. At most
+    `window` images are in flight, which also bounds the blocks in use.
+    """
+    decode_workers = max(1, workers // 2)
+    blocks = SharedBlockPool()
+    try:
+        pool_options = {'initializer': init_worker, 'initargs': (engine,)}
+        with ProcessPoolExecutor(max_workers=decode_workers, **pool_options) as decoders, \
+                ProcessPoolExecutor(max_workers=max(1, workers - decode_workers), **pool_options) as encoders:
+            in_flight = {}  # future -> (indices, arguments, leased block, source bytes)
+            while True:
+                while len(in_flight) < window:
+                    job = next(jobs, None)
+                    if job is None:
+                        break
+                    indices, function, arguments, source = job
+                    if source is not None and source.exception() is not None:
+                        finish(indices, source.result)
+                        continue
+                    if function is not compress_image_file:
+                        future = encoders.submit(function, *arguments)
+                        in_flight[future] = (indices, None, None, None)
+                        continue
+                    data = source.result() if source else None
+                    probe = arguments[3]
+                    if probe is None:
+                        # Archive members are probed here, from their bytes,
+                        # so their block is created in this process too
+                        try:
+                            probe = probe_image(arguments[0], data)
+                            arguments = arguments[:3] + (probe,)
+                        except Exception:
+                            pass  # The decode worker reports the error
+                    block_name = blocks.lease(predict_decoded_bytes(probe, arguments[2])) if probe else None
+                    future = decoders.submit(decode_to_shared, *arguments, block_name, data)
+                    in_flight[future] = (indices, arguments, block_name, data)
+                
+                if not in_flight:
+                    break
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    indices, arguments, block_name, data = in_flight.pop(future)
+                    decoded = future.result() if future.exception() is None else None
+                    if isinstance(decoded, SharedBlockRequest):
+                        # No block was predicted, or a bigger one is needed:
+                        # lease one and decode again
+                        if block_name:
+                            blocks.release(block_name)
+                        block_name = blocks.lease(decoded.nbytes)
+                        future = decoders.submit(decode_to_shared, *arguments, block_name, data)
+                        in_flight[future] = (indices, arguments, block_name, data)
+                        continue
+                    if isinstance(decoded, SharedImage):
+                        future = encoders.submit(encode_from_shared, decoded, *arguments[:3])
+                        in_flight[future] = (indices, None, decoded.block, None)
+                        continue
+                    if block_name:
+                        blocks.release(block_name)
+                    finish(indices, future.result)
+    finally:
+        blocks.close()
+
+# Seconds between folder scans, and how long a file must stay unchanged
+# before it is treated as fully written
+WATCH_INTERVAL_SECONDS = 2.0
+WATCH_SETTLE_SECONDS = 2.0
+
+# inotify event masks (linux/inotify.h)
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+
+def open_inotify(folder):
+    """inotify descriptor watching a folder on Linux, or None to poll only"""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        import ctypes
+        import ctypes.util
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            return None
+        if libc.inotify_add_watch(fd, os.fsencode(folder), IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE) < 0:
+            os.close(fd)
+            return None
+        return fd
+    except (OSError, AttributeError):
+        return None
+
+def read_inotify_events(fd):
+    """Drain pending inotify events; returns names that were closed or moved in"""
+    names = set()
+    while True:
+        try:
+            buffer = os.read(fd, 65536)
+        except BlockingIOError:
+            return names
+        offset = 0
+        while offset + 16 <= len(buffer):
+            _, mask, _, length = struct.unpack_from("iIII", buffer, offset)
+            name = buffer[offset + 16:offset + 16 + length].rstrip(b"\0")
+            if mask & (IN_CLOSE_WRITE | IN_MOVED_TO) and name:
+                names.add(os.fsdecode(name))
+            offset += 16 + length
+
+class FolderWatcher:
+    """Finds new images in a folder once they are fully written.
+
+    Every decision comes from scanning the folder, so watching also works
+    where no change notifications exist (network shares, macOS, Windows).
+    On Linux an inotify descriptor wakes the scan early, and a file closed
+    by its writer counts as finished without waiting to settle. Errors go
+    to on_error as messages; the watcher keeps running.
+    """
+    
+    def __init__(self, folder, interval=WATCH_INTERVAL_SECONDS, settle=WATCH_SETTLE_SECONDS, include_existing=False,
+                 on_error=None):
+        self.folder = os.path.abspath(folder)
+        self.interval = interval
+        self.settle = settle
+        self.on_error = on_error or (lambda message: None)
+        self.stop_event = threading.Event()
+        self.pending = {}  # path -> (mtime_ns, size), time first seen unchanged
+        self.closed = set()
+        self.seen = set()
+        self.outputs = set()  # normcased paths this watcher's batches wrote
+        self.inotify_fd = open_inotify(self.folder)
+        # stop() writes to this pipe to end a select() early
+        self.wake_fds = os.pipe() if self.inotify_fd is not None else None
+        self.wake_lock = threading.Lock()
+        if not include_existing:
+            self.seen.update(self.scan().items())
+    
+    def scan(self):
+        """Current images in the folder mapped to (mtime_ns, size)"""
+        found = {}
+        try:
+            entries = list(os.scandir(self.folder))
+        except OSError as e:
+            self.on_error(f"Error scanning {self.folder}: {e}")
+            return found
+        for entry in entries:
+            name = entry.name
+            # Skip hidden and temporary files, and our own outputs
+            if name.startswith(".") or os.path.normcase(entry.path) in self.outputs:
+                continue
+            if os.path.splitext(name)[1].lower() not in IMAGE_EXTENSIONS:
+                continue
+            try:
+                if entry.is_file():
+                    stat = entry.stat()
+                    found[entry.path] = (stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                continue
+        return found
+    
+    def poll(self):
+        """Images that are new and finished since the last poll"""
+        now = time.monotonic()
+        current = self.scan()
+        ready = []
+        for path, stamp in current.items():
+            if (path, stamp) in self.seen or stamp[1] == 0:
+                continue
+            previous = self.pending.get(path)
+            if previous is None or previous[0] != stamp:
+                # New or still growing: restart the settle timer
+                self.pending[path] = (stamp, now)
+                if os.path.basename(path) not in self.closed:
+                    continue
+            elif now - previous[1] < self.settle and os.path.basename(path) not in self.closed:
+                continue
+            ready.append(path)
+            self.seen.add((path, stamp))
+            self.pending.pop(path, None)
+            self.closed.discard(os.path.basename(path))
+        for path in list(self.pending):
+            if path not in current:
+                del self.pending[path]
+        self.closed &= {os.path.basename(path) for path in current}
+        return sorted(ready)
+    
+    def wait(self):
+        """Sleep until the next scan, a change notification or stop()"""
+        if self.inotify_fd is None:
+            self.stop_event.wait(self.interval)
+            return
+        readable, _, _ = select.select([self.inotify_fd, self.wake_fds[0]], [], [], self.interval)
+        if self.inotify_fd in readable:
+            self.closed.update(read_inotify_events(self.inotify_fd))
+    
+    def run(self, on_ready):
+        """Call on_ready with each group of finished images until stopped"""
+        try:
+            while not self.stop_event.is_set():
+                ready = self.poll()
+                if ready and not self.stop_event.is_set():
+                    on_ready(ready)
+                self.wait()
+        finally:
+            if self.inotify_fd is not None:
+                os.close(self.inotify_fd)
+                self.inotify_fd = None
+            with self.wake_lock:
+                if self.wake_fds is not None:
+                    for fd in self.wake_fds:
+                        os.close(fd)
+                    self.wake_fds = None
+    
+    def ignore(self, paths):
+        """Never report these paths (outputs written into the watched folder)"""
+        self.outputs.update(os.path.normcase(os.path.abspath(path)) for path in paths)
+    
+    def stop(self):
+        self.stop_event.set()
+        # Under the lock so run() can't close the pipe in between
+        with self.wake_lock:
+            if self.wake_fds is not None:
+                os.write(self.wake_fds[1], b"x")
+
+def watch_folder(folder, output_dir, settings, on_batch=None, watcher=None, **watch_options):
+    """Compress images as they arrive in a folder until the watcher stops.
+
+    Each group of finished files goes through run_batch, so worker limits,
+    read-ahead and output names match a manual batch. A group that fails
+    is reported to the watcher's on_error and the watch goes on.
+    """
+    watcher = watcher or FolderWatcher(folder, **watch_options)
+    
+    def compress_ready(paths):
+        os.makedirs(output_dir, exist_ok=True)
+        try:
+            # With the output folder watched, outputs of earlier sessions
+            # show up as new files: skip any file another one would write
+            planned = {os.path.normcase(build_output_stem(path, output_dir, settings)): path for path in paths}
+            outputs = [
+                path for path in paths
+                if planned.get(os.path.normcase(os.path.splitext(path)[0]), path) != path
+            ]
+            watcher.ignore(outputs)
+            paths = [path for path in paths if path not in outputs]
+            if not paths:
+                return
+            report = run_batch(paths, output_dir, settings)
+        except Exception as e:
+            # Colliding names (ValueError) or a failed batch skip this group
+            watcher.on_error(str(e) if isinstance(e, ValueError) else f"Batch failed: {type(e).__name__}: {e}")
+            return
+        watcher.ignore(row['output_path'] for row in report.rows() if row['output_path'])
+        if on_batch:
+            on_batch(report)
+    
+    watcher.run(compress_ready)
+
+class ImageCompressor:
+    def __init__(self):
+        # Set appearance mode and color theme
+        ctk.set_appearance_mode("light")
+        ctk.set_default_color_theme("blue")
+        
+        self.root = ctk.CTk()
+        self.root.title("Hikari Image Compressor")
+        self.root.geometry("1280x750")
+        self.root.minsize(800, 650)
+        
+        # Set application icon once the window is up
+        self.root.after_idle(self.create_app_icon)
+        
+        # Variables
+        self.loaded_images = []
+        self.output_folder = tk.StringVar()
+        self.quality_var = tk.StringVar(value="High (80%)")
+        self.engine_var = tk.StringVar(value="Pillow")
+        self.format_var = tk.StringVar(value="JPEG")
+        self.resize_enabled = tk.BooleanVar(value=False)
+        self.resize_scale = tk.StringVar(value="50")
+        self.resize_mode_var = tk.StringVar(value="Percentage")
+        self.resize_values = {
+            "Percentage": self.resize_scale,
+            "Long Edge": tk.StringVar(value="1920"),
+            "Fit Box": tk.StringVar(value="1920x1080"),
+            "Max Megapixels": tk.StringVar(value="12")
+        }
+        self.resize_filter_var = tk.StringVar(value="Lanczos")
+        self.larger_policy_var = tk.StringVar(value="Keep Original")
+        self.png_mode_var = tk.StringVar(value="Standard")
+        self.png_dither_var = tk.BooleanVar(value=True)
+        self.effort_var = tk.StringVar(value="Balanced")
+        self.webp_mode_var = tk.StringVar(value="Lossy")
+        self.alpha_quality_var = tk.StringVar(value="Lossless")
+        self.ssim_target_var = tk.StringVar(value="Balanced (0.95)")
+        self.metadata_policy_var = tk.StringVar(value="Keep ICC Only")
+        self.auto_rotate_var = tk.BooleanVar(value=True)
+        self.workers_var = tk.StringVar(value="Auto")
+        self.input_io_var = tk.StringVar(value="Read Ahead")
+        self.read_ahead_var = tk.StringVar(value="4")
+        self.profile_var = tk.BooleanVar(value=False)
+        self.archive_output_var = tk.BooleanVar(value=False)
+        self.frames_var = tk.StringVar(value="All Frames")
+        self.pipeline_var = tk.StringVar(value="Combined")
+        self.name_template_var = tk.StringVar(value=DEFAULT_NAME_TEMPLATE)
+        self.mirror_tree_var = tk.BooleanVar(value=False)
+        self.collision_var = tk.StringVar(value="Number Duplicates")
+        self.last_report = None
+        self.last_report_path = None
+        self.last_save_errors = []  # why the last report or run could not be saved
+        self.last_run_id = None
+        self.last_profile_dir = None
+        
+        # Estimate labels of the preview cards -> (file size, width, height)
+        self.estimate_labels = {}
+        self.estimate_texts = {}
+        self.estimate_after_id = None
+        self.estimate_generation = 0
+        self.estimate_executor = ThreadPoolExecutor(max_workers=1)
+        self.watcher = None
+        self.watched_count = 0
+        self.last_watch_error = None
+        
+        # Bind quality change to update previews
+        self.quality_var.trace('w', self.on_settings_change)
+        self.format_var.trace('w', self.on_settings_change)
+        self.resize_enabled.trace('w', self.on_settings_change)
+        self.resize_mode_var.trace('w', self.on_resize_mode_change)
+        for resize_value in self.resize_values.values():
+            resize_value.trace('w', self.on_settings_change)
+        
+        self.setup_ui()
+    
+    def create_app_icon(self):
+        """Set the application icon, drawing it only on the first start"""
+        try:
+            icon_path = os.path.join(get_cache_dir(), ICON_CACHE_NAME)
+            if not os.path.exists(icon_path):
+                os.makedirs(os.path.dirname(icon_path), exist_ok=True)
+                self.draw_app_icon().save(icon_path)
+            
+            # Tk reads the cached PNG directly, no PIL round trip
+            self.app_icon = tk.PhotoImage(file=icon_path)
+            self.root.iconphoto(True, self.app_icon)
+            
+        except Exception as e:
+            print(f"Could not create icon: {e}")
+    
+    def draw_app_icon(self):
+        """Draw a minimalist blue icon for the application"""
+        # Create a 64x64 icon with PIL
+        icon_size = 64
+        icon = Image.new('RGBA', (icon_size, icon_size), (0, 0, 0, 0))
+        
+        # Create a simple minimalist icon - a blue circle with a white image symbol
+        draw = ImageDraw.Draw(icon)
+        
+        # Blue circle background
+        margin = 4
+        draw.ellipse([margin, margin, icon_size-margin, icon_size-margin], 
+                    fill='#007AFF', outline='#0056CC', width=2)
+        
+        # White image/photo symbol in the center
+        center = icon_size // 2
+        # Mountain shape
+        points = [
+            (center-12, center+8),  # bottom left
+            (center-8, center-2),   # peak 1
+            (center-2, center+2),   # valley
+            (center+6, center-8),   # peak 2
+            (center+12, center+8),  # bottom right
+        ]
+        draw.polygon(points, fill='white')
+        
+        # Sun/circle in top right
+        draw.ellipse([center+4, center-8, center+8, center-4], fill='white')
+        return icon
+        
+    def setup_ui(self):
+        # Configure root window
+        self.root.configure(fg_color=COLORS['bg_primary'])
+        
+        # Main container
+        main_frame = ctk.CTkFrame(self.root, fg_color="transparent")
+        main_frame.pack(fill="both", expand=True, padx=20, pady=20)
+        
+        # Create two columns
+        left_column = ctk.CTkFrame(
+            main_frame, 
+            width=420, 
+            corner_radius=15,
+            fg_color=COLORS['bg_card'],
+            border_width=1,
+            border_color=COLORS['border']
+        )
+        left_column.pack(side="left", fill="both", expand=False, padx=(0, 10))
+        left_column.pack_propagate(False)
+        
+        right_column = ctk.CTkFrame(
+            main_frame, 
+            corner_radius=15,
+            fg_color=COLORS['bg_card'],
+            border_width=1,
+            border_color=COLORS['border']
+        )
+        right_column.pack(side="right", fill="both", expand=True)
+        
+        self.setup_left_column(left_column)
+        self.setup_right_column(right_column)
+        
+    def setup_left_column(self, parent):
+        # Title
+        title_label = ctk.CTkLabel(
+            parent, 
+            text="Hikari Image Compressor",
+            font=ctk.CTkFont(size=24, weight="bold")
+        )
+        title_label.pack(pady=(20, 10))
+        
+        # Load Images Section
+        load_frame = ctk.CTkFrame(
+            parent, 
+            corner_radius=10,
+            fg_color=COLORS['bg_secondary'],
+            border_width=1,
+            border_color=COLORS['border']
+        )
+        load_frame.pack(fill="x", padx=20, pady=(0, 10))
+        
+        load_title = ctk.CTkLabel(
+            load_frame,
+            text="Load Images",
+            font=ctk.CTkFont(size=16, weight="bold"),
+            text_color=COLORS['text_primary']
+        )
+        load_title.pack(pady=(15, 10))
+        
+        load_btn = ctk.CTkButton(
+            load_frame,
+            text="Select Images",
+            command=self.load_images,
+            height=35,
+            corner_radius=8,
+            fg_color=COLORS['accent'],
+            hover_color="#0056CC"
+        )
+        load_btn.pack(pady=(0, 8))
+        
+        self.watch_btn = ctk.CTkButton(
+            load_frame,
+            text="👁 Watch Folder",
+            command=self.toggle_watch,
+            height=30,
+            corner_radius=8,
+            fg_color=COLORS['text_secondary'],
+            hover_color=COLORS['accent']
+        )
+        self.watch_btn.pack(pady=(0, 15))
+        
+        # Settings Section
+        settings_frame = ctk.CTkFrame(
+            parent, 
+            corner_radius=10,
+            fg_color=COLORS['bg_secondary'],
+            border_width=1,
+            border_color=COLORS['border']
+        )
+        settings_frame.pack(fill="x", padx=20, pady=(0, 10))
+        
+        settings_title = ctk.CTkLabel(
+            settings_frame,
+            text="Compression Settings",
+            font=ctk.CTkFont(size=16, weight="bold"),
+            text_color=COLORS['text_primary']
+        )
+        settings_title.pack(pady=(15, 10))
+        
+        # Quality selector with info button
+        quality_frame = ctk.CTkFrame(settings_frame, fg_color="transparent")
+        quality_frame.pack(fill="x", padx=15, pady=5)
+        
+        quality_label = ctk.CTkLabel(
+            quality_frame, 
+            text="Quality:",
+            text_color=COLORS['text_primary']
+        )
+        quality_label.pack(side="left")
+        
+        quality_info_btn = ctk.CTkButton(
+            quality_frame,
+            text="i",
+            width=25,
+            height=25,
+            corner_radius=12,
+            command=lambda: self.show_info("quality"),
+            fg_color=COLORS['text_secondary'],
+            hover_color=COLORS['accent']
+        )
+        quality_info_btn.pack(side="right")
+        
+        quality_menu = ctk.CTkOptionMenu(
+            quality_frame,
+            values=list(QUALITY_PRESETS) + [AUTO_QUALITY_LABEL],
+            variable=self.quality_var,
+            width=200,
+            fg_color=COLORS['bg_card'],
+            button_color=COLORS['accent'],
+            button_hover_color="#0056CC",
+            text_color=COLORS['text_primary'],
+            font=ctk.CTkFont(size=12, weight="bold")
+        )
+        quality_menu.pack(side="right", padx=(0, 10))
+        
+        # Format selector with info button
+        format_frame = ctk.CTkFrame(settings_frame, fg_color="transparent")
+        format_frame.pack(fill="x", padx=15, pady=5)
+        
+        format_label = ctk.CTkLabel(
+            format_frame, 
+            text="Format:",
+            text_color=COLORS['text_primary']
+        )
+        format_label.pack(side="left")
+        
+        format_info_btn = ctk.CTkButton(
+            format_frame,
+            text="i",
+            width=25,
+            height=25,
+            corner_radius=12,
+            command=lambda: self.show_info("format"),
+            fg_color=COLORS['text_secondary'],
+            hover_color=COLORS['accent']
+        )
+        format_info_btn.pack(side="right")
+        
+        format_menu = ctk.CTkOptionMenu(
+            format_frame,
+            values=get_output_formats(),
+            variable=self.format_var,
+            width=200,
+            fg_color=COLORS['bg_card'],
+            button_color=COLORS['accent'],
+            button_hover_color="#0056CC",
+            text_color=COLORS['text_primary'],
+            font=ctk.CTkFont(size=12, weight="bold")
+        )
+        format_menu.pack(side="right", padx=(0, 10))
+        
+        # Engine selector with info button
+        engine_frame = ctk.CTkFrame(settings_frame, fg_color="transparent")
+        engine_frame.pack(fill="x", padx=15, pady=5)
+        
+        engine_label = ctk.CTkLabel(
+            engine_frame, 
+            text="Engine:",
+            text_color=COLORS['text_primary']
+        )
+        engine_label.pack(side="left")
+        
+        engine_info_btn = ctk.CTkButton(
+            engine_frame,
+            text="i",
+            width=25,
+            height=25,
+            corner_radius=12,
+            command=lambda: self.show_info("engine"),
+            fg_color=COLORS['text_secondary'],
+            hover_color=COLORS['accent']
+        )
+        engine_info_btn.pack(side="right")
+        
+        engine_menu = ctk.CTkOptionMenu(
+            engine_frame,
+            values=get_engines(),
+            variable=self.engine_var,
+            width=200,
+            fg_color=COLORS['bg_card'],
+            button_color=COLORS['accent'],
+            button_hover_color="#0056CC",
+            text_color=COLORS['text_primary'],
+            font=ctk.CTkFont(size=12, weight="bold")
+        )
+        engine_menu.pack(side="right", padx=(0, 10))
+        
+        # Skip-if-larger policy selector with info button
+        larger_frame = ctk.CTkFrame(settings_frame, fg_color="transparent")
+        larger_frame.pack(fill="x", padx=15, pady=5)
+        
+        larger_label = ctk.CTkLabel(
+            larger_frame, 
+            text="If Larger:",
+            text_color=COLORS['text_primary']
+        )
+        larger_label.pack(side="left")
+        
+        larger_info_btn = ctk.CTkButton(
+            larger_frame,
+            text="i",
+            width=25,
+            height=25,
+            corner_radius=12,
+            command=lambda: self.show_info("larger"),
+            fg_color=COLORS['text_secondary'],
+            hover_color=COLORS['accent']
+        )
+        larger_info_btn.pack(side="right")
+        
+        larger_menu = ctk.CTkOptionMenu(
+            larger_frame,
+            values=LARGER_POLICIES,
+            variable=self.larger_policy_var,
+            width=200,
+            fg_color=COLORS['bg_card'],
+            button_color=COLORS['accent'],
+            button_hover_color="#0056CC",
+            text_color=COLORS['text_primary'],
+            font=ctk.CTkFont(size=12, weight="bold")
+        )
+        larger_menu.pack(side="right", padx=(0, 10))
+        
+        # Advanced encoder settings live in a separate dialog
+        advanced_btn = ctk.CTkButton(
+            settings_frame,
+            text="⚙ Advanced Settings",
+            command=self.show_advanced_settings,
+            height=30,
+            corner_radius=8,
+            fg_color=COLORS['text_secondary'],
+            hover_color=COLORS['accent']
+        )
+        advanced_btn.pack(pady=(5, 15))
+        
+        # Resize Section
+        resize_frame = ctk.CTkFrame(
+            parent, 
+            corner_radius=10,
+            fg_color=COLORS['bg_secondary'],
+            border_width=1,
+            border_color=COLORS['border']
+        )
+        resize_frame.pack(fill="x", padx=20, pady=(0, 10))
+        
+        # Resize header with checkbox
+        resize_header_frame = ctk.CTkFrame(resize_frame, fg_color="transparent")
+        resize_header_frame.pack(fill="x", padx=15, pady=(15, 10))
+        
+        self.resize_checkbox = ctk.CTkCheckBox(
+            resize_header_frame,
+            text="Resize Images",
+            variable=self.resize_enabled,
+            font=ctk.CTkFont(size=16, weight="bold"),
+            text_color=COLORS['text_primary'],
+            command=self.toggle_resize_options
+        )
+        self.resize_checkbox.pack(side="left")
+        
+        resize_info_btn = ctk.CTkButton(
+            resize_header_frame,
+            text="i",
+            width=25,
+            height=25,
+            corner_radius=12,
+            command=lambda: self.show_info("resize"),
+            fg_color=COLORS['text_secondary'],
+            hover_color=COLORS['accent']
+        )
+        resize_info_btn.pack(side="right")
+        
+        # Resize options frame (initially hidden)
+        self.resize_options_frame = ctk.CTkFrame(resize_frame, fg_color="transparent")
+        
+        # Resize mode
+        self.add_option_row(
+            self.resize_options_frame, "Mode:", list(RESIZE_MODES), self.resize_mode_var, "resize"
+        )
+        
+        # Scale/Percentage frame (label and unit follow the resize mode)
+        scale_frame = ctk.CTkFrame(self.resize_options_frame, fg_color="transparent")
+        scale_frame.pack(fill="x", padx=15, pady=(5, 10))
+        
+        self.scale_label = ctk.CTkLabel(
+            scale_frame, 
+            text="Scale:",
+            text_color=COLORS['text_primary']
+        )
+        self.scale_label.pack(side="left")
+        
+        self.scale_entry = ctk.CTkEntry(
+            scale_frame,
+            textvariable=self.resize_scale,
+            width=100,
+            height=30
+        )
+        self.scale_entry.pack(side="left", padx=(10, 5))
+        
+        self.scale_unit_label = ctk.CTkLabel(
+            scale_frame, 
+            text="%",
+            text_color=COLORS['text_primary']
+        )
+        self.scale_unit_label.pack(side="left", padx=(5, 0))
+        
+        # Resampling filter
+        filter_frame = self.add_option_row(
+            self.resize_options_frame, "Filter:", list(RESAMPLING_FILTERS), self.resize_filter_var, "filter"
+        )
+        filter_frame.pack_configure(pady=(0, 10))
+        
+        # Initially hide resize options
+        self.toggle_resize_options()
+        
+        # Output folder section
+        output_frame = ctk.CTkFrame(
+            parent, 
+            corner_radius=10,
+            fg_color=COLORS['bg_secondary'],
+            border_width=1,
+            border_color=COLORS['border']
+        )
+        output_frame.pack(fill="x", padx=20, pady=(0, 10))
+        
+        output_title = ctk.CTkLabel(
+            output_frame,
+            text="Output Folder",
+            font=ctk.CTkFont(size=16, weight="bold"),
+            text_color=COLORS['text_primary']
+        )
+        output_title.pack(pady=(15, 10))
+        
+        # Buttons frame for output folder actions
+        output_buttons_frame = ctk.CTkFrame(output_frame, fg_color="transparent")
+        output_buttons_frame.pack(pady=(0, 10))
+        
+        output_btn = ctk.CTkButton(
+            output_buttons_frame,
+            text="Select Output Folder",
+            command=self.select_output_folder,
+            height=35,
+            width=140,
+            corner_radius=8,
+            fg_color=COLORS['accent'],
+            hover_color="#0056CC"
+        )
+        output_btn.pack(side="left", padx=(0, 8))
+        
+        self.open_folder_btn = ctk.CTkButton(
+            output_buttons_frame,
+            text="📁 Open Folder",
+            command=self.open_output_folder,
+            height=35,
+            width=110,
+            corner_radius=8,
+            fg_color=COLORS['text_secondary'],
+            hover_color=COLORS['accent']
+        )
+        self.open_folder_btn.pack(side="left", padx=(0, 8))
+        
+        report_btn = ctk.CTkButton(
+            output_buttons_frame,
+            text="📊 Report",
+            command=self.show_report,
+            height=35,
+            width=90,
+            corner_radius=8,
+            fg_color=COLORS['text_secondary'],
+            hover_color=COLORS['accent']
+        )
+        report_btn.pack(side="left", padx=(0, 8))
+        
+        plan_btn = ctk.CTkButton(
+            output_buttons_frame,
+            text="📋 Plan",
+            command=self.show_plan,
+            height=35,
+            width=80,
+            corner_radius=8,
+            fg_color=COLORS['text_secondary'],
+            hover_color=COLORS['accent']
+        )
+        plan_btn.pack(side="left")
+        
+        self.output_label = ctk.CTkLabel(
+            output_frame,
+            text="Same as source folder",
+            font=ctk.CTkFont(size=12),
+            text_color=COLORS['text_secondary']
+        )
+        self.output_label.pack(pady=(5, 15))
+        
+        # Compress button
+        compress_btn = ctk.CTkButton(
+            parent,
+            text="Start Compression",
+            command=self.start_compression,
+            height=45,
+            font=ctk.CTkFont(size=16, weight="bold"),
+            corner_radius=10,
+            fg_color=COLORS['success'],
+            hover_color="#28A745"
+        )
+        compress_btn.pack(fill="x", padx=20, pady=(0, 10))
+        
+        # Progress bar
+        self.progress = ctk.CTkProgressBar(parent)
+        self.progress.pack(fill="x", padx=20, pady=(0, 10))
+        self.progress.set(0)
+        
+
+        
+    def setup_right_column(self, parent):
+        # Preview header with title and clear button
+        header_frame = ctk.CTkFrame(parent, fg_color="transparent")
+        header_frame.pack(fill="x", padx=20, pady=(20, 10))
+        
+        preview_title = ctk.CTkLabel(
+            header_frame,
+            text="Image Preview",
+            font=ctk.CTkFont(size=18, weight="bold"),
+            text_color=COLORS['text_primary']
+        )
+        preview_title.pack(side="left")
+        
+        self.clear_btn = ctk.CTkButton(
+            header_frame,
+            text="Clear All",
+            command=self.clear_images,
+            height=30,
+            width=80,
+            corner_radius=8,
+            fg_color=COLORS['error'],
+            hover_color="#CC2E24"
+        )
+        self.clear_btn.pack(side="right")
+        self.clear_btn.pack_forget()  # Hide initially
+        
+        # Scrollable frame for images (reduced height)
+        self.preview_frame = ctk.CTkScrollableFrame(
+            parent, 
+            corner_radius=10,
+            fg_color=COLORS['bg_secondary'],
+            border_width=1,
+            border_color=COLORS['border'],
+            height=350
+        )
+        self.preview_frame.pack(fill="both", expand=True, padx=20, pady=(0, 10))
+        
+        # Initial message (centered)
+        self.no_images_label = ctk.CTkLabel(
+            self.preview_frame,
+            text="No images loaded\nClick 'Select Images' to get started",
+            font=ctk.CTkFont(size=14),
+            text_color=COLORS['text_secondary']
+        )
+        self.no_images_label.pack(expand=True, pady=(120, 0))
+        
+        # Support and credits are not needed for the first paint
+        self.root.after_idle(self.setup_footer_sections, parent)
+    
+    def setup_footer_sections(self, parent):
+        """Build the support and credits sections below the preview"""
+        # Support Development section
+        support_frame = ctk.CTkFrame(
+            parent, 
+            corner_radius=10,
+            fg_color=COLORS['bg_card'],
+            border_width=1,
+            border_color=COLORS['border']
+        )
+        support_frame.pack(fill="x", padx=20, pady=(0, 10))
+        
+        # Support header with emoji
+        support_header_frame = ctk.CTkFrame(support_frame, fg_color="transparent")
+        support_header_frame.pack(fill="x", padx=20, pady=(12, 5))
+        
+        support_title = ctk.CTkLabel(
+            support_header_frame,
+            text="🤝 Support Development",
+            font=ctk.CTkFont(size=16, weight="bold"),
+            text_color=COLORS['text_primary']
+        )
+        support_title.pack()
+        
+        # Support description
+        support_desc = ctk.CTkLabel(
+            support_frame,
+            text="If you find Hikari useful, consider supporting its development!",
+            font=ctk.CTkFont(size=12),
+            text_color=COLORS['text_secondary']
+        )
+        support_desc.pack(pady=(0, 8))
+        
+        # Ko-fi button (large and prominent)
+        kofi_btn = ctk.CTkButton(
+            support_frame,
+            text="☕ Buy me a coffee on Ko-fi",
+            command=lambda: webbrowser.open("https://ko-fi.com/gary19gts"),
+            height=45,
+            corner_radius=10,
+            fg_color="#FF5E5B",
+            hover_color="#E04E4B",
+            text_color="white",
+            font=ctk.CTkFont(size=14, weight="bold")
+        )
+        kofi_btn.pack(fill="x", padx=20, pady=(0, 6))
+        
+        # Thank you message
+        thank_you_label = ctk.CTkLabel(
+            support_frame,
+            text="Thank you for your support! 🖤",
+            font=ctk.CTkFont(size=11),
+            text_color=COLORS['text_secondary']
+        )
+        thank_you_label.pack(pady=(0, 12))
+        
+        # Credits section (single line)
+        credits_frame = ctk.CTkFrame(
+            parent, 
+            corner_radius=10,
+            fg_color=COLORS['bg_secondary'],
+            border_width=1,
+            border_color=COLORS['border']
+        )
+        credits_frame.pack(fill="x", padx=20, pady=(5, 20))
+        
+        # Credits content in horizontal layout
+        credits_content_frame = ctk.CTkFrame(credits_frame, fg_color="transparent")
+        credits_content_frame.pack(fill="x", padx=15, pady=12)
+        
+        credits_text = ctk.CTkLabel(
+            credits_content_frame,
+            text="Hikari Image Compressor v1.1.0 • Created by Gary19gts",
+            font=ctk.CTkFont(size=12),
+            text_color=COLORS['text_primary']
+        )
+        credits_text.pack(side="left")
+        
+        # Buttons on the right
+        buttons_frame = ctk.CTkFrame(credits_content_frame, fg_color="transparent")
+        buttons_frame.pack(side="right")
+        
+        about_btn = ctk.CTkButton(
+            buttons_frame,
+            text="About",
+            command=self.show_about,
+            height=40,
+            width=75,
+            corner_radius=8,
+            fg_color=COLORS['accent'],
+            hover_color="#0056CC",
+            font=ctk.CTkFont(size=12)
+        )
+        about_btn.pack(side="left", padx=(0, 8))
+        
+        credits_btn = ctk.CTkButton(
+            buttons_frame,
+            text="Credits",
+            command=self.show_credits,
+            height=40,
+            width=75,
+            corner_radius=8,
+            fg_color=COLORS['text_secondary'],
+            hover_color=COLORS['accent'],
+            font=ctk.CTkFont(size=12)
+        )
+        credits_btn.pack(side="left") 
+       
+    def load_images(self):
+        """Load images from file dialog"""
+        filetypes = [
+            ("Image files", "*.png *.jpg *.jpeg *.bmp *.tiff *.webp *.gif"),
+            ("Images and archives", "*.png *.jpg *.jpeg *.bmp *.tiff *.webp *.gif *.zip *.tar *.tar.gz *.tgz *.tar.bz2 *.tar.xz"),
+            ("ZIP/TAR archives", "*.zip *.tar *.tar.gz *.tgz *.tar.bz2 *.tar.xz"),
+            ("PNG files", "*.png"),
+            ("JPEG files", "*.jpg *.jpeg"),
+            ("All files", "*.*")
+        ]
+        
+        files = filedialog.askopenfilenames(
+            title="Select Images to Compress",
+            filetypes=filetypes
+        )
+        
+        if files:
+            try:
+                # Archives are listed, not extracted; their images load in place
+                self.loaded_images = expand_archives(files)
+            except (OSError, zipfile.BadZipFile, tarfile.TarError) as e:
+                messagebox.showerror("Error", f"Could not read archive: {e}")
+                return
+            # Set default output folder to same as first image
+            if not self.output_folder.get():
+                self.output_folder.set(os.path.dirname(files[0]))
+                self.output_label.configure(text=f"Output: {os.path.basename(self.output_folder.get())}")
+            
+            self.update_preview()
+            self.clear_btn.pack(side="right")  # Show clear button
+    
+    def toggle_watch(self):
+        """Start or stop compressing new images from a watched folder"""
+        if self.watcher:
+            self.watcher.stop()
+            self.watcher = None
+            self.watch_btn.configure(text="👁 Watch Folder", fg_color=COLORS['text_secondary'])
+            return
+        
+        if not self.check_resize_entry():
+            return
+        folder = filedialog.askdirectory(title="Select Folder to Watch")
+        if not folder:
+            return
+        if not self.output_folder.get():
+            self.output_folder.set(folder)
+            self.output_label.configure(text=f"Output: {os.path.basename(folder)}")
+        
+        # Settings are fixed for the session, like a manual batch
+        self.last_watch_error = None
+        self.watcher = FolderWatcher(folder, on_error=self.on_watch_error)
+        self.watched_count = 0
+        settings = self.get_compression_settings()
+        thread = threading.Thread(
+            target=watch_folder,
+            args=(folder, self.output_folder.get(), settings, self.on_watch_batch, self.watcher)
+        )
+        thread.daemon = True
+        thread.start()
+        self.watch_btn.configure(text=f"⏹ Stop Watching {os.path.basename(folder)}", fg_color=COLORS['success'])
+    
+    def on_watch_batch(self, report):
+        """Count images compressed by the watcher (background thread)"""
+        compressed = len(report) - len(report.failed_paths())
+        self.root.after(0, lambda: self.update_watch_status(compressed))
+    
+    def on_watch_error(self, message):
+        """Show a watcher error (background thread); repeats of the last one stay quiet"""
+        if message == self.last_watch_error:
+            return
+        self.last_watch_error = message
+        self.root.after(0, lambda: messagebox.showwarning("Watch Folder", message))
+    
+    def update_watch_status(self, compressed):
+        if not self.watcher:
+            return
+        self.watched_count += compressed
+        folder = os.path.basename(self.watcher.folder)
+        self.watch_btn.configure(text=f"⏹ Stop Watching {folder} ({self.watched_count} done)")
+    
+    def select_output_folder(self):
+        """Select output folder"""
+        folder = filedialog.askdirectory(title="Select Output Folder")
+        if folder:
+            self.output_folder.set(folder)
+            self.output_label.configure(text=f"Output: {os.path.basename(folder)}")
+    
+    def open_output_folder(self):
+        """Open the output folder in file explorer"""
+        output_dir = self.output_folder.get()
+        
+        # If no output folder is set, use the source folder of the first image
+        if not output_dir and self.loaded_images:
+            output_dir = os.path.dirname(self.loaded_images[0])
+        
+        if output_dir and os.path.exists(output_dir):
+            try:
+                # Open folder in file explorer (cross-platform)
+                if os.name == 'nt':  # Windows
+                    os.startfile(output_dir)
+                elif os.name == 'posix':  # macOS and Linux
+                    if sys.platform == 'darwin':  # macOS
+                        os.system(f'open "{output_dir}"')
+                    else:  # Linux
+                        os.system(f'xdg-open "{output_dir}"')
+            except Exception as e:
+                messagebox.showerror("Error", f"Could not open folder: {e}")
+        else:
+            messagebox.showwarning("No Folder", "No output folder selected or folder doesn't exist.")
+    
+    def update_preview(self):
+        """Update the preview panel with loaded images"""
+        # Clear existing previews; pending estimate results are for old labels
+        for widget in self.preview_frame.winfo_children():
+            widget.destroy()
+        self.estimate_labels = {}
+        self.estimate_texts = {}
+        self.estimate_generation += 1
+        
+        if not self.loaded_images:
+            self.no_images_label = ctk.CTkLabel(
+                self.preview_frame,
+                text="No images loaded\nClick 'Select Images' to get started",
+                font=ctk.CTkFont(size=14),
+                text_color=COLORS['text_secondary']
+            )
+            self.no_images_label.pack(expand=True, pady=(120, 0))
+            self.clear_btn.pack_forget()  # Hide clear button
+            return
+        
+        # Show loaded images
+        for i, image_path in enumerate(self.loaded_images):
+            self.create_image_preview(image_path, i)
+    
+    def create_image_preview(self, image_path, index):
+        """Create a preview card for an image"""
+        # Image card frame
+        card_frame = ctk.CTkFrame(
+            self.preview_frame, 
+            corner_radius=10,
+            fg_color=COLORS['bg_card'],
+            border_width=1,
+            border_color=COLORS['border']
+        )
+        card_frame.pack(fill="x", padx=10, pady=5)
+        
+        # Image info frame
+        info_frame = ctk.CTkFrame(card_frame, fg_color="transparent")
+        info_frame.pack(fill="x", padx=15, pady=10)
+        
+        try:
+            # Load and resize image for thumbnail
+            # Archive members are read once for both the probe and the thumbnail
+            source = read_archive_member(image_path) if is_archive_member(image_path) else None
+            probe = probe_image(image_path, source)
+            with open_image_source(image_path, source=source) as img:
+                # Calculate thumbnail size
+                img.thumbnail((150, 150), Image.Resampling.BILINEAR)
+                img = apply_orientation(img, probe.orientation)
+                img = convert_color(img, probe.color_path, img.info.get('icc_profile'))
+                
+                # Convert to PhotoImage
+                photo = ImageTk.PhotoImage(img)
+                
+                # Image thumbnail
+                img_label = tk.Label(info_frame, image=photo, bg=COLORS['bg_card'], bd=0)
+                img_label.image = photo  # Keep a reference
+                img_label.pack(side="left", padx=(0, 15))
+                
+                # Image details
+                details_frame = ctk.CTkFrame(info_frame, fg_color="transparent")
+                details_frame.pack(side="left", fill="both", expand=True)
+                
+                # File name
+                filename = os.path.basename(image_path)
+                name_label = ctk.CTkLabel(
+                    details_frame,
+                    text=filename,
+                    font=ctk.CTkFont(size=14, weight="bold"),
+                    anchor="w",
+                    text_color=COLORS['text_primary']
+                )
+                name_label.pack(fill="x", pady=(0, 5))
+                
+                # File size and dimensions from the header probe
+                file_size = probe.file_size
+                size_text = self.format_file_size(file_size)
+                original_width, original_height = probe.upright_size
+                dimensions = f"{original_width}x{original_height}"
+                alpha_text = " • alpha" if probe.has_alpha else ""
+                
+                size_label = ctk.CTkLabel(
+                    details_frame,
+                    text=f"Size: {size_text} • {dimensions} • {probe.format}{alpha_text}",
+                    font=ctk.CTkFont(size=12),
+                    text_color=COLORS['text_secondary'],
+                    anchor="w"
+                )
+                size_label.pack(fill="x", pady=(0, 5))
+                
+                # Estimated compression (registered for updates)
+                estimated_size = self.estimate_compressed_size(file_size, original_width, original_height)
+                estimate_text = self.format_estimate(file_size, estimated_size)
+                
+                estimate_label = ctk.CTkLabel(
+                    details_frame,
+                    text=estimate_text,
+                    font=ctk.CTkFont(size=12),
+                    text_color=COLORS['success'],
+                    anchor="w"
+                )
+                estimate_label.pack(fill="x")
+                
+                self.estimate_labels[estimate_label] = (file_size, original_width, original_height)
+                self.estimate_texts[estimate_label] = estimate_text
+                
+                # Delete button (X) on the right side
+                delete_btn = ctk.CTkButton(
+                    info_frame,
+                    text="✕",
+                    width=30,
+                    height=30,
+                    corner_radius=15,
+                    fg_color=COLORS['error'],
+                    hover_color="#CC2E24",
+                    font=ctk.CTkFont(size=16, weight="bold"),
+                    command=lambda idx=index: self.remove_image(idx)
+                )
+                delete_btn.pack(side="right", padx=(10, 0))
+                
+        except Exception as e:
+            # Error loading image
+            error_label = ctk.CTkLabel(
+                info_frame,
+                text=f"Error loading: {os.path.basename(image_path)}",
+                font=ctk.CTkFont(size=12),
+                text_color=COLORS['error']
+            )
+            error_label.pack(pady=10)
+    
+    def format_file_size(self, size_bytes):
+        """Format file size in human readable format"""
+        if size_bytes < 1024:
+            return f"{size_bytes} B"
+        elif size_bytes < 1024 * 1024:
+            return f"{size_bytes / 1024:.1f} KB"
+        else:
+            return f"{size_bytes / (1024 * 1024):.1f} MB"
+    
+    def estimate_compressed_size(self, original_size, original_width=None, original_height=None):
+        """Estimate compressed file size based on quality setting and resize options"""
+        return estimate_output_size(original_size, original_width, original_height, *self.get_estimate_settings())
+    
+    def format_estimate(self, original_size, estimated_size):
+        """Text of an estimate label"""
+        compression_ratio = (original_size - estimated_size) / original_size * 100 if original_size else 0.0
+        return f"Estimated: {self.format_file_size(estimated_size)} ({compression_ratio:.1f}% reduction)"
+    
+    def get_estimate_settings(self):
+        """Settings the estimates depend on, read on the UI thread"""
+        return self.quality_var.get(), self.format_var.get(), self.get_resize_setting()
+    
+    def on_settings_change(self, *args):
+        """Called when quality, format or resize settings change"""
+        # Typing in the resize entry fires on every keystroke; only the last
+        # change within the debounce window refreshes the estimates
+        if self.estimate_after_id is not None:
+            self.root.after_cancel(self.estimate_after_id)
+        self.estimate_after_id = self.root.after(ESTIMATE_DEBOUNCE_MS, self.refresh_estimates)
+    
+    def refresh_estimates(self):
+        """Recompute every estimate off the UI thread, then apply them at once"""
+        self.estimate_after_id = None
+        self.estimate_generation += 1
+        generation = self.estimate_generation
+        entries = list(self.estimate_labels.items())
+        settings = self.get_estimate_settings()
+        
+        def compute():
+            texts = [
+                self.format_estimate(size, estimate_output_size(size, width, height, *settings))
+                for _, (size, width, height) in entries
+            ]
+            self.root.after(0, lambda: self.apply_estimates(generation, entries, texts))
+        
+        self.estimate_executor.submit(compute)
+    
+    def apply_estimates(self, generation, entries, texts):
+        """Update the labels whose text changed, unless newer results are coming"""
+        if generation != self.estimate_generation:
+            return
+        for (label, _), text in zip(entries, texts):
+            if self.estimate_texts.get(label) != text:
+                self.estimate_texts[label] = text
+                label.configure(text=text)
+    
+    def clear_images(self):
+        """Clear all loaded images"""
+        if not self.loaded_images:
+            return
+            
+        # Show confirmation dialog
+        result = messagebox.askyesno(
+            "Clear All Images", 
+            f"Are you sure you want to remove all {len(self.loaded_images)} images?",
+            icon="warning"
+        )
+        
+        if result:
+            self.loaded_images = []
+            self.update_preview()
+    
+    def remove_image(self, index):
+        """Remove a specific image from the list"""
+        if 0 <= index < len(self.loaded_images):
+            self.loaded_images.pop(index)
+            self.update_preview()
+    
+    def toggle_resize_options(self):
+        """Toggle visibility of resize options"""
+        if self.resize_enabled.get():
+            self.resize_options_frame.pack(fill="x", pady=(0, 10))
+        else:
+            self.resize_options_frame.pack_forget()
+    
+    def on_resize_mode_change(self, *args):
+        """Point the resize entry at the value of the selected mode"""
+        mode = self.resize_mode_var.get()
+        label_text, unit, _ = RESIZE_MODES.get(mode, RESIZE_MODES["Percentage"])
+        self.scale_label.configure(text=label_text)
+        self.scale_unit_label.configure(text=unit)
+        self.scale_entry.configure(textvariable=self.get_resize_value_var())
+        self.on_settings_change()
+    
+    def get_resize_value_var(self):
+        """Entry variable holding the value for the selected resize mode"""
+        return self.resize_values.get(self.resize_mode_var.get(), self.resize_scale)
+    
+    def get_resize_setting(self):
+        """Resize mode and parsed value, or None when off or invalid.
+
+        Batches check the entry first with check_resize_entry, so an
+        invalid value only ever reaches the preview.
+        """
+        if not self.resize_enabled.get():
+            return None
+        try:
+            mode = self.resize_mode_var.get()
+            return mode, parse_resize_value(mode, self.get_resize_value_var().get())
+        except ValueError:
+            # Keep original dimensions if the entry is invalid
+            return None
+    
+    def check_resize_entry(self):
+        """Show an error and return False when resizing is on with an invalid value"""
+        if not self.resize_enabled.get():
+            return True
+        try:
+            parse_resize_value(self.resize_mode_var.get(), self.get_resize_value_var().get())
+        except ValueError as e:
+            messagebox.showerror("Invalid Resize Value", str(e))
+            return False
+        return True
+    
+    def add_option_row(self, parent, label_text, values, variable, info_type):
+        """Add a labelled option menu row with an info button"""
+        row_frame = ctk.CTkFrame(parent, fg_color="transparent")
+        row_frame.pack(fill="x", padx=15, pady=5)
+        
+        row_label = ctk.CTkLabel(
+            row_frame, 
+            text=label_text,
+            text_color=COLORS['text_primary']
+        )
+        row_label.pack(side="left")
+        
+        info_btn = ctk.CTkButton(
+            row_frame,
+            text="i",
+            width=25,
+            height=25,
+            corner_radius=12,
+            command=lambda: self.show_info(info_type),
+            fg_color=COLORS['text_secondary'],
+            hover_color=COLORS['accent']
+        )
+        info_btn.pack(side="right")
+        
+        option_menu = ctk.CTkOptionMenu(
+            row_frame,
+            values=values,
+            variable=variable,
+            width=200,
+            fg_color=COLORS['bg_card'],
+            button_color=COLORS['accent'],
+            button_hover_color="#0056CC",
+            text_color=COLORS['text_primary'],
+            font=ctk.CTkFont(size=12, weight="bold")
+        )
+        option_menu.pack(side="right", padx=(0, 10))
+        return row_frame
+    
+    def add_section_title(self, parent, text):
+        """Add a bold section title to the advanced settings dialog"""
+        section_label = ctk.CTkLabel(
+            parent,
+            text=text,
+            font=ctk.CTkFont(size=16, weight="bold"),
+            text_color=COLORS['text_primary']
+        )
+        section_label.pack(anchor="w", padx=15, pady=(15, 5))
+    
+    def show_advanced_settings(self):
+        """Show the advanced encoder settings dialog"""
+        settings_window = ctk.CTkToplevel(self.root)
+        settings_window.title("Advanced Settings")
+        settings_window.geometry("520x560")
+        settings_window.resizable(False, False)
+        settings_window.transient(self.root)
+        settings_window.grab_set()
+        
+        # Center the window
+        settings_window.update_idletasks()
+        x = (settings_window.winfo_screenwidth() // 2) - (520 // 2)
+        y = (settings_window.winfo_screenheight() // 2) - (560 // 2)
+        settings_window.geometry(f"520x560+{x}+{y}")
+        
+        # Main frame
+        main_frame = ctk.CTkFrame(settings_window, fg_color="transparent")
+        main_frame.pack(fill="both", expand=True, padx=20, pady=20)
+        
+        # Scrollable frame for setting rows
+        options_frame = ctk.CTkScrollableFrame(
+            main_frame,
+            corner_radius=10,
+            fg_color=COLORS['bg_secondary'],
+            border_width=1,
+            border_color=COLORS['border']
+        )
+        options_frame.pack(fill="both", expand=True, pady=(0, 20))
+        
+        # PNG settings
+        self.add_section_title(options_frame, "PNG")
+        self.add_option_row(options_frame, "PNG Mode:", list(PNG_MODES), self.png_mode_var, "png_mode")
+        
+        png_dither_checkbox = ctk.CTkCheckBox(
+            options_frame,
+            text="Dither palette colors",
+            variable=self.png_dither_var,
+            text_color=COLORS['text_primary']
+        )
+        png_dither_checkbox.pack(anchor="w", padx=15, pady=5)
+        
+        # WebP / AVIF settings
+        self.add_section_title(options_frame, "WebP / AVIF")
+        self.add_option_row(options_frame, "Effort:", list(EFFORT_PRESETS), self.effort_var, "effort")
+        self.add_option_row(options_frame, "WebP Mode:", WEBP_MODES, self.webp_mode_var, "webp_mode")
+        self.add_option_row(options_frame, "Alpha Quality:", ALPHA_QUALITY_MODES, self.alpha_quality_var, "alpha_quality")
+        
+        self.add_section_title(options_frame, "Auto Quality")
+        self.add_option_row(options_frame, "SSIM Target:", list(AUTO_QUALITY_TARGETS), self.ssim_target_var, "quality")
+        
+        self.add_section_title(options_frame, "Output Naming")
+        template_row = ctk.CTkFrame(options_frame, fg_color="transparent")
+        template_row.pack(fill="x", padx=15, pady=5)
+        
+        template_label = ctk.CTkLabel(
+            template_row,
+            text="Name Template:",
+            text_color=COLORS['text_primary']
+        )
+        template_label.pack(side="left")
+        
+        template_info_btn = ctk.CTkButton(
+            template_row,
+            text="i",
+            width=25,
+            height=25,
+            corner_radius=12,
+            command=lambda: self.show_info("naming"),
+            fg_color=COLORS['text_secondary'],
+            hover_color=COLORS['accent']
+        )
+        template_info_btn.pack(side="right")
+        
+        template_entry = ctk.CTkEntry(
+            template_row,
+            textvariable=self.name_template_var,
+            width=200
+        )
+        template_entry.pack(side="right", padx=(0, 10))
+        self.add_option_row(options_frame, "On Collision:", COLLISION_POLICIES, self.collision_var, "naming")
+        
+        mirror_tree_checkbox = ctk.CTkCheckBox(
+            options_frame,
+            text="Recreate source folders in the output folder",
+            variable=self.mirror_tree_var,
+            text_color=COLORS['text_primary']
+        )
+        mirror_tree_checkbox.pack(anchor="w", padx=15, pady=5)
+        
+        self.add_section_title(options_frame, "Animation")
+        self.add_option_row(options_frame, "Frames:", FRAME_MODES, self.frames_var, "frames")
+        
+        # Metadata settings
+        self.add_section_title(options_frame, "Metadata")
+        self.add_option_row(options_frame, "Metadata:", METADATA_POLICIES, self.metadata_policy_var, "metadata")
+        
+        auto_rotate_checkbox = ctk.CTkCheckBox(
+            options_frame,
+            text="Auto-rotate using EXIF orientation",
+            variable=self.auto_rotate_var,
+            text_color=COLORS['text_primary']
+        )
+        auto_rotate_checkbox.pack(anchor="w", padx=15, pady=5)
+        
+        # Performance settings
+        self.add_section_title(options_frame, "Performance")
+        self.add_option_row(options_frame, "Workers:", WORKER_CHOICES, self.workers_var, "workers")
+        self.add_option_row(options_frame, "Pipeline:", PIPELINE_MODES, self.pipeline_var, "workers")
+        self.add_option_row(options_frame, "Input I/O:", INPUT_IO_MODES, self.input_io_var, "input_io")
+        self.add_option_row(options_frame, "Read-Ahead:", READ_AHEAD_CHOICES, self.read_ahead_var, "input_io")
+        
+        archive_output_checkbox = ctk.CTkCheckBox(
+            options_frame,
+            text="Write outputs into a ZIP archive",
+            variable=self.archive_output_var,
+            text_color=COLORS['text_primary']
+        )
+        archive_output_checkbox.pack(anchor="w", padx=15, pady=5)
+        
+        profile_checkbox = ctk.CTkCheckBox(
+            options_frame,
+            text=f"Profile batches (saved to {PROFILE_FOLDER})",
+            variable=self.profile_var,
+            text_color=COLORS['text_primary']
+        )
+        profile_checkbox.pack(anchor="w", padx=15, pady=5)
+        
+        # Close button
+        close_btn = ctk.CTkButton(
+            main_frame,
+            text="Close",
+            command=settings_window.destroy,
+            height=35,
+            corner_radius=8,
+            fg_color=COLORS['accent'],
+            hover_color="#0056CC"
+        )
+        close_btn.pack(side="right")
+    
+    def show_info(self, info_type):
+        """Show information tooltips"""
+        info_texts = {
+            "quality": """Quality Settings:
+
+• Low (30%): Smallest file size, noticeable quality loss
+• Medium (60%): Good balance of size and quality
+• High (80%): Excellent quality with good compression
+• Maximum (95%): Best quality, minimal compression
+• Auto (SSIM): Per image, the lowest quality whose result still
+  matches the original to the SSIM target (Advanced Settings).
+  Flat graphics compress harder, detailed photos keep more.
+  Results are cached, so repeat runs skip the search.
+
+💡 Tip: High (80%) is recommended for the best balance 
+between excellent compression and good quality.""",
+            
+            "format": """Output Formats:
+
+• JPEG: Best for photos, good compression, no transparency
+• WebP: Modern format, excellent compression, supports transparency
+• PNG: Lossless compression, supports transparency, larger files
+• AVIF: Newest format, smallest files, slower to encode (when available)
+
+💡 Tip: WebP offers the best compression while maintaining 
+excellent quality for most use cases.""",
+            
+            "engine": """Compression Engines:
+
+• Pillow: Fast, reliable, good for general use
+• Imageio: Advanced options, better for specific formats
+• OpenCV: Resizes with OpenCV's SIMD-accelerated kernels, often
+  several times faster on large downscales (shown when
+  opencv-python-headless is installed)
+
+OpenCV shrinks every image with its area filter, whatever the
+resize filter is set to; the filter only applies when enlarging.
+Images OpenCV can't resize as is (transparency, palettes, Nearest)
+are resized with Pillow. Pillow itself uses SIMD kernels when the
+Pillow-SIMD build is installed.
+
+💡 Tip: Pillow is recommended for most users as it provides 
+excellent compression with good performance. Run
+"python hikari_image_compressor.py benchmark engines <images>"
+to check OpenCV's speed and quality on your own images.""",
+            
+            "larger": """If Larger:
+
+Already-optimized images can grow when re-encoded. Every image is
+encoded in memory first and compared with the original file:
+
+• Keep Original: Skip the file, nothing is written
+• Try Other Formats: Save in the smallest other format that is smaller
+• Lower Quality: Step the quality down until the file is smaller
+• Save Anyway: Always save, even if the result is larger
+
+💡 Tip: When no option produces a smaller file, the original is kept.""",
+            
+            "png_mode": """PNG Mode:
+
+PNG quality follows the Quality setting through palette reduction:
+• Low: 64 colors • Medium: 128 colors • High: 256 colors
+• Maximum: Full color (lossless)
+
+• Fast: Quick palette and light zlib compression for bulk jobs
+• Standard: Optimized zlib compression
+• Exhaustive: Tries several zlib strategies and keeps the smallest
+
+💡 Tip: Dithering hides banding in gradients at a small size cost.""",
+            
+            "effort": """Encoder Effort (WebP / AVIF):
+
+• Fast: Quickest encode, slightly larger files - good for bulk jobs
+• Balanced: Default speed and size
+• Smallest: Slowest encode, smallest files - good for hero images
+
+💡 Tip: Run "python hikari_image_compressor.py benchmark effort <images>"
+to measure the throughput of each preset on your own images.""",
+            
+            "webp_mode": """WebP Mode:
+
+• Lossy: Regular WebP compression driven by Quality
+• Near-Lossless: Drops a few color bits, then compresses losslessly
+• Lossless: Exact pixels, best for graphics and screenshots
+
+💡 Tip: Near-Lossless is great for graphics with gradients.""",
+            
+            "alpha_quality": """Alpha Quality:
+
+How lossy WebP stores transparency:
+
+• Lossless: Transparency is kept exact
+• Match Quality: Transparency is compressed like the colors,
+  for smaller files with slightly softer edges
+
+💡 Tip: Keep Lossless for logos and cut-outs with crisp edges.""",
+            
+            "metadata": """Metadata:
+
+• Strip All: Remove EXIF, color profiles, XMP and comments
+  (smallest files)
+• Keep ICC Only: Keep the color profile so colors stay accurate
+• Keep All: Keep EXIF (camera, date, GPS), color profile, XMP and
+  comments
+
+Animations and multi-page TIFFs follow the same choice.
+
+Auto-rotate turns phone photos upright using their EXIF orientation,
+so they never come out sideways.
+
+💡 Tip: Keep ICC Only is recommended for sharing photos online.""",
+            
+            "naming": """Output Naming:
+
+The name template sets each output file name (the extension is
+added for the chosen format):
+• {name}: Source file name
+• {dir}: Folder holding the source file
+• {q}: Quality suffix, e.g. -High
+• {scale}: Resize suffix, e.g. -50pct (empty when not resizing)
+• {hash}: 8 characters unique to the source path
+Use / to sort outputs into subfolders, e.g. {dir}/{name}{q}
+
+Names are checked before anything is compressed. When two images
+would get the same name (or an output would replace a source):
+• Number Duplicates: Later images get -2, -3, ...
+• Stop: Nothing is compressed until the names are fixed
+
+💡 Tip: Use 📋 Plan to see every output name before compressing.""",
+            
+            "frames": """Animation:
+
+• All Frames: Animated GIF/WebP/PNG and multi-page TIFF files keep
+  every frame. WebP and PNG outputs stay animated; JPEG can't hold
+  frames, so animations are saved as GIF and pages as TIFF
+• First Frame: Compress only the first frame, like a still image
+
+Frames are decoded a few at a time and resized on several threads,
+then encoded together. Animations too large to hold in memory keep
+only their first frame; the report notes which.
+
+💡 Tip: Convert animated GIFs to WebP for much smaller files.""",
+            
+            "workers": """Workers:
+
+Images are compressed in parallel worker processes. The largest,
+most expensive images are started first so a few huge panoramas
+at the end of a batch don't leave the other workers idle.
+
+• Auto: One worker per CPU core
+• 1: Compress one image at a time
+
+Pipeline:
+• Combined: Each worker decodes and encodes its own images
+• Split Decode/Encode: Half the workers decode and resize, the
+  other half encode. Decoded pixels are handed over in shared
+  memory, never copied between processes
+
+💡 Tip: Use fewer workers to keep the computer responsive
+during very large batches.""",
+            
+            "input_io": """Input I/O:
+
+• Read Ahead: Each file is read in one large read while the next
+  files are fetched in the background (best for network drives)
+• Memory-Mapped: Files are mapped into memory and read on demand
+• Direct: Let Pillow read the file in small pieces
+
+Read-Ahead sets how many upcoming files are fetched in advance.
+Images inside ZIP/TAR archives are always read ahead, streamed
+straight out of the archive without extracting it.
+
+With "Write outputs into a ZIP archive" the compressed images go
+into compressed-<date>-<time>.zip in the output folder instead.
+
+💡 Tip: Use Read Ahead with 8 or 16 files for NFS or SMB shares.""",
+            
+            "resize": """Resize Options:
+
+Scale images by percentage while maintaining aspect ratio:
+• 50% = Half the original size
+• 25% = Quarter the original size  
+• 75% = Three-quarters the original size
+• 100% = Original size (no change)
+
+Or cap every image, whatever its size (never upscales):
+• Long Edge: Longest side at most this many pixels (e.g. 1920)
+• Fit Box: Fit inside a width x height box (e.g. 1920x1080)
+• Max Megapixels: At most this many megapixels (e.g. 12)
+
+💡 Tip: Use 50% for web images, 25% for thumbnails, or 75% for 
+moderate size reduction while keeping good quality.""",
+            
+            "filter": """Resampling Filter:
+
+• Fast: Shrinks by whole factors first, then a quick bilinear pass
+• Nearest: Fastest, blocky - only for pixel art
+• Box: Fast and clean for large reductions
+• Bilinear: Fast, slightly soft
+• Lanczos: Sharpest, slowest
+
+💡 Tip: Fast is ideal for thumbnails and aggressive downscales. Run
+"python hikari_image_compressor.py benchmark resize <images>" to
+compare speed and quality (SSIM) on your own images."""
+        }
+        
+        messagebox.showinfo("Information", info_texts.get(info_type, "No information available"))
+    
+    def show_about(self):
+        """Show about dialog"""
+        about_text = """Hikari Image Compressor v1.1.0 stable
+
+A modern, user-friendly image compression tool with an Apple-style interface.
+
+Created by: Gary19gts
+License: GNU Affero General Public License v3.0
+GitHub: https://github.com/Gary19gts/hikari-image-compressor
+
+Features:
+• Multiple format support (JPEG, WebP, PNG)
+• Quality presets for easy compression
+• Batch processing capabilities
+• Real-time compression estimates
+• Modern, intuitive interface
+
+This software is free and open source. You can redistribute it and/or modify it under the terms of the AGPL v3 license."""
+        
+        messagebox.showinfo("About Hikari Image Compressor", about_text)
+    
+    def show_credits(self):
+        """Show credits and acknowledgments dialog"""
+        credits_window = ctk.CTkToplevel(self.root)
+        credits_window.title("Credits & Acknowledgments")
+        credits_window.geometry("600x500")
+        credits_window.resizable(False, False)
+        credits_window.transient(self.root)
+        credits_window.grab_set()
+        
+        # Center the window
+        credits_window.update_idletasks()
+        x = (credits_window.winfo_screenwidth() // 2) - (600 // 2)
+        y = (credits_window.winfo_screenheight() // 2) - (500 // 2)
+        credits_window.geometry(f"600x500+{x}+{y}")
+        
+        # Main frame
+        main_frame = ctk.CTkFrame(credits_window, fg_color="transparent")
+        main_frame.pack(fill="both", expand=True, padx=20, pady=20)
+        
+        # Title
+        title_label = ctk.CTkLabel(
+            main_frame,
+            text="Credits & Acknowledgments",
+            font=ctk.CTkFont(size=20, weight="bold")
+        )
+        title_label.pack(pady=(0, 20))
+        
+        # Scrollable frame for credits
+        credits_frame = ctk.CTkScrollableFrame(main_frame)
+        credits_frame.pack(fill="both", expand=True, pady=(0, 20))
+        
+        # Credits content
+        credits_content = """
+HIKARI IMAGE COMPRESSOR
+Created by Gary19gts
+
+OPEN SOURCE LIBRARIES & ACKNOWLEDGMENTS
+
+This software is built upon the excellent work of many open source developers. We gratefully acknowledge the following libraries and their contributors:
+
+🐍 PYTHON
+• License: Python Software Foundation License
+• The foundation that makes this application possible
+• Website: https://python.org
+
+🖼️ PILLOW (PIL Fork)
+• License: HPND License
+• Powerful image processing library
+• Maintainers: Alex Clark and contributors
+• Website: https://pillow.readthedocs.io
+• Used for: Core image processing and compression
+
+🎨 CUSTOMTKINTER
+• License: MIT License
+• Modern and customizable tkinter widgets
+• Author: Tom Schimansky
+• Website: https://github.com/TomSchimansky/CustomTkinter
+• Used for: Modern UI components and styling
+
+📸 IMAGEIO
+• License: BSD 2-Clause License
+• Versatile image I/O library
+• Maintainers: Almar Klein and contributors
+• Website: https://imageio.readthedocs.io
+• Used for: Advanced image format support
+
+🖥️ TKINTER
+• License: Python Software Foundation License
+• Standard GUI toolkit for Python
+• Part of Python standard library
+• Used for: Base GUI framework
+
+SPECIAL THANKS
+
+• The Python Software Foundation for maintaining Python
+• All open source contributors who make projects like this possible
+• The image processing community for continuous innovation
+• Users who provide feedback and help improve the software
+
+LICENSE INFORMATION
+
+Hikari Image Compressor is licensed under the GNU Affero General Public License v3.0 (AGPL-3.0). This ensures that the software remains free and open source, and that any modifications or network use must also be made available under the same license.
+
+For more information about the AGPL-3.0 license, visit:
+https://www.gnu.org/licenses/agpl-3.0.html
+
+CONTRIBUTING
+
+This project is open source and welcomes contributions! Visit our GitHub repository to:
+• Report bugs or request features
+• Submit pull requests
+• View the source code
+• Read the full documentation
+
+GitHub: https://github.com/Gary19gts/hikari-image-compressor
+        """
+        
+        credits_text = ctk.CTkLabel(
+            credits_frame,
+            text=credits_content.strip(),
+            font=ctk.CTkFont(size=12),
+            justify="left",
+            anchor="nw"
+        )
+        credits_text.pack(fill="both", expand=True, padx=10, pady=10)
+        
+        # Buttons frame
+        buttons_frame = ctk.CTkFrame(main_frame, fg_color="transparent")
+        buttons_frame.pack(fill="x")
+        
+        # GitHub button
+        github_btn = ctk.CTkButton(
+            buttons_frame,
+            text="View on GitHub",
+            command=lambda: webbrowser.open("https://github.com/Gary19gts/hikari-image-compressor"),
+            height=35,
+            corner_radius=8,
+            fg_color=COLORS['accent'],
+            hover_color="#0056CC"
+        )
+        github_btn.pack(side="left", padx=(0, 10))
+        
+        # License button
+        license_btn = ctk.CTkButton(
+            buttons_frame,
+            text="View License",
+            command=lambda: webbrowser.open("https://www.gnu.org/licenses/agpl-3.0.html"),
+            height=35,
+            corner_radius=8,
+            fg_color=COLORS['text_secondary'],
+            hover_color=COLORS['accent']
+        )
+        license_btn.pack(side="left", padx=(0, 10))
+        
+        # Close button
+        close_btn = ctk.CTkButton(
+            buttons_frame,
+            text="Close",
+            command=credits_window.destroy,
+            height=35,
+            corner_radius=8,
+            fg_color=COLORS['error'],
+            hover_color="#CC2E24"
+        )
+        close_btn.pack(side="right")
+    
+    def get_quality_value(self):
+        """Convert quality string to numeric value (None for auto quality)"""
+        if self.quality_var.get() == AUTO_QUALITY_LABEL:
+            return None
+        return QUALITY_PRESETS.get(self.quality_var.get(), 80)
+    
+    def get_quality_suffix(self):
+        """Get quality suffix for filename"""
+        quality = self.quality_var.get()
+        if quality in QUALITY_PRESETS or quality == AUTO_QUALITY_LABEL:
+            return f"-{quality.split()[0]}"
+        return "-High"
+    
+    def get_resize_suffix(self):
+        """Get resize suffix for filename; empty unless a resize is applied"""
+        resize = self.get_resize_setting()
+        if resize is None:
+            return ""
+        return RESIZE_MODES[resize[0]][2].format(self.get_resize_value_var().get().strip().replace(" ", ""))
+    
+    def get_encoder_options(self):
+        """Collect encoder settings from the advanced settings"""
+        return {
+            'png_mode': self.png_mode_var.get(),
+            'png_dither': self.png_dither_var.get(),
+            'effort': self.effort_var.get(),
+            'webp_mode': self.webp_mode_var.get(),
+            'alpha_quality': self.alpha_quality_var.get()
+        }
+    
+    def get_compression_settings(self):
+        """Snapshot every setting a worker process needs, on the UI thread"""
+        return {
+            'output_format': self.format_var.get().lower(),
+            'quality': self.get_quality_value(),
+            'ssim_target': AUTO_QUALITY_TARGETS.get(self.ssim_target_var.get(), 0.95),
+            'larger_policy': self.larger_policy_var.get(),
+            'encoder_options': self.get_encoder_options(),
+            'metadata_policy': self.metadata_policy_var.get(),
+            'auto_rotate': self.auto_rotate_var.get(),
+            'resize': self.get_resize_setting(),
+            'resize_filter': self.resize_filter_var.get(),
+            'engine': self.engine_var.get(),
+            'quality_suffix': self.get_quality_suffix(),
+            'resize_suffix': self.get_resize_suffix(),
+            'workers': self.workers_var.get(),
+            'input_io': self.input_io_var.get(),
+            'read_ahead': self.read_ahead_var.get(),
+            'chunk_small_images': True,
+            'pipeline': self.pipeline_var.get(),
+            'frames': self.frames_var.get(),
+            'name_template': self.name_template_var.get().strip() or DEFAULT_NAME_TEMPLATE,
+            'mirror_tree': self.mirror_tree_var.get(),
+            'on_collision': self.collision_var.get(),
+            'archive_output': None,
+            'archive_append': False,
+            'profile': self.profile_var.get()
+        }
+    
+    def start_compression(self):
+        """Start the compression process"""
+        if not self.loaded_images:
+            messagebox.showwarning("No Images", "Please load images first.")
+            return
+        
+        if not self.check_resize_entry():
+            return
+        output_dir = self.output_folder.get()
+        if not output_dir:
+            output_dir = os.path.dirname(self.loaded_images[0])
+        
+        # Create output directory if it doesn't exist
+        os.makedirs(output_dir, exist_ok=True)
+        
+        # Start compression in a separate thread
+        settings = self.get_compression_settings()
+        try:
+            _, collisions = plan_output_stems(self.loaded_images, output_dir, settings)
+        except ValueError as e:
+            messagebox.showerror("Invalid Name Template", str(e))
+            return
+        if collisions and settings['on_collision'] == "Stop":
+            messagebox.showerror("Output Name Collisions", describe_collisions(collisions))
+            return
+        if self.archive_output_var.get():
+            settings['archive_output'] = os.path.join(output_dir, time.strftime("compressed-%Y%m%d-%H%M%S.zip"))
+        thread = threading.Thread(target=self.compress_images, args=(output_dir, settings))
+        thread.daemon = True
+        thread.start()
+    
+    def make_progress_callback(self):
+        """Progress callback for run_batch that posts to the UI thread"""
+        last_percent = -1
+        
+        def update_progress(completed, total):
+            # Thousands of tiny files would flood the event loop, so only
+            # whole-percent changes are posted
+            nonlocal last_percent
+            percent = completed * 100 // total
+            if percent != last_percent:
+                last_percent = percent
+                self.root.after(0, lambda p=completed / total: self.progress.set(p))
+        return update_progress
+    
+    def compress_images(self, output_dir, settings):
+        """Compress images in background thread"""
+        # Nothing from an earlier run may show up if this one fails
+        self.last_report_path = None
+        self.last_save_errors = []
+        self.last_run_id = None
+        try:
+            self.last_report = run_batch(list(self.loaded_images), output_dir, settings, self.make_progress_callback())
+        except Exception as e:
+            self.root.after(0, lambda error=e: self.compression_failed(error))
+            return
+        try:
+            self.last_report_path = self.last_report.write(output_dir)
+        except OSError as e:
+            self.last_save_errors.append(f"The report could not be saved: {e}")
+        try:
+            self.last_run_id = save_history(self.last_report, settings, output_dir)
+        except OSError as e:
+            self.last_save_errors.append(f"The run could not be recorded for Retry Failed: {e}")
+        self.last_profile_dir = os.path.join(output_dir, PROFILE_FOLDER) if settings['profile'] else None
+        
+        # Show completion message
+        self.root.after(0, self.compression_complete)
+    
+    def retry_failed_images(self, report_window=None):
+        """Compress the failed files of the last run again, in the background"""
+        if report_window:
+            report_window.destroy()
+        
+        def retry():
+            try:
+                report, run_id = retry_failed(self.last_run_id, self.make_progress_callback())
+            except Exception as e:
+                self.root.after(0, lambda error=e: self.compression_failed(error))
+                return
+            if report is None:
+                self.root.after(0, lambda: messagebox.showinfo("Nothing to Retry", "The last run has no failed files."))
+                return
+            self.last_report = report
+            self.last_run_id = run_id
+            self.last_report_path = os.path.join(load_history(run_id)['output_dir'], f"{REPORT_NAME}.json")
+            self.last_save_errors = []
+            self.last_profile_dir = None
+            self.root.after(0, self.compression_complete)
+        
+        thread = threading.Thread(target=retry)
+        thread.daemon = True
+        thread.start()
+    
+    def compression_complete(self):
+        """Handle compression completion"""
+        self.progress.set(1.0)
+        
+        # Summarize the per-file outcome chosen by the skip-if-larger policy
+        outcome_labels = {
+            "compressed": "compressed",
+            "format_fallback": "saved in another format",
+            "quality_reduced": "saved at lower quality",
+            "kept_original": "kept original (output was larger)",
+            "failed": "failed"
+        }
+        counts = self.last_report.counts()
+        summary = "\n".join(f"• {counts[key]} {label}" for key, label in outcome_labels.items() if key in counts)
+        if self.last_report_path:
+            summary += f"\n\nReport saved to {self.last_report_path}"
+        for error in self.last_save_errors:
+            summary += f"\n\n{error}"
+        if self.last_profile_dir:
+            summary += f"\n\nProfile saved to {self.last_profile_dir}"
+        
+        if counts.get("failed"):
+            if messagebox.askyesno("Completed with Errors", f"Some images could not be compressed.\n\n{summary}\n\nOpen the report?"):
+                self.show_report()
+        else:
+            messagebox.showinfo("Complete", f"Image compression completed successfully!\n\n{summary}".strip())
+        self.progress.set(0)
+    
+    def compression_failed(self, error):
+        """Handle a batch that stopped before finishing"""
+        self.progress.set(0)
+        messagebox.showerror("Compression Failed", f"The batch stopped with an error:\n\n{type(error).__name__}: {error}")
+    
+    def show_report(self):
+        """Show the last batch report as a table sortable by any column"""
+        if not self.last_report:
+            # Fall back to the latest recorded run, e.g. from an earlier session
+            entry = load_history()
+            if entry is None:
+                messagebox.showinfo("No Report", "Compress some images first.")
+                return
+            self.last_report = BatchReport.from_rows(entry['rows'])
+            self.last_report.wall_seconds = entry.get('wall_seconds')
+            self.last_run_id = entry['id']
+            self.last_report_path = os.path.join(entry['output_dir'], f"{REPORT_NAME}.json")
+        
+        report_window = ctk.CTkToplevel(self.root)
+        report_window.title("Batch Report")
+        report_window.geometry("1000x480")
+        report_window.transient(self.root)
+        
+        main_frame = ctk.CTkFrame(report_window, fg_color="transparent")
+        main_frame.pack(fill="both", expand=True, padx=20, pady=20)
+        
+        totals = self.last_report.totals()
+        if not totals['ratio'] or totals['ratio'] == 1:
+            ratio = "nothing saved"
+        elif totals['ratio'] < 1:
+            ratio = f"{(1 - totals['ratio']) * 100:.1f}% smaller"
+        else:
+            ratio = f"{(totals['ratio'] - 1) * 100:.1f}% larger"
+        # Per-file times add up across workers, so they are shown as work
+        elapsed = f"{totals['seconds']:.1f} s of work"
+        if totals['wall_seconds'] is not None:
+            elapsed = f"{totals['wall_seconds']:.1f} s ({elapsed})"
+        totals_label = ctk.CTkLabel(
+            main_frame,
+            text=f"{totals['files']} files • {self.format_file_size(totals['input_bytes'])} → "
+                 f"{self.format_file_size(totals['output_bytes'])} ({ratio}) • {elapsed}",
+            font=ctk.CTkFont(size=13, weight="bold"),
+            text_color=COLORS['text_primary']
+        )
+        totals_label.pack(anchor="w", pady=(0, 10))
+        
+        columns = {
+            'path': ("File", 220), 'status': ("Status", 110), 'input_bytes': ("Input", 80),
+            'output_bytes': ("Output", 80), 'ratio': ("Ratio", 60), 'seconds': ("Time (s)", 70),
+            'error_type': ("Error", 140), 'note': ("Note", 180)
+        }
+        table_frame = ctk.CTkFrame(main_frame, fg_color="transparent")
+        table_frame.pack(fill="both", expand=True, pady=(0, 15))
+        table = ttk.Treeview(table_frame, columns=list(columns), show="headings")
+        scrollbar = ttk.Scrollbar(table_frame, orient="vertical", command=table.yview)
+        table.configure(yscrollcommand=scrollbar.set)
+        table.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+        
+        sort_state = {'column': None, 'reverse': False}
+        
+        def fill(sort_by=None):
+            # Clicking the same heading again reverses the order
+            if sort_by is not None:
+                same = sort_state['column'] == sort_by
+                sort_state.update(column=sort_by, reverse=not sort_state['reverse'] if same else False)
+            table.delete(*table.get_children())
+            for row in self.last_report.rows(sort_state['column'], sort_state['reverse']):
+                table.insert("", "end", values=(
+                    os.path.basename(row['path']), row['status'],
+                    self.format_file_size(row['input_bytes']), self.format_file_size(row['output_bytes']),
+                    f"{row['ratio']:.2f}" if row['ratio'] is not None else "",
+                    f"{row['seconds']:.2f}", row['error_type'] or "", row['note'] or ""
+                ))
+        
+        for column, (heading, width) in columns.items():
+            table.heading(column, text=heading, command=lambda column=column: fill(column))
+            table.column(column, width=width, anchor="w" if column in ('path', 'status', 'error_type', 'note') else "e")
+        fill()
+        
+        if self.last_report_path:
+            path_label = ctk.CTkLabel(
+                main_frame,
+                text=f"Saved as {self.last_report_path} (and .csv)",
+                font=ctk.CTkFont(size=11),
+                text_color=COLORS['text_secondary']
+            )
+            path_label.pack(side="left")
+        
+        close_btn = ctk.CTkButton(
+            main_frame,
+            text="Close",
+            command=report_window.destroy,
+            height=35,
+            corner_radius=8,
+            fg_color=COLORS['accent'],
+            hover_color="#0056CC"
+        )
+        close_btn.pack(side="right")
+        
+        failed_count = len(self.last_report.failed_paths())
+        if failed_count and self.last_run_id:
+            retry_btn = ctk.CTkButton(
+                main_frame,
+                text=f"↻ Retry Failed ({failed_count})",
+                command=lambda: self.retry_failed_images(report_window),
+                height=35,
+                corner_radius=8,
+                fg_color=COLORS['warning'],
+                hover_color="#CC7700"
+            )
+            retry_btn.pack(side="right", padx=(0, 10))
+    
+    def show_plan(self):
+        """Dry run: show every output name and the predicted cost"""
+        if not self.loaded_images:
+            messagebox.showwarning("No Images", "Please load images first.")
+            return
+        if not self.check_resize_entry():
+            return
+        output_dir = self.output_folder.get() or os.path.dirname(self.loaded_images[0])
+        try:
+            rows, collisions = plan_batch(self.loaded_images, output_dir, self.get_compression_settings())
+        except ValueError as e:
+            messagebox.showerror("Invalid Name Template", str(e))
+            return
+        
+        plan_window = ctk.CTkToplevel(self.root)
+        plan_window.title("Batch Plan")
+        plan_window.geometry("820x480")
+        plan_window.transient(self.root)
+        
+        main_frame = ctk.CTkFrame(plan_window, fg_color="transparent")
+        main_frame.pack(fill="both", expand=True, padx=20, pady=20)
+        
+        summary = f"{len(rows)} files • predicted cost {sum(row['cost'] for row in rows):.1f}"
+        if collisions:
+            action = "stop the batch" if self.collision_var.get() == "Stop" else "be numbered"
+            summary += f" • {len(collisions)} name collisions (will {action})"
+        summary_label = ctk.CTkLabel(
+            main_frame,
+            text=summary,
+            font=ctk.CTkFont(size=13, weight="bold"),
+            text_color=COLORS['error'] if collisions else COLORS['text_primary']
+        )
+        summary_label.pack(anchor="w", pady=(0, 10))
+        
+        columns = {'path': ("File", 200), 'output_path': ("Output", 360), 'size': ("Size", 100), 'cost': ("Cost", 70)}
+        table_frame = ctk.CTkFrame(main_frame, fg_color="transparent")
+        table_frame.pack(fill="both", expand=True, pady=(0, 15))
+        table = ttk.Treeview(table_frame, columns=list(columns), show="headings")
+        scrollbar = ttk.Scrollbar(table_frame, orient="vertical", command=table.yview)
+        table.configure(yscrollcommand=scrollbar.set)
+        table.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+        for column, (heading, width) in columns.items():
+            table.heading(column, text=heading)
+            table.column(column, width=width, anchor="e" if column in ('size', 'cost') else "w")
+        
+        colliding = {image_path for _, image_paths in collisions for image_path in image_paths}
+        table.tag_configure("collision", foreground=COLORS['error'])
+        for row in rows:
+            table.insert("", "end", values=(
+                os.path.basename(row['path']), os.path.relpath(row['output_path'], output_dir),
+                f"{row['size'][0]}×{row['size'][1]}" if row['size'] else "", f"{row['cost']:.2f}"
+            ), tags=("collision",) if row['path'] in colliding else ())
+        
+        close_btn = ctk.CTkButton(
+            main_frame,
+            text="Close",
+            command=plan_window.destroy,
+            height=35,
+            corner_radius=8,
+            fg_color=COLORS['accent'],
+            hover_color="#0056CC"
+        )
+        close_btn.pack(side="right")
+    
+    def run(self):
+        """Start the application"""
+        self.root.mainloop()
+
+def benchmark_effort_presets(image_paths, output_format="webp", quality=80):
+    """Measure encode throughput and output size of each effort preset"""
+    images = []
+    for image_path in image_paths:
+        with Image.open(image_path) as img:
+            img.load()
+            images.append(img.copy())
+    total_pixels = sum(img.width * img.height for img in images)
+    
+    rows = []
+    for preset in EFFORT_PRESETS:
+        options = {'effort': preset}
+        start = time.perf_counter()
+        total_bytes = sum(len(encode_image(img, output_format, quality, options)) for img in images)
+        elapsed = time.perf_counter() - start
+        rows.append({
+            'preset': preset,
+            'seconds': elapsed,
+            'images_per_second': len(images) / elapsed if elapsed else 0.0,
+            'megapixels_per_second': total_pixels / 1e6 / elapsed if elapsed else 0.0,
+            'total_bytes': total_bytes
+        })
+    return rows
+
+def benchmark_resize_filters(image_paths, scale=25):
+    """Measure resize time and SSIM (after scaling back up) of each filter"""
+    rows = []
+    for filter_name in RESAMPLING_FILTERS:
+        elapsed = 0.0
+        scores = []
+        for image_path in image_paths:
+            with Image.open(image_path) as img:
+                original = img.convert('RGB')
+                target_size = (max(1, img.width * scale // 100), max(1, img.height * scale // 100))
+                
+                # Time decode and resize together so the JPEG draft counts
+                start = time.perf_counter()
+                with Image.open(image_path) as source:
+                    resized = resize_image(prepare_draft(source, target_size, filter_name), target_size, filter_name)
+                    resized.load()
+                elapsed += time.perf_counter() - start
+                
+                restored = resized.convert('RGB').resize(original.size, Image.Resampling.BICUBIC)
+                scores.append(compute_ssim(original, restored))
+        rows.append({
+            'filter': filter_name,
+            'seconds': elapsed,
+            'images_per_second': len(image_paths) / elapsed if elapsed else 0.0,
+            'mean_ssim': sum(scores) / len(scores)
+        })
+    return rows
+
+def benchmark_resize_engines(image_paths, scale=25, filter_name="Lanczos", runs=3):
+    """Compare each installed resize engine with Pillow: time, output
+    dimensions and SSIM (after scaling back up) on the same decoded images"""
+    images = []
+    for image_path in image_paths:
+        with Image.open(image_path) as img:
+            images.append(img.convert('L' if img.mode in ('L', 'LA', 'I;16', 'I') else 'RGB'))
+    
+    rows = []
+    for engine in get_engines():
+        if engine != "Pillow" and engine not in RESIZE_BACKENDS:
+            # Resizes with Pillow; nothing to compare
+            continue
+        best = None
+        outputs = []
+        for _ in range(runs):
+            outputs = []
+            start = time.perf_counter()
+            for img in images:
+                target_size = (max(1, img.width * scale // 100), max(1, img.height * scale // 100))
+                outputs.append(resize_image(img, target_size, filter_name, engine))
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        
+        scores = [
+            compute_ssim(img, resized.resize(img.size, Image.Resampling.BICUBIC))
+            for img, resized in zip(images, outputs)
+        ]
+        rows.append({
+            'engine': engine,
+            'seconds': best,
+            'images_per_second': len(images) / best if best else 0.0,
+            'mean_ssim': sum(scores) / len(scores),
+            'sizes': [resized.size for resized in outputs]
+        })
+    
+    # Every engine must produce Pillow's dimensions and comparable quality
+    baseline = next(row for row in rows if row['engine'] == "Pillow")
+    baseline_sizes, baseline_ssim = baseline['sizes'], baseline['mean_ssim']
+    for row in rows:
+        row['passed'] = row.pop('sizes') == baseline_sizes and row['mean_ssim'] >= baseline_ssim - ENGINE_SSIM_TOLERANCE
+    return rows
+
+def benchmark_small_images(image_paths, output_format="jpeg", workers="Auto", runs=3):
+    """Compare one job per small image against chunked jobs"""
+    import tempfile
+    with tempfile.TemporaryDirectory() as output_dir:
+        rows = []
+        for label, chunked in (("one job per image", False), ("chunked", True)):
+            settings = default_settings(output_format=output_format, workers=workers, chunk_small_images=chunked)
+            best = None
+            for _ in range(runs):
+                start = time.perf_counter()
+                run_batch(image_paths, output_dir, settings)
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            rows.append({
+                'mode': label,
+                'seconds': best,
+                'images_per_second': len(image_paths) / best,
+                'ms_per_image': best * 1000 / len(image_paths)
+            })
+    return rows
+
+def make_sample_icons(folder, count=500, size=64):
+    """Write synthetic RGBA icons for the small image benchmark"""
+    paths = []
+    for number in range(count):
+        icon = Image.new('RGBA', (size, size), (0, 0, 0, 0))
+        draw = ImageDraw.Draw(icon)
+        shade = number * 37 % 256
+        draw.ellipse([size // 8, size // 8, size - size // 8, size - size // 8], fill=(shade, 255 - shade, 128, 255))
+        draw.rectangle([size // 3, size // 3, size // 2, size // 2], fill=(255, 255, 255, 160))
+        path = os.path.join(folder, f"icon{number:04d}.png")
+        icon.save(path)
+        paths.append(path)
+    return paths
+
+# Runs in a fresh interpreter so imports are measured cold
+STARTUP_PROBE = """
+import time
+start = time.perf_counter()
+import hikari_image_compressor as hikari
+imported = time.perf_counter()
+if {gui}:
+    app = hikari.ImageCompressor()
+    app.root.update()
+    app.root.destroy()
+print(imported - start, time.perf_counter() - start)
+"""
+
+def benchmark_startup(runs=5, gui=True):
+    """Measure cold import time and time until the window has been drawn"""
+    module_dir = os.path.dirname(os.path.abspath(__file__))
+    rows = []
+    for run in range(1, runs + 1):
+        output = subprocess.run(
+            [sys.executable, "-c", STARTUP_PROBE.format(gui=gui)],
+            cwd=module_dir, capture_output=True, text=True, check=True
+        ).stdout
+        import_seconds, ready_seconds = (float(value) for value in output.split()[-2:])
+        rows.append({'run': run, 'import_seconds': import_seconds, 'ready_seconds': ready_seconds})
+    return rows
+
+def print_benchmark(title, rows):
+    """Print benchmark rows as an aligned table"""
+    print(title)
+    columns = list(rows[0])
+    print("  ".join(f"{column:>22}" for column in columns))
+    for row in rows:
+        cells = [f"{value:>22.3f}" if isinstance(value, float) else f"{value!s:>22}" for value in row.values()]
+        print("  ".join(cells))
+
+def run_benchmark(args):
+    """Run the benchmark selected on the command line"""
+    if args.name == "effort":
+        output_format = args.format.lower()
+        rows = benchmark_effort_presets(args.images, output_format, args.quality)
+        print_benchmark(f"Effort presets ({output_format}, quality {args.quality}, {len(args.images)} images)", rows)
+    elif args.name == "resize":
+        rows = benchmark_resize_filters(args.images, args.scale)
+        print_benchmark(f"Resize filters ({args.scale}%, {len(args.images)} images)", rows)
+    elif args.name == "engines":
+        rows = benchmark_resize_engines(args.images, args.scale, args.filter, args.runs)
+        print_benchmark(f"Resize engines ({args.filter}, {args.scale}%, {len(args.images)} images)", rows)
+        if len(rows) == 1:
+            print("Only Pillow is installed; install opencv-python-headless to compare.")
+        failed = [row['engine'] for row in rows if not row['passed']]
+        print(f"Same dimensions and SSIM within {ENGINE_SSIM_TOLERANCE} of Pillow: {'FAIL (' + ', '.join(failed) + ')' if failed else 'PASS'}")
+        return 1 if failed else 0
+    elif args.name == "small":
+        import tempfile
+        with tempfile.TemporaryDirectory() as sample_dir:
+            image_paths = args.images or make_sample_icons(sample_dir)
+            workers = resolve_worker_count(args.workers, len(image_paths))
+            rows = benchmark_small_images(image_paths, args.format.lower(), args.workers, args.runs)
+        print_benchmark(f"Small images ({len(image_paths)} images, {workers} workers)", rows)
+    elif args.name == "startup":
+        # Without a display only the import can be measured
+        gui = os.name == 'nt' or sys.platform == 'darwin' or bool(os.environ.get('DISPLAY'))
+        rows = benchmark_startup(args.runs, gui)
+        print_benchmark(f"Startup ({'window ready' if gui else 'import only, no display'})", rows)
+        
+        median = sorted(row['ready_seconds'] for row in rows)[len(rows) // 2]
+        within_budget = median <= args.budget
+        print(f"Median {median:.3f} s, budget {args.budget:.3f} s: {'PASS' if within_budget else 'FAIL'}")
+        return 0 if within_budget else 1
+    return 0
+
+def settings_from_arguments(args):
+    """Compression settings from the shared command line options"""
+    if args.quality == "Auto":
+        quality = None
+    else:
+        quality = QUALITY_PRESETS[next(label for label in QUALITY_PRESETS if label.startswith(args.quality))]
+    return default_settings(
+        output_format=args.format.lower(),
+        quality=quality,
+        ssim_target=args.ssim_target,
+        quality_suffix=f"-{args.quality}",
+        workers=args.workers,
+        pipeline="Split Decode/Encode" if args.split_pipeline else "Combined",
+        frames="First Frame" if args.first_frame else "All Frames",
+        name_template=args.name_template,
+        mirror_tree=args.mirror_tree,
+        on_collision="Stop" if args.stop_on_collision else "Number Duplicates",
+        profile=args.profile
+    )
+
+def print_report(report):
+    """Print one line per file and the failures of a batch report"""
+    for row in report.rows():
+        if row['status'] == "failed":
+            print(f"{row['path']}: FAILED ({row['error_type']}: {row['error']})")
+            continue
+        chosen = f", q{row['quality']}, SSIM {row['ssim']:.3f}" if row['ssim'] is not None else ""
+        note = f" ({row['note']})" if row['note'] else ""
+        print(f"{row['path']} -> {row['output_path'] or '(kept original)'} [{row['status']}{chosen}]{note}")
+
+def print_plan(rows, collisions):
+    """Print a dry-run plan: one line per file, then the predicted totals"""
+    for row in rows:
+        size = f"{row['size'][0]}x{row['size'][1]}" if row['size'] else "unknown size"
+        print(f"{row['path']} -> {row['output_path']} [{size}, cost {row['cost']:.2f}]")
+    print(f"{len(rows)} files, predicted cost {sum(row['cost'] for row in rows):.2f} (JPEG-megapixel units)")
+    if collisions:
+        print(describe_collisions(collisions))
+
+def run_compress(args):
+    """Compress images from the command line"""
+    settings = settings_from_arguments(args)
+    if args.archive_output:
+        settings['archive_output'] = os.path.abspath(args.archive_output)
+    output_dir = args.output or os.path.dirname(os.path.abspath(args.images[0]))
+    image_paths = expand_archives(args.images)
+    
+    if args.dry_run:
+        try:
+            rows, collisions = plan_batch(image_paths, output_dir, settings)
+        except ValueError as e:
+            print(e)
+            return 1
+        print_plan(rows, collisions)
+        if collisions:
+            action = "stop the batch" if settings['on_collision'] == "Stop" else "be numbered (-2, -3, ...)"
+            print(f"Colliding names would {action}.")
+        return 1 if collisions and settings['on_collision'] == "Stop" else 0
+    
+    os.makedirs(output_dir, exist_ok=True)
+    try:
+        report = run_batch(image_paths, output_dir, settings)
+    except ValueError as e:
+        print(e)
+        return 1
+    print_report(report)
+    if report.profile_summary:
+        print(report.profile_summary)
+    totals = report.totals()
+    counts = ", ".join(f"{count} {status}" for status, count in report.counts().items())
+    print(f"{totals['files']} files: {counts}; {totals['input_bytes']:,} -> {totals['output_bytes']:,} bytes "
+          f"in {totals['wall_seconds']:.1f} s ({totals['seconds']:.1f} s of work)")
+    print(f"Report saved to {report.write(output_dir)}")
+    print(f"Recorded as run {save_history(report, settings, output_dir)}")
+    return 1 if report.failed_paths() else 0
+
+def run_history(args):
+    """List recorded batches, newest first"""
+    index = read_history_index()
+    if not index:
+        print("No batches recorded yet.")
+    for summary in reversed(index[-args.limit:]):
+        retry = f" (retry of {summary['retry_of']})" if summary['retry_of'] else ""
+        print(f"{summary['id']}  {summary['created']}  {summary['files']:>6} files  "
+              f"{summary['failed']:>5} failed  {summary['output_dir']}{retry}")
+    return 0
+
+def run_retry(args):
+    """Retry the failed files of a recorded batch"""
+    report, run_id = retry_failed(args.run_id)
+    if report is None:
+        print("Nothing to retry: the run is unknown or had no failures.")
+        return 0
+    print_report(report)
+    print(f"{len(report.failed_paths())} of {len(report)} files still failing; recorded as run {run_id}")
+    return 1 if report.failed_paths() else 0
+
+def run_watch(args):
+    """Compress new images in a folder until interrupted"""
+    if not os.path.isdir(args.folder):
+        print(f"Not a folder: {args.folder}")
+        return 1
+    settings = settings_from_arguments(args)
+    output_dir = args.output or args.folder
+    watcher = FolderWatcher(args.folder, args.interval, args.settle, args.include_existing, on_error=print)
+    mode = "inotify + polling" if watcher.inotify_fd is not None else "polling"
+    print(f"Watching {watcher.folder} ({mode}), writing to {output_dir}. Press Ctrl+C to stop.")
+    try:
+        watch_folder(args.folder, output_dir, settings, print_report, watcher)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+def worker_count(value):
+    """argparse type for --workers: "Auto" or a positive number"""
+    if value == "Auto" or (value.isdigit() and int(value) > 0):
+        return value
+    raise argparse.ArgumentTypeError(f"expected Auto or a positive number, got {value!r}")
+
+def add_compression_arguments(parser):
+    """Options shared by the compress and watch commands"""
+    parser.add_argument("--format", default="JPEG", choices=get_output_formats(), help="Output format")
+    parser.add_argument("--quality", default="High", choices=["Low", "Medium", "High", "Maximum", "Auto"])
+    parser.add_argument("--ssim-target", type=float, default=AUTO_QUALITY_TARGETS["Balanced (0.95)"],
+                        help="SSIM an image must keep with --quality Auto")
+    parser.add_argument("--workers", default="Auto", type=worker_count, help="Worker processes (Auto = one per core)")
+    parser.add_argument("--split-pipeline", action="store_true",
+                        help="Decode and encode on separate workers, handing pixels over in shared memory")
+    parser.add_argument("--name-template", default=DEFAULT_NAME_TEMPLATE,
+                        help="Output name without extension; tokens {name} {dir} {q} {scale} {hash}, '/' for subfolders")
+    parser.add_argument("--mirror-tree", action="store_true", help="Recreate the source folder tree in the output folder")
+    parser.add_argument("--stop-on-collision", action="store_true",
+                        help="Refuse to start when output names collide (default: number the duplicates)")
+    parser.add_argument("--first-frame", action="store_true", help="Keep only the first frame of animations and multi-page files")
+    parser.add_argument("--profile", action="store_true", help=f"Save cProfile/tracemalloc data to {PROFILE_FOLDER}")
+
+def parse_arguments(argv=None):
+    """Parse command line arguments; no command starts the GUI"""
+    parser = argparse.ArgumentParser(description="Hikari Image Compressor")
+    subparsers = parser.add_subparsers(dest="command")
+    
+    benchmark_parser = subparsers.add_parser("benchmark", help="Measure encoder and resize performance")
+    benchmark_parser.add_argument("name", choices=["effort", "resize", "engines", "small", "startup"], help="Benchmark to run")
+    benchmark_parser.add_argument("images", nargs="*", help="Sample images")
+    benchmark_parser.add_argument("--format", default="WebP", help="Output format (effort: WebP or AVIF)")
+    benchmark_parser.add_argument("--quality", type=int, default=80, help="Encoder quality")
+    benchmark_parser.add_argument("--scale", type=int, default=25, help="Resize scale in percent")
+    benchmark_parser.add_argument("--filter", default="Lanczos", choices=list(RESAMPLING_FILTERS), help="Resize filter (engines)")
+    benchmark_parser.add_argument("--runs", type=int, default=5, help="Runs (startup, small and engines)")
+    benchmark_parser.add_argument("--workers", default="Auto", type=worker_count, help="Worker processes for the small image benchmark")
+    benchmark_parser.add_argument("--budget", type=float, default=STARTUP_BUDGET_SECONDS, help="Startup budget in seconds")
+    
+    compress_parser = subparsers.add_parser("compress", help="Compress images without the GUI")
+    compress_parser.add_argument("images", nargs="+", help="Images, or ZIP/TAR archives of images, to compress")
+    compress_parser.add_argument("--output", help="Output folder (default: folder of the first image)")
+    compress_parser.add_argument("--dry-run", action="store_true", help="Only show the output names and predicted cost")
+    compress_parser.add_argument("--archive-output", help="Write the outputs into this ZIP file instead of the output folder")
+    add_compression_arguments(compress_parser)
+    
+    watch_parser = subparsers.add_parser("watch", help="Compress images as they arrive in a folder")
+    watch_parser.add_argument("folder", help="Folder to watch")
+    watch_parser.add_argument("--output", help="Output folder (default: the watched folder)")
+    add_compression_arguments(watch_parser)
+    watch_parser.add_argument("--interval", type=float, default=WATCH_INTERVAL_SECONDS, help="Seconds between scans")
+    watch_parser.add_argument("--settle", type=float, default=WATCH_SETTLE_SECONDS,
+                              help="Seconds a file must stay unchanged before it is compressed")
+    watch_parser.add_argument("--include-existing", action="store_true", help="Also compress images already in the folder")
+    
+    history_parser = subparsers.add_parser("history", help="List recorded batches")
+    history_parser.add_argument("--limit", type=int, default=20, help="Number of runs to show")
+    
+    retry_parser = subparsers.add_parser("retry", help="Compress only the failed files of a recorded batch again")
+    retry_parser.add_argument("run_id", nargs="?", help="Run to retry (default: the latest)")
+    
+    args = parser.parse_args(argv)
+    if args.command == "benchmark" and args.name in ("effort", "resize", "engines") and not args.images:
+        benchmark_parser.error(f"the {args.name} benchmark needs at least one image")
+    return args
+
+def main(argv=None):
+    """Entry point for the GUI and the command line tools"""
+    multiprocessing.freeze_support()
+    args = parse_arguments(argv)
+    if args.command == "benchmark":
+        return run_benchmark(args)
+    if args.command == "compress":
+        return run_compress(args)
+    if args.command == "watch":
+        return run_watch(args)
+    if args.command == "history":
+        return run_history(args)
+    if args.command == "retry":
+        return run_retry(args)
+    
+    app = ImageCompressor()
+    app.run()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,33 @@
+import os
+import sys
+
+from PIL import Image, ImageCms
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import hikari_image_compressor as hikari
+
+SRGB_PROFILE = ImageCms.ImageCmsProfile(ImageCms.createProfile('sRGB')).tobytes()
+
+def compress_pages(tmp_path, metadata_policy):
+    """Compress a three-page TIFF carrying an ICC profile; returns the output"""
+    pages = [Image.new('RGB', (64, 48), color) for color in ('red', 'green', 'blue')]
+    source = tmp_path / "pages.tif"
+    pages[0].save(source, save_all=True, append_images=pages[1:], icc_profile=SRGB_PROFILE)
+    
+    settings = hikari.default_settings(metadata_policy=metadata_policy, larger_policy="Save Anyway", workers="1")
+    report = hikari.run_batch([str(source)], str(tmp_path), settings)
+    row = report.row(0)
+    assert row['status'] == "compressed" and row['format'] == 'tiff'
+    return Image.open(row['output_path'])
+
+def test_multi_page_tiff_strip_all_drops_icc_profile(tmp_path):
+    with compress_pages(tmp_path, "Strip All") as output:
+        assert output.n_frames == 3
+        for page in range(output.n_frames):
+            output.seek(page)
+            assert 'icc_profile' not in output.info
+
+def test_multi_page_tiff_keep_icc_keeps_profile(tmp_path):
+    with compress_pages(tmp_path, "Keep ICC Only") as output:
+        assert output.n_frames == 3
+        assert output.info.get('icc_profile') == SRGB_PROFILE